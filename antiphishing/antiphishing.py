@@ -1,7 +1,7 @@
 import asyncio
 import datetime
 import re
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from urllib.parse import urlsplit, urlunsplit
 import aiohttp  # type: ignore
 import discord  # type: ignore
@@ -9,18 +9,25 @@ from discord.ext import tasks  # type: ignore
 from redbot.core import Config, commands  # type: ignore
 from redbot.core.bot import Red  # type: ignore
 from redbot.core.commands import Context  # type: ignore
+from redbot.core.data_manager import cog_data_path  # type: ignore
 import logging
 
+from .blocklist import DomainTrie, read_snapshot, write_snapshot
+
 log = logging.getLogger("red.beehive-cogs.antiphishing")
 
+
 class AntiPhishing(commands.Cog):
     """
     Guard users from malicious links and phishing attempts with customizable protection options.
     """
 
-    __version__ = "1.6.4" # TODO: Update version after changes
-    __last_updated__ = "March 21, 2025" # TODO: Update date after changes
-    __quick_notes__ = "Improved domain matching logic for better detection." # TODO: Update notes
+    __version__ = "1.6.5" # TODO: Update version after changes
+    __last_updated__ = "October 18, 2026" # TODO: Update date after changes
+    __quick_notes__ = "Links are now checked against every parent domain, so deep subdomains of a listed domain are caught." # TODO: Update notes
+
+    BLOCKLIST_V1_URL = "https://www.beehive.systems/hubfs/blocklist/blocklist.json"
+    BLOCKLIST_V2_URL = "https://www.beehive.systems/hubfs/blocklist/blocklistv2.json"
 
     def __init__(self, bot: Red):
         self.bot = bot
@@ -28,7 +35,13 @@ class AntiPhishing(commands.Cog):
         self.session = aiohttp.ClientSession()
         self.domains = set()  # Stores lowercase registered domains
         self.domains_v2 = {}  # Stores lowercase registered domains -> additional info
+        self.domain_trie = DomainTrie()  # Ancestor matcher over both lists, kept in sync on refresh
+        self._snapshot_dirty = False  # Set when the last snapshot write failed, so the next refresh retries it
+        self._settings_cache: Dict[int, Dict[str, Any]] = {}  # guild id -> guild config, dropped on every settings write
+        self._settings_cache_hits = 0
+        self._settings_cache_misses = 0
         self._initialize_config()
+        self._load_snapshot()
         self.bot.loop.create_task(self.get_phishing_domains())
 
     def _initialize_config(self):
@@ -46,6 +59,60 @@ class AntiPhishing(commands.Cog):
             staff_role=None  # Configurable staff role mention
         )
         self.config.register_member(caught=0)
+        self.config.register_global(blocklist_validators={})  # url -> {"etag", "last_modified"}
+
+    def _snapshot_paths(self):
+        data_path = cog_data_path(self)
+        return data_path / "blocklist_v1.txt", data_path / "blocklist_v2.json"
+
+    def _load_snapshot(self) -> None:
+        """
+        Loads the last good blocklists from disk so links are protected before the first fetch.
+        V1 is a sorted newline-separated file, V2 is the domain -> info dict as JSON.
+        """
+        try:
+            self.domains, domains_v2 = read_snapshot(*self._snapshot_paths())
+        except (OSError, ValueError) as e:
+            log.warning(f"Could not load blocklist snapshot, waiting for the first fetch instead: {e}")
+            self.domains = set()
+            self.domains_v2 = {}
+            return
+        if domains_v2 is None:
+            log.warning("Ignoring V2 blocklist snapshot, it does not hold a JSON object.")
+            domains_v2 = {}
+        self.domains_v2 = domains_v2
+        if self.domains or self.domains_v2:
+            self.domain_trie = DomainTrie(self.domains | self.domains_v2.keys())
+            log.info(f"Loaded blocklist snapshot. V1: {len(self.domains)} entries, V2: {len(self.domains_v2)} entries.")
+
+    async def _save_snapshot(self) -> bool:
+        """Writes the current lists to disk. Returns False if the write failed."""
+        v1_path, v2_path = self._snapshot_paths()
+        try:
+            await self.bot.loop.run_in_executor(
+                None, write_snapshot, v1_path, v2_path, list(self.domains), dict(self.domains_v2)
+            )
+        except OSError as e:
+            log.error(f"Failed to write blocklist snapshot: {e}")
+            self._snapshot_dirty = True
+            # The validators would otherwise vouch for a snapshot we never wrote
+            await self.config.blocklist_validators.clear()
+            return False
+        self._snapshot_dirty = False
+        return True
+
+    async def _guild_settings(self, guild: discord.Guild) -> Dict[str, Any]:
+        """Returns the guild's settings from memory, only reading Config on a cache miss."""
+        settings = self._settings_cache.get(guild.id)
+        if settings is None:
+            self._settings_cache_misses += 1
+            settings = self._settings_cache[guild.id] = await self.config.guild(guild).all()
+        else:
+            self._settings_cache_hits += 1
+        return settings
+
+    def _invalidate_settings(self, guild: discord.Guild) -> None:
+        self._settings_cache.pop(guild.id, None)
 
     def cog_unload(self):
         self.bot.loop.create_task(self.session.close())
@@ -142,6 +209,7 @@ class AntiPhishing(commands.Cog):
             return
 
         await self.config.guild(ctx.guild).action.set(action)
+        self._invalidate_settings(ctx.guild)
         await self._send_action_confirmation(ctx, action)
 
     async def _send_embed(self, ctx: Context, title: str, description: str, color: int, thumbnail_url: str):
@@ -211,7 +279,7 @@ class AntiPhishing(commands.Cog):
             guild_data.get('bans', 0),
             guild_data.get('timeouts', 0)
         )
-        total_domains = len(self.domains | set(self.domains_v2.keys()))
+        total_domains = len(self.domain_trie)
 
         embed = discord.Embed(
             title='Link safety statistics',
@@ -225,6 +293,9 @@ class AntiPhishing(commands.Cog):
         embed.add_field(name="Bans", value=f"Banned **{bans}** user{'s' if bans != 1 else ''}", inline=True)
         embed.add_field(name="Timeouts", value=f"Timed out **{timeouts}** user{'s' if timeouts != 1 else ''}", inline=True)
         embed.add_field(name="Blocklist count", value=f"There are **{total_domains:,}** domains on the [BeeHive](https://www.beehive.systems) blocklist", inline=False)
+        lookups = self._settings_cache_hits + self._settings_cache_misses
+        hit_rate = self._settings_cache_hits / lookups * 100 if lookups else 0
+        embed.add_field(name="Settings cache", value=f"**{hit_rate:.1f}%** hit rate over **{lookups:,}** lookups", inline=False)
         embed.add_field(name="About this cog", value="", inline=False)
         embed.add_field(name="Version", value=f"You're running **v{self.__version__}**", inline=True)
         embed.add_field(name="Last updated", value=f"**{self.__last_updated__}**", inline=True)
@@ -239,11 +310,13 @@ class AntiPhishing(commands.Cog):
         """
         if channel:
             await self.config.guild(ctx.guild).log_channel.set(channel.id)
+            self._invalidate_settings(ctx.guild)
             await self._send_embed(ctx, 'Settings changed',
                                    f"The logging channel has been set to {channel.mention}.",
                                    0x2bbd8e, "https://www.beehive.systems/hubfs/Icon%20Packs/Green/check-circle.png")
         else:
             await self.config.guild(ctx.guild).log_channel.clear()
+            self._invalidate_settings(ctx.guild)
             await self._send_embed(ctx, 'Settings changed',
                                    "The logging channel has been cleared.",
                                    0xffd966, "https://www.beehive.systems/hubfs/Icon%20Packs/Yellow/close.png")
@@ -256,11 +329,13 @@ class AntiPhishing(commands.Cog):
         """
         if role:
             await self.config.guild(ctx.guild).staff_role.set(role.id)
+            self._invalidate_settings(ctx.guild)
             await self._send_embed(ctx, 'Settings changed',
                                    f"The staff role has been set to {role.mention}.",
                                    0x2bbd8e, "https://www.beehive.systems/hubfs/Icon%20Packs/Green/check-circle.png")
         else:
             await self.config.guild(ctx.guild).staff_role.clear()
+            self._invalidate_settings(ctx.guild)
             await self._send_embed(ctx, 'Settings changed',
                                    "The staff role mention has been cleared.",
                                     0xffd966, "https://www.beehive.systems/hubfs/Icon%20Packs/Yellow/close.png")
@@ -278,6 +353,7 @@ class AntiPhishing(commands.Cog):
             return
 
         await self.config.guild(ctx.guild).timeout_duration.set(minutes)
+        self._invalidate_settings(ctx.guild)
         await self._send_embed(ctx, 'Settings changed',
                                f"The timeout duration is now set to **{minutes}** minutes.",
                                0xffd966, "https://www.beehive.systems/hubfs/Icon%20Packs/Yellow/clock.png")
@@ -309,85 +385,179 @@ class AntiPhishing(commands.Cog):
 
     @tasks.loop(minutes=15)
     async def get_phishing_domains(self) -> None:
-        """Fetches and updates the phishing domain lists."""
+        """Fetches the phishing domain lists and applies any changes in place."""
         log.info("Attempting to update phishing domain lists...")
-        new_domains = set()
-        new_domains_v2 = {}
-        updated = False
 
         headers = {
             "X-Identity": f"BeeHive AntiPhishing v{self.__version__} (Discord Bot; +https://github.com/BeeHive-Systems/BeeHive-Cogs)",
             "User-Agent": f"BeeHive AntiPhishing v{self.__version__} (Discord Bot; +https://github.com/BeeHive-Systems/BeeHive-Cogs)"
         }
 
-        # Fetch V1 list
-        fetched_v1 = await self._fetch_domains("https://www.beehive.systems/hubfs/blocklist/blocklist.json", headers, new_domains)
-        # Fetch V2 list
-        fetched_v2 = await self._fetch_domains_v2("https://www.beehive.systems/hubfs/blocklist/blocklistv2.json", headers, new_domains_v2)
-
-        if fetched_v1 or fetched_v2:
-            if new_domains != self.domains or new_domains_v2 != self.domains_v2:
-                self.domains = new_domains
-                self.domains_v2 = new_domains_v2
-                updated = True
-                log.info(f"Phishing domain lists updated. V1: {len(self.domains)} entries, V2: {len(self.domains_v2)} entries.")
-            else:
-                log.info("Phishing domain lists checked, no changes detected.")
-        else:
+        # Only revalidate a list we actually hold, otherwise a 304 would leave it empty
+        fetched_v1, new_domains, validators_v1 = await self._fetch_domains(self.BLOCKLIST_V1_URL, headers, bool(self.domains))
+        fetched_v2, new_domains_v2, validators_v2 = await self._fetch_domains_v2(self.BLOCKLIST_V2_URL, headers, bool(self.domains_v2))
+
+        if not (fetched_v1 or fetched_v2):
             log.warning("Failed to fetch updates for both V1 and V2 blocklists.")
             return
 
-        if updated:
-            for guild in self.bot.guilds:
-                log_channel_id = await self.config.guild(guild).log_channel()
-                if log_channel_id:
-                    log_channel = guild.get_channel(log_channel_id)
-                    if log_channel and log_channel.permissions_for(guild.me).send_messages:
-                        try:
-                            embed = discord.Embed(
-                                title="Definitions updated",
-                                description=f"The phishing domains list has been updated.\n"
-                                            f"Now tracking **{len(self.domains) + len(self.domains_v2):,}** domains.",
-                                color=0x2bbd8e # Green
-                            )
-                            await log_channel.send(embed=embed)
-                        except discord.Forbidden:
-                            log.warning(f"Missing permissions to send update message in {log_channel.name} ({guild.name}).")
-                        except Exception as e:
-                            log.error(f"Error sending update message to {log_channel.name} ({guild.name}): {e}")
+        changes = 0
+        if not self.domains and not self.domains_v2:
+            # First load, build everything in one go off the event loop
+            self.domains = new_domains or set()
+            self.domains_v2 = new_domains_v2 or {}
+            self.domain_trie = await self.bot.loop.run_in_executor(
+                None, DomainTrie, self.domains | self.domains_v2.keys()
+            )
+            changes = len(self.domains) + len(self.domains_v2)
+            new_domains = new_domains_v2 = None
+
+        if new_domains is not None:
+            changes += self._apply_domains_delta(new_domains)
+        if new_domains_v2 is not None:
+            changes += self._apply_domains_v2_delta(new_domains_v2)
+
+        if changes:
+            log.info(f"Phishing domain lists updated ({changes} changes). V1: {len(self.domains)} entries, V2: {len(self.domains_v2)} entries.")
+        else:
+            log.info("Phishing domain lists checked, no changes detected.")
+
+        # Validators are only stored once the lists they describe are on disk, otherwise a restart
+        # would load an older snapshot and keep getting 304s for the newer list
+        saved = await self._save_snapshot() if changes or self._snapshot_dirty else True
+        if saved:
+            await self._store_validators({self.BLOCKLIST_V1_URL: validators_v1, self.BLOCKLIST_V2_URL: validators_v2})
+        if not changes:
+            return
+
+        for guild in self.bot.guilds:
+            log_channel_id = (await self._guild_settings(guild))["log_channel"]
+            if log_channel_id:
+                log_channel = guild.get_channel(log_channel_id)
+                if log_channel and log_channel.permissions_for(guild.me).send_messages:
+                    try:
+                        embed = discord.Embed(
+                            title="Definitions updated",
+                            description=f"The phishing domains list has been updated.\n"
+                                        f"Now tracking **{len(self.domains) + len(self.domains_v2):,}** domains.",
+                            color=0x2bbd8e # Green
+                        )
+                        await log_channel.send(embed=embed)
+                    except discord.Forbidden:
+                        log.warning(f"Missing permissions to send update message in {log_channel.name} ({guild.name}).")
+                    except Exception as e:
+                        log.error(f"Error sending update message to {log_channel.name} ({guild.name}): {e}")
 
     @get_phishing_domains.before_loop
     async def before_get_phishing_domains(self):
         await self.bot.wait_until_ready()
         log.info("Starting phishing domain update loop.")
 
-    async def _fetch_domains(self, url: str, headers: dict, domains: set) -> bool:
-        """Fetches V1 domain list, stores lowercase, returns True on success."""
+    def _apply_domains_delta(self, new_domains: set) -> int:
+        """Applies added/removed V1 domains to the live set and trie, returns the number of changes."""
+        added = new_domains - self.domains
+        removed = self.domains - new_domains
+        for domain in added:
+            self.domains.add(domain)
+            self.domain_trie.add(domain)
+        for domain in removed:
+            self.domains.discard(domain)
+            if domain not in self.domains_v2:
+                self.domain_trie.remove(domain)
+        return len(added) + len(removed)
+
+    def _apply_domains_v2_delta(self, new_domains_v2: Dict[str, Any]) -> int:
+        """Applies added/removed/changed V2 entries to the live dict and trie, returns the number of changes."""
+        changes = 0
+        for domain in self.domains_v2.keys() - new_domains_v2.keys():
+            del self.domains_v2[domain]
+            if domain not in self.domains:
+                self.domain_trie.remove(domain)
+            changes += 1
+        for domain, info in new_domains_v2.items():
+            current = self.domains_v2.get(domain)
+            if current is None:
+                self.domain_trie.add(domain)
+            elif current == info:
+                continue
+            self.domains_v2[domain] = info
+            changes += 1
+        return changes
+
+    async def _conditional_get(self, url: str, headers: dict, revalidate: bool) -> Optional[aiohttp.ClientResponse]:
+        """
+        Sends a GET for a blocklist, adding If-None-Match/If-Modified-Since from the stored validators
+        when ``revalidate`` is set. Returns the response, or None if the list is unchanged (HTTP 304).
+        """
+        request_headers = dict(headers)
+        if revalidate:
+            validators = (await self.config.blocklist_validators()).get(url, {})
+            if validators.get("etag"):
+                request_headers["If-None-Match"] = validators["etag"]
+            if validators.get("last_modified"):
+                request_headers["If-Modified-Since"] = validators["last_modified"]
+
+        response = await self.session.get(url, headers=request_headers, timeout=10)
+        if response.status == 304:
+            response.release()
+            log.debug(f"Blocklist {url} not modified since last fetch.")
+            return None
+        response.raise_for_status()
+        return response
+
+    @staticmethod
+    def _response_validators(response: aiohttp.ClientResponse) -> Dict[str, Optional[str]]:
+        return {
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+        }
+
+    async def _store_validators(self, fetched: Dict[str, Optional[Dict[str, Optional[str]]]]) -> None:
+        """Remembers the ETag/Last-Modified of each successfully parsed blocklist, skipping lists that were not refetched."""
+        fetched = {url: validators for url, validators in fetched.items() if validators is not None}
+        if not fetched:
+            return
+        async with self.config.blocklist_validators() as validators:
+            validators.update(fetched)
+
+    async def _fetch_domains(self, url: str, headers: dict, revalidate: bool) -> Tuple[bool, Optional[set], Optional[Dict[str, Optional[str]]]]:
+        """
+        Fetches V1 domain list. Returns (success, lowercase domains, validators), where domains and
+        validators are None if the request failed or the list has not changed.
+        """
         try:
-            async with self.session.get(url, headers=headers, timeout=10) as request:
-                request.raise_for_status()
-                data = await request.json()
+            response = await self._conditional_get(url, headers, revalidate)
+            if response is None:
+                return True, None, None
+            async with response:
+                data = await response.json()
                 if isinstance(data, list):
-                    domains.update(d.lower() for d in data if isinstance(d, str))
+                    domains = {d.lower() for d in data if isinstance(d, str)}
                     log.debug(f"Successfully fetched and parsed V1 blocklist from {url}. {len(data)} entries raw.")
-                    return True
+                    return True, domains, self._response_validators(response)
                 else:
                     log.warning(f"Unexpected data format received from V1 blocklist {url}. Expected list, got {type(data)}.")
-                    return False
+                    return False, None, None
         except (aiohttp.ClientResponseError, aiohttp.ClientError) as e:
             log.warning(f"Error fetching V1 blocklist from {url}: {e}")
-            return False
+            return False, None, None
         except Exception as e:
             log.exception(f"An unexpected error occurred fetching V1 blocklist from {url}: {e}")
-            return False
+            return False, None, None
 
-    async def _fetch_domains_v2(self, url: str, headers: dict, domains_v2: Dict[str, Any]) -> bool:
-        """Fetches V2 domain list, stores lowercase keys, returns True on success."""
+    async def _fetch_domains_v2(self, url: str, headers: dict, revalidate: bool) -> Tuple[bool, Optional[Dict[str, Any]], Optional[Dict[str, Optional[str]]]]:
+        """
+        Fetches V2 domain list. Returns (success, lowercase domain -> info, validators), where the
+        dict and validators are None if the request failed or the list has not changed.
+        """
         try:
-            async with self.session.get(url, headers=headers, timeout=10) as request:
-                request.raise_for_status()
-                data = await request.json()
+            response = await self._conditional_get(url, headers, revalidate)
+            if response is None:
+                return True, None, None
+            async with response:
+                data = await response.json()
                 if isinstance(data, dict) and "blocklist" in data:
+                    domains_v2 = {}
                     for entry in data["blocklist"]:
                         domain = entry.get("domain", "").lower()
                         if domain:
@@ -399,21 +569,22 @@ class AntiPhishing(commands.Cog):
                                 "detected_date": entry.get("detected_date", "")
                             }
                     log.debug(f"Successfully fetched and parsed V2 blocklist from {url}. {len(data['blocklist'])} entries raw.")
-                    return True
+                    return True, domains_v2, self._response_validators(response)
                 else:
                     log.warning(f"Unexpected data format received from V2 blocklist {url}. Expected dict with 'blocklist', got {type(data)}.")
-                    return False
+                    return False, None, None
         except (aiohttp.ClientResponseError, aiohttp.ClientError) as e:
             log.warning(f"Error fetching V2 blocklist from {url}: {e}")
-            return False
+            return False, None, None
         except Exception as e:
             log.exception(f"An unexpected error occurred fetching V2 blocklist from {url}: {e}")
-            return False
+            return False, None, None
 
     async def handle_phishing(self, message: discord.Message, matched_domain: str) -> None:
         """Handles the actions when a phishing link is detected."""
         log.info(f"Phishing link detected: '{matched_domain}' in message {message.id} by {message.author} ({message.author.id}) in guild {message.guild.id}.")
-        action = await self.config.guild(message.guild).action()
+        settings = await self._guild_settings(message.guild)
+        action = settings["action"]
 
         if action != "ignore":
             async with self.config.guild(message.guild).caught() as count:
@@ -421,8 +592,8 @@ class AntiPhishing(commands.Cog):
         async with self.config.member(message.author).caught() as member_count:
             member_count += 1
 
-        log_channel_id = await self.config.guild(message.guild).log_channel()
-        staff_role_id = await self.config.guild(message.guild).staff_role()
+        log_channel_id = settings["log_channel"]
+        staff_role_id = settings["staff_role"]
         if log_channel_id:
             log_channel = message.guild.get_channel(log_channel_id)
             if log_channel and log_channel.permissions_for(message.guild.me).send_messages:
@@ -445,7 +616,7 @@ class AntiPhishing(commands.Cog):
         log_embed.set_author(name=f"{message.author.display_name} ({message.author.id})", icon_url=message.author.display_avatar.url)
         log_embed.add_field(name="Matched Domain", value=f"`{matched_domain}`", inline=False)
         log_embed.add_field(name="Full Message Content", value=f"```\n{message.content[:1000]}\n```" if message.content else "*(No text content)*", inline=False)
-        log_embed.add_field(name="Action Taken", value=f"`{await self.config.guild(message.guild).action()}`", inline=True)
+        log_embed.add_field(name="Action Taken", value=f"`{(await self._guild_settings(message.guild))['action']}`", inline=True)
         log_embed.add_field(name="Message Link", value=f"[Jump to Message]({message.jump_url})", inline=True)
 
         additional_info = self.domains_v2.get(matched_domain)
@@ -524,7 +695,7 @@ class AntiPhishing(commands.Cog):
             return
 
         try:
-            staff_role_id = await self.config.guild(message.guild).staff_role()
+            staff_role_id = (await self._guild_settings(message.guild))["staff_role"]
             staff_mention = f"<@&{staff_role_id}>" if staff_role_id else ""
             allowed_mentions = discord.AllowedMentions(roles=True if staff_role_id else False)
 
@@ -667,7 +838,7 @@ class AntiPhishing(commands.Cog):
             return
 
         try:
-            timeout_duration_minutes = await self.config.guild(message.guild).timeout_duration()
+            timeout_duration_minutes = (await self._guild_settings(message.guild))["timeout_duration"]
             timeout_delta = datetime.timedelta(minutes=timeout_duration_minutes)
 
             await message.author.timeout(timeout_delta, reason=reason)
@@ -723,29 +894,15 @@ class AntiPhishing(commands.Cog):
             log.debug(f"Processing link: {url} from message {message.id}")
 
             try:
-                hostname = urlsplit(url).netloc.lower()
+                hostname = urlsplit(url).hostname or ""
             except ValueError:
                 log.warning(f"Could not parse URL for hostname: {url}")
                 continue
 
-            if hostname in self.domains or hostname in self.domains_v2:
-                log.debug(f"Exact match found: {hostname}")
-                await self.handle_phishing(message, hostname)
-                continue
-
-            try:
-                # Fix: Ensure the domain extraction considers subdomains
-                domain_match = re.search(r'([a-z0-9-]+\.[a-z0-9-]+\.[a-z]{2,})$', hostname)
-                if not domain_match:
-                    domain_match = re.search(r'([a-z0-9-]+\.[a-z]{2,})$', hostname)
-                if domain_match:
-                    registered_domain = domain_match.group(1).lower()
-                    if registered_domain in self.domains or registered_domain in self.domains_v2:
-                        log.debug(f"Registered domain match found: {registered_domain} (from {hostname})")
-                        await self.handle_phishing(message, registered_domain)
-                        continue
-            except Exception as e:
-                log.error(f"Error extracting domain from hostname '{hostname}': {e}")
+            matched_domain = self.domain_trie.match(hostname)
+            if matched_domain:
+                log.debug(f"Blocklist match found: {matched_domain} (from {hostname})")
+                await self.handle_phishing(message, matched_domain)
                 continue
 
             log.debug(f"No malicious domains found for URL: {url}")
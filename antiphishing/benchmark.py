@@ -0,0 +1,160 @@
+"""Benchmark for AntiPhishing's blocklist matching.
+
+Builds a reproducible blocklist and a stream of hostnames (listed domains, deep
+subdomains of listed domains and clean traffic), then times the DomainTrie against
+the exact-match-plus-regex lookup it replaced and counts what each one catches.
+With --snapshot it instead times loading the lists from the on-disk snapshot against
+parsing the JSON the blocklist endpoints serve. Needs no Discord or Red install:
+
+    python antiphishing/benchmark.py [--domains 100000] [--hosts 300000] [--seed 1]
+    python antiphishing/benchmark.py --snapshot [--domains 100000]
+"""
+import argparse
+import json
+import pathlib
+import random
+import re
+import string
+import tempfile
+import time
+
+from blocklist import DomainTrie, read_snapshot, write_snapshot
+
+TLDS = ("com", "net", "org", "io", "xyz", "ru", "co.uk", "com.br", "gg", "app")
+SUBDOMAIN_LABELS = ("www", "login", "secure", "account", "cdn", "auth", "verify", "mail", "app", "steam")
+
+
+def random_label(r, low=4, high=14):
+    return "".join(r.choice(string.ascii_lowercase + string.digits) for _ in range(r.randint(low, high)))
+
+
+def build_blocklist(count, r):
+    """Listed domains; a fifth of them are themselves subdomains, as in the real lists."""
+    domains = set()
+    while len(domains) < count:
+        domain = f"{random_label(r)}.{r.choice(TLDS)}"
+        if r.random() < 0.2:
+            domain = f"{r.choice(SUBDOMAIN_LABELS)}.{domain}"
+        domains.add(domain)
+    return sorted(domains)
+
+
+def build_hostnames(count, blocklist, r):
+    hostnames = []
+    for _ in range(count):
+        roll = r.random()
+        if roll < 0.1:
+            hostnames.append(r.choice(blocklist))
+        elif roll < 0.2:
+            labels = [r.choice(SUBDOMAIN_LABELS) for _ in range(r.randint(1, 3))]
+            hostnames.append(".".join(labels + [r.choice(blocklist)]))
+        else:
+            hostnames.append(f"{r.choice(SUBDOMAIN_LABELS)}.{random_label(r)}.{r.choice(TLDS)}")
+    return hostnames
+
+
+def legacy_match(hostname, listed):
+    """The lookup _process_links did before DomainTrie: exact match, then one regex-guessed parent."""
+    if hostname in listed:
+        return hostname
+    domain_match = re.search(r'([a-z0-9-]+\.[a-z0-9-]+\.[a-z]{2,})$', hostname)
+    if not domain_match:
+        domain_match = re.search(r'([a-z0-9-]+\.[a-z]{2,})$', hostname)
+    if domain_match and domain_match.group(1) in listed:
+        return domain_match.group(1)
+    return None
+
+
+def parse_fetched(v1_json, v2_json):
+    """What _fetch_domains and _fetch_domains_v2 do with a response body."""
+    domains = {d.lower() for d in json.loads(v1_json) if isinstance(d, str)}
+    domains_v2 = {}
+    for entry in json.loads(v2_json)["blocklist"]:
+        domain = entry.get("domain", "").lower()
+        if domain:
+            domains_v2[domain] = {
+                key: entry.get(key, "")
+                for key in ("category", "severity", "description", "targeted_orgs", "detected_date")
+            }
+    return domains, domains_v2
+
+
+def best_of(runs, func, *args):
+    best = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        func(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def snapshot_benchmark(blocklist, r):
+    v2_entries = [
+        {
+            "domain": domain,
+            "category": r.choice(("phishing", "malware", "scam")),
+            "severity": r.choice(("low", "medium", "high")),
+            "description": "Credential harvesting page",
+            "targeted_orgs": r.choice(("Discord", "Steam", "PayPal")),
+            "detected_date": "2026-01-01",
+        }
+        for domain in blocklist[::2]
+    ]
+    v1_json = json.dumps(blocklist)
+    v2_json = json.dumps({"blocklist": v2_entries})
+    domains, domains_v2 = parse_fetched(v1_json, v2_json)
+
+    with tempfile.TemporaryDirectory() as data_path:
+        v1_path = pathlib.Path(data_path) / "blocklist_v1.txt"
+        v2_path = pathlib.Path(data_path) / "blocklist_v2.json"
+        write_snapshot(v1_path, v2_path, list(domains), domains_v2)
+        loaded = read_snapshot(v1_path, v2_path)
+        if loaded != (domains, domains_v2):
+            raise SystemExit("snapshot did not round-trip")
+        snapshot_time = best_of(5, read_snapshot, v1_path, v2_path)
+    fetched_time = best_of(5, parse_fetched, v1_json, v2_json)
+
+    print(f"V1: {len(domains)} domains, V2: {len(domains_v2)} domains, snapshot round-trips")
+    print(f"parse fetched JSON: {fetched_time * 1000:.0f}ms")
+    print(f"read snapshot:      {snapshot_time * 1000:.0f}ms")
+
+
+def timed(match, hostnames, *args):
+    start = time.perf_counter()
+    results = [match(hostname, *args) for hostname in hostnames]
+    return time.perf_counter() - start, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--domains", type=int, default=100000)
+    parser.add_argument("--hosts", type=int, default=300000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--snapshot", action="store_true", help="time snapshot loading instead of matching")
+    args = parser.parse_args()
+
+    r = random.Random(args.seed)
+    blocklist = build_blocklist(args.domains, r)
+    if args.snapshot:
+        snapshot_benchmark(blocklist, r)
+        return
+    hostnames = build_hostnames(args.hosts, blocklist, r)
+    listed = set(blocklist)
+
+    start = time.perf_counter()
+    trie = DomainTrie(blocklist)
+    build_time = time.perf_counter() - start
+
+    legacy_time, legacy_results = timed(legacy_match, hostnames, listed)
+    trie_time, trie_results = timed(trie.match, hostnames)
+
+    missed = sum(1 for old, new in zip(legacy_results, trie_results) if old and not new)
+    print(f"{len(blocklist)} listed domains, {len(hostnames)} hostnames, trie built in {build_time:.2f}s")
+    print(f"exact + regex: {legacy_time / len(hostnames) * 1e6:.2f}us/host, {sum(map(bool, legacy_results))} matched")
+    print(f"DomainTrie:    {trie_time / len(hostnames) * 1e6:.2f}us/host, {sum(map(bool, trie_results))} matched")
+    print(f"hostnames the regex caught and the trie missed: {missed}")
+
+
+if __name__ == "__main__":
+    main()
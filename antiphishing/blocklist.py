@@ -0,0 +1,114 @@
+"""Blocklist matching used by AntiPhishing.
+
+Kept free of discord/redbot imports so benchmark.py can load it on its own.
+"""
+import json
+import os
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+
+class DomainTrie:
+    """
+    Reversed-label trie over blocklisted domains.
+
+    Each node is a dict of label -> child node. A node whose domain is blocklisted
+    carries the full domain under the empty-string key, so a hostname can be
+    checked against every one of its ancestors in a single walk from the TLD down.
+    """
+
+    __slots__ = ("_root", "_size")
+
+    def __init__(self, domains=()):
+        self._root: Dict[str, Any] = {}
+        self._size = 0
+        for domain in domains:
+            self.add(domain)
+
+    def __len__(self) -> int:
+        return self._size
+
+    @staticmethod
+    def _labels(hostname: str) -> List[str]:
+        return [label for label in reversed(hostname.split(".")) if label]
+
+    def add(self, domain: str) -> None:
+        domain = domain.strip(".").lower()
+        labels = self._labels(domain)
+        if not labels:
+            return
+        node = self._root
+        for label in labels:
+            child = node.get(label)
+            if child is None:
+                child = node[label] = {}
+            node = child
+        if "" not in node:
+            node[""] = domain
+            self._size += 1
+
+    def remove(self, domain: str) -> None:
+        domain = domain.strip(".").lower()
+        path = []
+        node = self._root
+        for label in self._labels(domain):
+            child = node.get(label)
+            if child is None:
+                return
+            path.append((node, label))
+            node = child
+        if node.pop("", None) is None:
+            return
+        self._size -= 1
+        # Prune branches that no longer lead to any listed domain
+        for parent, label in reversed(path):
+            if parent[label]:
+                break
+            del parent[label]
+
+    def match(self, hostname: str) -> Optional[str]:
+        """
+        Return the most specific blocklisted domain that equals or is a parent of
+        ``hostname``, or None if no ancestor is listed.
+        """
+        node = self._root
+        found = None
+        for label in reversed(hostname.split(".")):
+            if not label:
+                continue
+            node = node.get(label)
+            if node is None:
+                break
+            found = node.get("", found)
+        return found
+
+
+def read_snapshot(v1_path, v2_path) -> Tuple[Set[str], Optional[Dict[str, Any]]]:
+    """
+    Reads the lists written by write_snapshot. V1 is a sorted newline-separated file, V2 is
+    the domain -> info dict as JSON. A missing file reads as an empty list; V2 comes back
+    as None if the file holds JSON that is not an object.
+    """
+    domains = set()
+    domains_v2 = {}
+    if v1_path.exists():
+        with open(v1_path, "r", encoding="utf-8") as f:
+            domains = set(filter(None, f.read().split("\n")))
+    if v2_path.exists():
+        with open(v2_path, "r", encoding="utf-8") as f:
+            domains_v2 = json.load(f)
+        if not isinstance(domains_v2, dict):
+            domains_v2 = None
+    return domains, domains_v2
+
+
+def write_snapshot(v1_path, v2_path, domains: List[str], domains_v2: Dict[str, Any]) -> None:
+    """Writes both lists next to their final path and swaps them in, so a crash never leaves half a file."""
+    domains.sort()
+    tmp_v1 = v1_path.with_suffix(".tmp")
+    with open(tmp_v1, "w", encoding="utf-8") as f:
+        f.write("\n".join(domains))
+    tmp_v2 = v2_path.with_suffix(".tmp")
+    with open(tmp_v2, "w", encoding="utf-8") as f:
+        json.dump(domains_v2, f, separators=(",", ":"))
+    os.replace(tmp_v1, v1_path)
+    os.replace(tmp_v2, v2_path)
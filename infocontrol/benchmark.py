@@ -0,0 +1,126 @@
+"""Throughput benchmark for InfoControl's message scanner.
+
+Builds a reproducible corpus of benign chat and PII-laden messages, then times the
+PatternScanner against the per-pattern re.search loop it replaced and checks that both
+report the same category for every message. Needs no Discord or Red install:
+
+    python infocontrol/benchmark.py [--messages 50000] [--pii 0.1] [--seed 1]
+    python infocontrol/benchmark.py --dump corpus.txt    # write the corpus out, one message per line
+"""
+import argparse
+import random
+import re
+import time
+
+from scanner import (
+    CHANNEL_MENTION_RE,
+    DEFAULT_PATTERNS,
+    DISCORD_ID_RE,
+    HYPERLINK_RE,
+    URL_RE,
+    USER_MENTION_RE,
+    PatternScanner,
+)
+
+WORDS = (
+    "the and you that was for are with his they this have from one had word but not what all were "
+    "when your can said there use each which she how their will other about out many then them these "
+    "some her would make like him into time has look two more write see number way could people than "
+    "first water been call who its now find long down day did get come made may part lol gg brb idk "
+    "tonight raid server patch queue ranked build meta nerf buff stream clip vibe"
+).split()
+
+PII_TEMPLATES = (
+    lambda r: f"{r.choice('abcdefghij')}{r.randint(1, 999)}@{r.choice(('gmail', 'proton', 'example'))}.com",
+    lambda r: f"{r.randint(100, 899)}-{r.randint(10, 99)}-{r.randint(1000, 9999)}",
+    lambda r: " ".join(str(r.randint(1000, 9999)) for _ in range(4)),
+    lambda r: f"({r.randint(200, 999)}) {r.randint(200, 999)}-{r.randint(1000, 9999)}",
+    lambda r: ".".join(str(r.randint(1, 254)) for _ in range(4)),
+    lambda r: ":".join(f"{r.randint(0, 65535):x}" for _ in range(8)),
+    lambda r: ":".join(f"{r.randint(0, 255):02X}" for _ in range(6)),
+    lambda r: f"{r.randint(1, 9999)} {r.choice(('Main', 'Oak', 'Pine', 'Maple'))} Street",
+    lambda r: f"{r.randint(1, 28):02d}/{r.randint(1, 12):02d}/{r.randint(1950, 2010)}",
+    lambda r: f"GB{r.randint(10, 99)}BARC{r.randint(10 ** 13, 10 ** 14 - 1)}",
+)
+
+BENIGN_EXTRAS = (
+    lambda r: f"<@{r.randint(10 ** 17, 10 ** 18)}>",
+    lambda r: f"<#{r.randint(10 ** 17, 10 ** 18)}>",
+    lambda r: f"https://example.com/{r.randint(1, 10 ** 6)}",
+    lambda r: f"[clip](https://clips.example/{r.randint(1, 999)})",
+    lambda r: f"{r.randint(1, 99)}%",
+    lambda r: f"{r.randint(1, 12)}:{r.randint(0, 59):02d}",
+    lambda r: ":)",
+)
+
+
+def build_corpus(count, pii_ratio, seed):
+    r = random.Random(seed)
+    corpus = []
+    for _ in range(count):
+        words = [r.choice(WORDS) for _ in range(r.randint(3, 25))]
+        if r.random() < 0.3:
+            words.insert(r.randrange(len(words) + 1), r.choice(BENIGN_EXTRAS)(r))
+        if r.random() < pii_ratio:
+            words.insert(r.randrange(len(words) + 1), r.choice(PII_TEMPLATES)(r))
+        corpus.append(" ".join(words))
+    return corpus
+
+
+def legacy_scan(content, patterns):
+    """The scan InfoControl did before PatternScanner: uncompiled pre-passes and one re.search per pattern."""
+    content = re.sub(r'<@!?[0-9]+>', '', content)
+    content = re.sub(r'<#[0-9]+>', '', content)
+    content = re.sub(r'\[.*?\]\(.*?\)', '', content)
+    content = re.sub(r'https?://\S+', '', content)
+    content = re.sub(r'\b\d{17,19}\b', '', content)
+    for key, pattern in patterns.items():
+        if re.search(pattern, content):
+            return key
+    return None
+
+
+def scanner_scan(content, scanner):
+    content = USER_MENTION_RE.sub('', content)
+    content = CHANNEL_MENTION_RE.sub('', content)
+    content = HYPERLINK_RE.sub('', content)
+    content = URL_RE.sub('', content)
+    content = DISCORD_ID_RE.sub('', content)
+    return scanner.scan(content)
+
+
+def timed(scan, corpus, *args):
+    start = time.perf_counter()
+    results = [scan(message, *args) for message in corpus]
+    return time.perf_counter() - start, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=50000)
+    parser.add_argument("--pii", type=float, default=0.1, help="share of messages carrying PII")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--dump", metavar="PATH", help="write the corpus to PATH and exit")
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.messages, args.pii, args.seed)
+    if args.dump:
+        with open(args.dump, "w", encoding="utf-8") as corpus_file:
+            corpus_file.write("\n".join(corpus) + "\n")
+        print(f"Wrote {len(corpus)} messages to {args.dump}")
+        return
+
+    patterns = dict(DEFAULT_PATTERNS)
+    scanner = PatternScanner(patterns, DEFAULT_PATTERNS)
+    legacy_time, legacy_results = timed(legacy_scan, corpus, patterns)
+    scanner_time, scanner_results = timed(scanner_scan, corpus, scanner)
+
+    mismatches = sum(1 for old, new in zip(legacy_results, scanner_results) if old != new)
+    flagged = sum(1 for result in scanner_results if result)
+    print(f"{len(corpus)} messages, {flagged} flagged, {mismatches} category mismatches")
+    print(f"per-pattern loop: {len(corpus) / legacy_time:,.0f} messages/s")
+    print(f"PatternScanner:   {len(corpus) / scanner_time:,.0f} messages/s ({legacy_time / scanner_time:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,21 @@
-import re
 import discord #type: ignore
 import asyncio
 from redbot.core import commands, Config #type: ignore
+from .scanner import (
+    CHANNEL_MENTION_RE,
+    DEFAULT_PATTERNS,
+    DISCORD_ID_RE,
+    HYPERLINK_RE,
+    URL_RE,
+    USER_MENTION_RE,
+    PatternScanner,
+)
+
 
 class InfoControl(commands.Cog):
     """Detect and remove potentially sensitive information from chat."""
     
-    __version__ = "1.0.8"
+    __version__ = "1.0.9"
 
     def __init__(self, bot):
         self.bot = bot
@@ -15,62 +24,63 @@ class InfoControl(commands.Cog):
             "enabled": False,
             "log_channel": None,
             "moderator_roles": [],
-            "patterns": {
-                "email": r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b",
-                "ssn": r"\b\d{3}-\d{2}-\d{4}\b",
-                "bankcard": r"\b\d{4} \d{4} \d{4} \d{4}\b",
-                "phone": r"\b\d{3}[-.\s]?\d{3}[-.\s]?\d{4}\b",
-                "phone_no_spaces": r"\b\d{10}\b",
-                "ipv4": r"\b((25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.){3}(25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\b",
-                "ipv6": r"\b([0-9a-fA-F]{1,4}:){7}[0-9a-fA-F]{1,4}\b",
-                "creditcard": r"\b(?:\d[ -]?){13,19}\b",
-                "passport": r"\b[A-PR-WYa-pr-wy][1-9]\d\s?\d{4}[1-9]\b",
-                "iban": r"\b[A-Z]{2}\d{2}[A-Z0-9]{1,30}\b",
-                "mac_address": r"\b([0-9A-Fa-f]{2}[:-]){5}([0-9A-Fa-f]{2})\b",
-                "bitcoin_address": r"\b[13][a-km-zA-HJ-NP-Z1-9]{25,34}\b",
-                "drivers_license": r"\b[A-Z]{2}-\d{1,14}\b",
-                "vin": r"\b[A-HJ-NPR-Z0-9]{17}\b",
-                "ssn_alternative": r"\b\d{3}[-\s]?\d{2}[-\s]?\d{4}\b",
-                "phone_alternative": r"\b\(\d{3}\)\s?\d{3}[-.\s]?\d{4}\b",
-                "zip_code": r"\b\d{5}(?:[-\s]\d{4})?\b",
-                "street_address": r"\b\d{1,5}\s(?:[A-Za-z0-9#]+\s?){1,5}\b",
-                "birthdate": r"\b\d{2}/\d{2}/\d{4}\b",
-                "national_id": r"\b[A-Z0-9]{9}\b",
-                "tax_id": r"\b\d{2}-\d{7}\b",
-                "student_id": r"\b[A-Z0-9]{8}\b"
-            }
+            "patterns": dict(DEFAULT_PATTERNS),
         }
         self.default_guild.update({f"block_{key}": True for key in self.default_guild["patterns"].keys()})
         self.config.register_guild(**self.default_guild)
+        self._guild_cache = {}  # guild id -> guild config, dropped whenever a setting changes
+        self._scanners = {}  # guild id -> PatternScanner for the enabled patterns
+        self._cache_hits = 0
+        self._cache_misses = 0
+
+    async def get_guild_config(self, guild):
+        """Return the guild config from memory, reading from Config only on a miss."""
+        guild_config = self._guild_cache.get(guild.id)
+        if guild_config is None:
+            self._cache_misses += 1
+            guild_config = self._guild_cache[guild.id] = await self.config.guild(guild).all()
+            self._update_scanner(guild, guild_config)
+        else:
+            self._cache_hits += 1
+        return guild_config
+
+    def invalidate_guild_config(self, guild):
+        self._guild_cache.pop(guild.id, None)
+
+    def _update_scanner(self, guild, guild_config):
+        """Recompile the guild's scanner, but only if the set of enabled patterns changed."""
+        enabled = {
+            key: pattern
+            for key, pattern in guild_config["patterns"].items()
+            if guild_config.get(f"block_{key}", False)
+        }
+        scanner = self._scanners.get(guild.id)
+        if scanner is None or scanner.signature != tuple(enabled.items()):
+            self._scanners[guild.id] = PatternScanner(enabled, self.default_guild["patterns"])
 
     @commands.Cog.listener()
     async def on_message_without_command(self, message):
         if message.author.bot or not message.guild:
             return
 
-        guild_config = await self.config.guild(message.guild).all()
+        guild_config = await self.get_guild_config(message.guild)
         if not guild_config["enabled"]:
             return
 
         # Remove user and channel mentions from the message content
-        content = re.sub(r'<@!?[0-9]+>', '', message.content)  # User mentions
-        content = re.sub(r'<#[0-9]+>', '', content)  # Channel mentions
+        content = USER_MENTION_RE.sub('', message.content)
+        content = CHANNEL_MENTION_RE.sub('', content)
 
         # Ignore content inside hyperlinks and URLs
-        def remove_hyperlinks_and_urls(text):
-            text = re.sub(r'\[.*?\]\(.*?\)', '', text)  # Hyperlinks
-            text = re.sub(r'https?://\S+', '', text)  # URLs
-            return text
-
-        content = remove_hyperlinks_and_urls(content)
+        content = HYPERLINK_RE.sub('', content)
+        content = URL_RE.sub('', content)
 
         # Ignore discord user ID's, message ID's, and channel ID's
-        content = re.sub(r'\b\d{17,19}\b', '', content)  # Discord ID's
+        content = DISCORD_ID_RE.sub('', content)
 
-        for key, pattern in guild_config["patterns"].items():
-            if guild_config.get(f"block_{key}", False) and re.search(pattern, content):
-                await self.handle_message_deletion(message, key, guild_config)
-                break
+        key = self._scanners[message.guild.id].scan(content)
+        if key:
+            await self.handle_message_deletion(message, key, guild_config)
 
     async def handle_message_deletion(self, message, key, guild_config):
         try:
@@ -126,6 +136,7 @@ class InfoControl(commands.Cog):
     async def enable(self, ctx):
         """Enable info enforcement"""
         await self.config.guild(ctx.guild).enabled.set(True)
+        self.invalidate_guild_config(ctx.guild)
         await ctx.send("Info enforcement is now enabled.")
 
     @commands.admin_or_permissions()
@@ -133,6 +144,7 @@ class InfoControl(commands.Cog):
     async def disable(self, ctx):
         """Disable info enforcement"""
         await self.config.guild(ctx.guild).enabled.set(False)
+        self.invalidate_guild_config(ctx.guild)
         await ctx.send("Info enforcement is now disabled.")
 
     @commands.admin_or_permissions()
@@ -151,6 +163,7 @@ class InfoControl(commands.Cog):
 
         current = await self.config.guild(ctx.guild).get_raw(f"block_{data_type}")
         await self.config.guild(ctx.guild).set_raw(f"block_{data_type}", value=not current)
+        self.invalidate_guild_config(ctx.guild)
         status = "enabled" if not current else "disabled"
         embed = discord.Embed(
             title="Blocking toggled",
@@ -164,6 +177,7 @@ class InfoControl(commands.Cog):
     async def alerts(self, ctx, channel: discord.TextChannel):
         """Set the log channel for info control deletions."""
         await self.config.guild(ctx.guild).log_channel.set(channel.id)
+        self.invalidate_guild_config(ctx.guild)
         await ctx.send(f"Log channel set to {channel.mention}.")
 
     @commands.admin_or_permissions()
@@ -176,6 +190,7 @@ class InfoControl(commands.Cog):
                 await ctx.send(f"Role {role.mention} added to the list of roles to mention in alerts.")
             else:
                 await ctx.send(f"Role {role.mention} is already in the list of roles to mention in alerts.")
+        self.invalidate_guild_config(ctx.guild)
 
     @commands.admin_or_permissions()
     @infocontrol.command()
@@ -187,6 +202,7 @@ class InfoControl(commands.Cog):
                 await ctx.send(f"Role {role.mention} removed from the list of roles to mention in alerts.")
             else:
                 await ctx.send(f"Role {role.mention} is not in the list of roles to mention in alerts.")
+        self.invalidate_guild_config(ctx.guild)
 
     @infocontrol.command()
     async def settings(self, ctx):
@@ -227,6 +243,10 @@ class InfoControl(commands.Cog):
         
         cog_status = "Enabled" if guild_config.get("enabled", False) else "Disabled"
         settings_list.append(("Cog status", cog_status))
+
+        lookups = self._cache_hits + self._cache_misses
+        hit_rate = f"{self._cache_hits / lookups:.1%} of {lookups}" if lookups else "No lookups yet"
+        settings_list.append(("Settings cache hits", hit_rate))
         
         pages = [settings_list[i:i + 9] for i in range(0, len(settings_list), 9)]
         
@@ -274,5 +294,6 @@ class InfoControl(commands.Cog):
     async def reset(self, ctx):
         """Reset the info control settings to default for this guild."""
         await self.config.guild(ctx.guild).set(self.default_guild)
+        self.invalidate_guild_config(ctx.guild)
         await ctx.send("Info control settings have been reset to default.")
 
@@ -0,0 +1,114 @@
+"""Message scanner used by InfoControl.
+
+Kept free of discord/redbot imports so benchmark.py can load it on its own.
+"""
+import re
+
+DEFAULT_PATTERNS = {
+    "email": r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b",
+    "ssn": r"\b\d{3}-\d{2}-\d{4}\b",
+    "bankcard": r"\b\d{4} \d{4} \d{4} \d{4}\b",
+    "phone": r"\b\d{3}[-.\s]?\d{3}[-.\s]?\d{4}\b",
+    "phone_no_spaces": r"\b\d{10}\b",
+    "ipv4": r"\b((25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.){3}(25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\b",
+    "ipv6": r"\b([0-9a-fA-F]{1,4}:){7}[0-9a-fA-F]{1,4}\b",
+    "creditcard": r"\b(?:\d[ -]?){13,19}\b",
+    "passport": r"\b[A-PR-WYa-pr-wy][1-9]\d\s?\d{4}[1-9]\b",
+    "iban": r"\b[A-Z]{2}\d{2}[A-Z0-9]{1,30}\b",
+    "mac_address": r"\b([0-9A-Fa-f]{2}[:-]){5}([0-9A-Fa-f]{2})\b",
+    "bitcoin_address": r"\b[13][a-km-zA-HJ-NP-Z1-9]{25,34}\b",
+    "drivers_license": r"\b[A-Z]{2}-\d{1,14}\b",
+    "vin": r"\b[A-HJ-NPR-Z0-9]{17}\b",
+    "ssn_alternative": r"\b\d{3}[-\s]?\d{2}[-\s]?\d{4}\b",
+    "phone_alternative": r"\b\(\d{3}\)\s?\d{3}[-.\s]?\d{4}\b",
+    "zip_code": r"\b\d{5}(?:[-\s]\d{4})?\b",
+    "street_address": r"\b\d{1,5}\s(?:[A-Za-z0-9#]+\s?){1,5}\b",
+    "birthdate": r"\b\d{2}/\d{2}/\d{4}\b",
+    "national_id": r"\b[A-Z0-9]{9}\b",
+    "tax_id": r"\b\d{2}-\d{7}\b",
+    "student_id": r"\b[A-Z0-9]{8}\b"
+}
+
+# Parts of a message that are stripped before scanning
+USER_MENTION_RE = re.compile(r'<@!?[0-9]+>')
+CHANNEL_MENTION_RE = re.compile(r'<#[0-9]+>')
+HYPERLINK_RE = re.compile(r'\[.*?\]\(.*?\)')
+URL_RE = re.compile(r'https?://\S+')
+DISCORD_ID_RE = re.compile(r'\b\d{17,19}\b')
+
+# Something a message has to contain for the default pattern of a category to ever match,
+# used to skip whole groups of patterns cheaply. Categories not listed are always scanned.
+DIGIT = "digit"
+PATTERN_REQUIREMENTS = {
+    "email": "@",
+    "ipv6": ":",
+    "ssn": DIGIT,
+    "bankcard": DIGIT,
+    "phone": DIGIT,
+    "phone_no_spaces": DIGIT,
+    "ipv4": DIGIT,
+    "creditcard": DIGIT,
+    "passport": DIGIT,
+    "iban": DIGIT,
+    "bitcoin_address": DIGIT,
+    "drivers_license": DIGIT,
+    "ssn_alternative": DIGIT,
+    "phone_alternative": DIGIT,
+    "zip_code": DIGIT,
+    "street_address": DIGIT,
+    "birthdate": DIGIT,
+    "tax_id": DIGIT,
+}
+DIGIT_RE = re.compile(r'\d')
+
+
+class PatternScanner:
+    """
+    Compiled matcher for the enabled patterns of one guild.
+
+    The enabled patterns are joined into a single alternation so a clean message costs one
+    regex pass. Patterns that cannot match because the message has no digit, '@' or ':' are
+    left out of that pass. Only when something matches are the patterns tried one by one, in
+    their configured order, to report the same category the per-pattern loop would have.
+    """
+
+    def __init__(self, patterns, default_patterns):
+        self.signature = tuple(patterns.items())
+        self._compiled = [(key, re.compile(pattern)) for key, pattern in patterns.items()]
+        # Requirements are only trusted for patterns that are still the shipped default
+        self._requirements = {
+            key: PATTERN_REQUIREMENTS.get(key) if default_patterns.get(key) == pattern else None
+            for key, pattern in patterns.items()
+        }
+        self._combined = {}
+
+    def _combined_for(self, present):
+        combined = self._combined.get(present)
+        if combined is None:
+            alternatives = [
+                f"(?:{pattern.pattern})"
+                for key, pattern in self._compiled
+                if self._requirements[key] is None or self._requirements[key] in present
+            ]
+            combined = re.compile("|".join(alternatives)) if alternatives else None
+            self._combined[present] = combined
+        return combined
+
+    def scan(self, content):
+        """Return the first enabled category that matches the content, or None."""
+        if not self._compiled:
+            return None
+        present = frozenset(
+            feature for feature, found in (
+                (DIGIT, DIGIT_RE.search(content) is not None),
+                ("@", "@" in content),
+                (":", ":" in content),
+            ) if found
+        )
+        combined = self._combined_for(present)
+        if combined is None or not combined.search(content):
+            return None
+        for key, pattern in self._compiled:
+            if pattern.search(content):
+                return key
+        return None
@@ -10,6 +10,9 @@ class InviteFilter(commands.Cog):
         self.bot = bot
         self.config = Config.get_conf(self, identifier=22222222222)
         self._register_config()
+        self._settings_cache = {}  # guild id -> filter settings, dropped whenever a setting changes
+        self._settings_cache_hits = 0
+        self._settings_cache_misses = 0
 
     def _register_config(self):
         """Register configuration defaults."""
@@ -28,6 +31,30 @@ class InviteFilter(commands.Cog):
             total_invites_deleted=0
         )
 
+    async def _guild_settings(self, guild):
+        """Get the filter settings for a guild, reading Config only on a cache miss."""
+        settings = self._settings_cache.get(guild.id)
+        if settings is not None:
+            self._settings_cache_hits += 1
+            return settings
+
+        self._settings_cache_misses += 1
+        config_data = await self.config.guild(guild).all()
+        settings = {
+            "delete_invites": config_data["delete_invites"],
+            # Sets so the per-message whitelist checks are O(1)
+            "whitelisted_channels": frozenset(config_data["whitelisted_channels"]),
+            "whitelisted_categories": frozenset(config_data["whitelisted_categories"]),
+            "whitelisted_roles": frozenset(config_data["whitelisted_roles"]),
+            "logging_channel": config_data["logging_channel"],
+            "timeout_duration": config_data["timeout_duration"],
+        }
+        self._settings_cache[guild.id] = settings
+        return settings
+
+    def _invalidate_settings(self, guild):
+        self._settings_cache.pop(guild.id, None)
+
     @commands.Cog.listener()
     async def on_message(self, message):
         # Ignore bots and DMs
@@ -37,21 +64,23 @@ class InviteFilter(commands.Cog):
         guild = message.guild
         member = message.author # Use member object for timeout
 
+        settings = await self._guild_settings(guild)
+
         # Check if filtering is enabled
-        if not await self.config.guild(guild).delete_invites():
+        if not settings["delete_invites"]:
             return
 
         # Check channel whitelist
-        if message.channel.id in await self.config.guild(guild).whitelisted_channels():
+        if message.channel.id in settings["whitelisted_channels"]:
             return
 
         # Check category whitelist
-        if message.channel.category_id in await self.config.guild(guild).whitelisted_categories():
+        if message.channel.category_id in settings["whitelisted_categories"]:
             return
 
         # Check role whitelist (ensure member object is used)
         if isinstance(member, discord.Member): # Ensure it's a member object before checking roles
-            whitelisted_roles = await self.config.guild(guild).whitelisted_roles()
+            whitelisted_roles = settings["whitelisted_roles"]
             # Use member.roles directly
             if any(role.id in whitelisted_roles for role in member.roles):
                 return
@@ -109,7 +138,7 @@ class InviteFilter(commands.Cog):
 
 
             # --- Action: Timeout User ---
-            timeout_duration_minutes = await self.config.guild(guild).timeout_duration()
+            timeout_duration_minutes = settings["timeout_duration"]
             if timeout_duration_minutes > 0 and isinstance(member, discord.Member): # Check if timeout is enabled and we have a member object
                 # Ensure the bot has permissions higher than the target user
                 if guild.me.top_role > member.top_role:
@@ -131,7 +160,7 @@ class InviteFilter(commands.Cog):
 
 
             # --- Action: Log Event ---
-            logging_channel_id = await self.config.guild(guild).logging_channel()
+            logging_channel_id = settings["logging_channel"]
             if logging_channel_id:
                 logging_channel = guild.get_channel(logging_channel_id)
                 if logging_channel and logging_channel.permissions_for(guild.me).send_messages and logging_channel.permissions_for(guild.me).embed_links:
@@ -187,6 +216,7 @@ class InviteFilter(commands.Cog):
             new_status = on_off
 
         await self.config.guild(guild).delete_invites.set(new_status)
+        self._invalidate_settings(guild)
         status = "enabled" if new_status else "disabled"
         await ctx.send(f"✅ Invite filter is now **{status}**.")
 
@@ -214,6 +244,8 @@ class InviteFilter(commands.Cog):
                 whitelisted_channels.append(channel.id)
                 changelog.append(f"➕ Added channel: {channel.mention}")
 
+        self._invalidate_settings(guild)
+
         if changelog:
             changelog_message = "\n".join(changelog)
             embed = discord.Embed(title="Whitelist Channel Updated", description=changelog_message, color=discord.Color.blue())
@@ -239,6 +271,8 @@ class InviteFilter(commands.Cog):
                 whitelisted_categories.append(category.id)
                 changelog.append(f"➕ Added category: {category.name}")
 
+        self._invalidate_settings(guild)
+
         if changelog:
             changelog_message = "\n".join(changelog)
             embed = discord.Embed(title="Whitelist Category Updated", description=changelog_message, color=discord.Color.blue())
@@ -264,6 +298,8 @@ class InviteFilter(commands.Cog):
                 whitelisted_roles.append(role.id)
                 changelog.append(f"➕ Added role: {role.mention}")
 
+        self._invalidate_settings(guild)
+
         if changelog:
             changelog_message = "\n".join(changelog)
             embed = discord.Embed(title="Whitelist Role Updated", description=changelog_message, color=discord.Color.blue())
@@ -284,9 +320,11 @@ class InviteFilter(commands.Cog):
                  await ctx.send(f"⚠️ I lack `Send Messages` or `Embed Links` permissions in {channel.mention}. Please grant them for logging to work.")
                  return
             await self.config.guild(guild).logging_channel.set(channel.id)
+            self._invalidate_settings(guild)
             await ctx.send(f"✅ Logging channel set to {channel.mention}.")
         else:
             await self.config.guild(guild).logging_channel.set(None)
+            self._invalidate_settings(guild)
             await ctx.send("✅ Logging channel disabled.")
 
 
@@ -303,6 +341,7 @@ class InviteFilter(commands.Cog):
              return
 
         await self.config.guild(guild).timeout_duration.set(minutes)
+        self._invalidate_settings(guild)
         if minutes > 0:
             await ctx.send(f"✅ Timeout duration set to **{minutes}** minutes.")
         else:
@@ -332,6 +371,11 @@ class InviteFilter(commands.Cog):
         # Global Stats
         embed.add_field(name="Across All Servers", value=f"**Total Invites Deleted:** {total_invites_deleted}", inline=False)
 
+        # Settings cache effectiveness since the cog loaded
+        lookups = self._settings_cache_hits + self._settings_cache_misses
+        hit_rate = (self._settings_cache_hits / lookups * 100) if lookups else 0
+        embed.add_field(name="Settings Cache", value=f"**Hit Rate:** {hit_rate:.1f}% of {lookups} lookups", inline=False)
+
         await ctx.send(embed=embed)
 
     @invitefilter.command()
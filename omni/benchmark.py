@@ -0,0 +1,136 @@
+"""Benchmarks for Omni's per-user statistics store and text normalization.
+
+By default, fills a throwaway UserCountStore with a reproducible set of guilds and
+users, then times the upsert flush _save_statistics runs every few minutes and the
+per-guild COUNT query behind [p]omni stats. With --normalize it instead checks that
+normalize() gives the same output as the per-character implementation it replaced on
+fuzzed text from many Unicode blocks, and times both on chat-like messages. Needs no
+Discord or Red install:
+
+    python omni/benchmark.py [--guilds 5000] [--users 40] [--flushes 3] [--seed 1]
+    python omni/benchmark.py --normalize [--strings 200000] [--seed 1]
+"""
+import argparse
+import pathlib
+import random
+import re
+import tempfile
+import time
+import unicodedata
+
+from normalize import normalize
+from usercounts import UserCountStore
+
+# (first, last) codepoints the fuzzer draws from
+FUZZ_RANGES = (
+    (0x20, 0x7E),  # ASCII
+    (0x09, 0x0D),  # ASCII whitespace
+    (0xA0, 0x24F),  # Latin-1 and Latin Extended
+    (0x300, 0x36F),  # combining marks
+    (0x400, 0x4FF),  # Cyrillic
+    (0x2000, 0x206F),  # general punctuation and unusual spaces
+    (0x4E00, 0x9FFF),  # CJK
+    (0xD800, 0xDFFF),  # lone surrogates
+    (0xFFF0, 0xFFFF),  # specials
+    (0x1F300, 0x1FAFF),  # emoji
+    (0x1D400, 0x1D7FF),  # mathematical alphanumerics
+    (0xE0000, 0xE007F),  # tag characters
+)
+
+CHAT_WORDS = (
+    "the and you that was for are with this have from what all when your can there about out "
+    "lol gg brb idk tonight raid server patch queue ranked build meta nerf buff stream clip vibe"
+).split()
+CHAT_EXTRAS = ("!", "?", "...", ":)", "<3", "xD", "**", "\U0001F602", "\U0001F525", "café", "naïve")
+
+
+def flush_rows(guilds, users, r):
+    """One flush worth of (guild_id, user_id, messages, moderated) increments."""
+    rows = []
+    for guild_id in range(1, guilds + 1):
+        for user_id in r.sample(range(10 ** 17, 10 ** 17 + users * 4), users):
+            rows.append((guild_id, user_id, r.randint(1, 50), 1 if r.random() < 0.05 else 0))
+    return rows
+
+
+def flush_benchmark(args, r):
+    with tempfile.TemporaryDirectory() as data_path:
+        store = UserCountStore(pathlib.Path(data_path) / "user_counts.sqlite3")
+        for flush in range(args.flushes):
+            rows = flush_rows(args.guilds, args.users, r)
+            start = time.perf_counter()
+            store.add(rows)
+            print(f"flush {flush + 1}: {len(rows)} rows upserted in {time.perf_counter() - start:.2f}s")
+
+        guild_ids = r.sample(range(1, args.guilds + 1), min(args.guilds, 200))
+        start = time.perf_counter()
+        for guild_id in guild_ids:
+            store.count_moderated_users(guild_id)
+        print(f"moderated user count: {(time.perf_counter() - start) / len(guild_ids) * 1000:.2f}ms per guild")
+
+
+def legacy_normalize(text):
+    """normalize_text before the translate table: one unicodedata.category call per character."""
+    text = ''.join(
+        c if unicodedata.category(c).startswith(('L', 'N')) else ' '
+        for c in unicodedata.normalize('NFKD', text)
+    )
+    replacements = {'nègre': 'negro', 'reggin': 'nigger'}
+    for word, replacement in replacements.items():
+        text = text.replace(word, replacement)
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+def fuzz_string(r):
+    first, last = r.choice(FUZZ_RANGES)
+    if r.random() < 0.5:
+        # Mix in a second block so decomposition and spacing interact across scripts
+        other = r.choice(FUZZ_RANGES)
+        return "".join(chr(r.randint(*r.choice(((first, last), other)))) for _ in range(r.randint(0, 40)))
+    return "".join(chr(r.randint(first, last)) for _ in range(r.randint(0, 40)))
+
+
+def chat_message(r):
+    words = [r.choice(CHAT_WORDS) for _ in range(r.randint(3, 25))]
+    for _ in range(r.randint(0, 3)):
+        words.insert(r.randrange(len(words) + 1), r.choice(CHAT_EXTRAS))
+    return " ".join(words)
+
+
+def normalize_benchmark(args, r):
+    mismatches = 0
+    for _ in range(args.strings):
+        text = fuzz_string(r)
+        if normalize(text) != legacy_normalize(text):
+            mismatches += 1
+            if mismatches <= 5:
+                print(f"mismatch: {text!r}")
+    print(f"{args.strings} fuzzed strings, {mismatches} mismatches")
+
+    messages = [chat_message(r) for _ in range(20000)]
+    for name, func in (("per-character", legacy_normalize), ("translate table", normalize)):
+        start = time.perf_counter()
+        for message in messages:
+            func(message)
+        print(f"{name + ':':17}{(time.perf_counter() - start) / len(messages) * 1e6:.1f}us per chat message")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--guilds", type=int, default=5000)
+    parser.add_argument("--users", type=int, default=40, help="active users per guild in each flush")
+    parser.add_argument("--flushes", type=int, default=3)
+    parser.add_argument("--normalize", action="store_true", help="check and time text normalization instead")
+    parser.add_argument("--strings", type=int, default=200000, help="fuzzed strings for --normalize")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    r = random.Random(args.seed)
+    if args.normalize:
+        normalize_benchmark(args, r)
+    else:
+        flush_benchmark(args, r)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""Message text normalization used by Omni.
+
+Kept free of discord/redbot imports so benchmark.py can load it on its own.
+"""
+import unicodedata
+
+
+class NormalizeTable(dict):
+    """
+    str.translate table that keeps letters and numbers and maps everything else to a space.
+    The Basic Multilingual Plane is filled in up front, other characters are looked up on first use.
+    """
+
+    def __init__(self):
+        super().__init__()
+        for codepoint in range(0x10000):
+            self[codepoint] = self._map(codepoint)
+
+    @staticmethod
+    def _map(codepoint):
+        return codepoint if unicodedata.category(chr(codepoint)).startswith(('L', 'N')) else ' '
+
+    def __missing__(self, codepoint):
+        value = self[codepoint] = self._map(codepoint)
+        return value
+
+NORMALIZE_TABLE = NormalizeTable()
+
+
+def normalize(text):
+    """Replace everything but letters and numbers with single spaces, after NFKD decomposition."""
+    # NFKD leaves pure ASCII unchanged, so it is only needed for other text
+    if not text.isascii():
+        text = unicodedata.normalize('NFKD', text)
+    text = text.translate(NORMALIZE_TABLE)
+    replacements = {'nègre': 'negro', 'reggin': 'nigger'}
+    for word, replacement in replacements.items():
+        text = text.replace(word, replacement)
+    # Only letters, numbers and spaces are left, so this collapses runs and trims the ends
+    return ' '.join(text.split())
@@ -1,12 +1,227 @@
 import discord
 from redbot.core import commands, Config
+from redbot.core.data_manager import cog_data_path
 import aiohttp
 from datetime import timedelta, datetime
-from collections import Counter, defaultdict
-import unicodedata
-import re
+from collections import Counter, defaultdict, deque, OrderedDict
+import hashlib
+import random
+import time
 import asyncio
 
+from .normalize import normalize
+from .usercounts import UserCountStore
+
+class TokenBucket:
+    """Async token bucket that spaces out requests to the moderation endpoint."""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate  # tokens added per second
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+class Histogram:
+    """Fixed-bucket histogram for the moderation queue debug output."""
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.total = 0
+        self.sum = 0
+
+    def observe(self, value):
+        for index, bound in enumerate(self.bounds):
+            if value <= bound:
+                break
+        else:
+            index = len(self.bounds)
+        self.counts[index] += 1
+        self.total += 1
+        self.sum += value
+
+    def format(self, unit=""):
+        lines = []
+        lower = None
+        for bound, count in zip(self.bounds + [None], self.counts):
+            if bound is None:
+                label = f"> {lower}{unit}"
+            else:
+                label = f"<= {bound}{unit}"
+            lines.append(f"`{label:>10}` {count:,}")
+            lower = bound
+        average = self.sum / self.total if self.total else 0
+        lines.append(f"Average: **{average:.2f}{unit}** over **{self.total:,}**")
+        return "\n".join(lines)
+
+class ModerationQueue:
+    """
+    Coalesces text moderation requests that arrive within a short window into one
+    multi-input call. Each guild has its own queue and batches take one item from each
+    guild in turn, so a raid in one guild cannot starve the others. When the queue is
+    full, submit returns None straight away rather than letting latency grow without
+    bound, and the caller sends that request on its own.
+    """
+
+    def __init__(self, send_batch, window=0.05, max_batch=32, max_pending=2000, max_pending_per_guild=200, max_in_flight=4):
+        self.send_batch = send_batch  # async callable: list of payloads -> list of results
+        self.window = window
+        self.max_batch = max_batch
+        self.max_pending = max_pending
+        self.max_pending_per_guild = max_pending_per_guild
+        self.queues = {}  # guild id -> deque of (payload, future, enqueued_at)
+        self.guild_order = deque()  # guilds with pending items, in turn order
+        self.depth = 0
+        self.dropped = 0
+        self.closed = False
+        self._last_drop_log = 0.0
+        self._sending = set()  # batch tasks in flight
+        self.wakeup = asyncio.Event()
+        self.in_flight = asyncio.Semaphore(max_in_flight)
+        self.batch_sizes = Histogram([1, 2, 4, 8, 16, 32])
+        self.latency = Histogram([0.1, 0.25, 0.5, 1, 2.5, 5, 10])
+
+    async def submit(self, guild_id, payload):
+        """Queue a payload and wait for its result. Returns None if the queue is full or closed."""
+        if self.closed:
+            return None
+        queue = self.queues.get(guild_id)
+        if self.depth >= self.max_pending or (queue and len(queue) >= self.max_pending_per_guild):
+            self.dropped += 1
+            now = time.monotonic()
+            if now - self._last_drop_log >= 60:
+                self._last_drop_log = now
+                print(f"Moderation queue full ({self.depth} pending), moderating overflow unbatched; {self.dropped} overflowed so far")
+            return None
+        if queue is None:
+            queue = self.queues[guild_id] = deque()
+            self.guild_order.append(guild_id)
+        future = asyncio.get_running_loop().create_future()
+        queue.append((payload, future, time.monotonic()))
+        self.depth += 1
+        self.wakeup.set()
+        return await future
+
+    def _take_batch(self):
+        batch = []
+        while self.guild_order and len(batch) < self.max_batch:
+            guild_id = self.guild_order.popleft()
+            queue = self.queues[guild_id]
+            batch.append(queue.popleft())
+            if queue:
+                self.guild_order.append(guild_id)
+            else:
+                del self.queues[guild_id]
+        self.depth -= len(batch)
+        return batch
+
+    async def run(self):
+        while True:
+            await self.wakeup.wait()
+            if self.depth < self.max_batch:
+                # Give a burst a moment to fill the batch
+                await asyncio.sleep(self.window)
+            await self.in_flight.acquire()
+            batch = self._take_batch()
+            if not self.depth:
+                self.wakeup.clear()
+            if batch:
+                task = asyncio.create_task(self._send(batch))
+                self._sending.add(task)
+                task.add_done_callback(self._sending.discard)
+            else:
+                self.in_flight.release()
+
+    async def _send(self, batch):
+        try:
+            self.batch_sizes.observe(len(batch))
+            try:
+                results = await self.send_batch([payload for payload, _, _ in batch])
+            except asyncio.CancelledError:
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_result(None)
+                raise
+            except Exception as e:
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                return
+            now = time.monotonic()
+            for (_, future, enqueued_at), result in zip(batch, results):
+                self.latency.observe(now - enqueued_at)
+                if not future.done():
+                    future.set_result(result)
+        finally:
+            self.in_flight.release()
+
+    def close(self):
+        """Resolve every waiting submit with None and stop in-flight batches, so no caller hangs after unload."""
+        self.closed = True
+        for queue in self.queues.values():
+            for _, future, _ in queue:
+                if not future.done():
+                    future.set_result(None)
+        self.queues.clear()
+        self.guild_order.clear()
+        self.depth = 0
+        for task in list(self._sending):
+            task.cancel()
+
+class VerdictCache:
+    """LRU cache with a TTL for moderation scores, keyed on a hash of the moderated content."""
+
+    def __init__(self, max_size=10000, ttl=3600):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.entries = OrderedDict()  # key -> (expires_at, category_scores)
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(*parts):
+        return hashlib.sha256("\0".join(parts).encode()).hexdigest()
+
+    def configure(self, max_size, ttl):
+        self.max_size = max_size
+        self.ttl = ttl
+        while len(self.entries) > max(self.max_size, 0):
+            self.entries.popitem(last=False)
+
+    def get(self, key):
+        if key is None:
+            return None
+        entry = self.entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self.entries[key]
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key, category_scores):
+        # Empty scores mean the request failed, those are never cached
+        if key is None or not category_scores or self.max_size <= 0:
+            return
+        self.entries[key] = (time.monotonic() + self.ttl, category_scores)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
 class Omni(commands.Cog):
     """AI-powered automatic text moderation provided by frontier moderation models"""
 
@@ -15,6 +230,17 @@ class Omni(commands.Cog):
         self.session = None
         self.save_interval = 300  # Save every 5 minutes
 
+        # Shared limits for requests to the moderation endpoint
+        self.rate_limiter = TokenBucket(rate=5, capacity=10)
+        self.moderation_semaphore = asyncio.Semaphore(4)
+        self.max_retries = 4
+        self.retry_count = 0
+        self.moderation_queue = ModerationQueue(self.analyze_text_batch)
+        self.moderation_queue_task = self.bot.loop.create_task(self.moderation_queue.run())
+        self.verdict_cache = VerdictCache()
+        self.attachment_hash_bytes = 64 * 1024  # Image prefix read to build a cache key
+        self.attachment_semaphore = asyncio.Semaphore(4)
+
         # Configuration setup
         self.config = Config.get_conf(self, identifier=11111111111)
         self._register_config()
@@ -24,9 +250,14 @@ class Omni(commands.Cog):
         self.memory_user_message_counts = defaultdict(lambda: defaultdict(int))
         self.memory_moderated_users = defaultdict(lambda: defaultdict(int))
         self.memory_category_counter = defaultdict(Counter)
+        self.channel_message_counts = defaultdict(lambda: defaultdict(int))  # For monitoring reminders
+        self.flush_time_budget = 30  # Seconds a single statistics flush may spend on Config writes
+        self.user_store = UserCountStore(cog_data_path(self) / "user_counts.sqlite3")
 
         # Start periodic save task
+        self.bot.loop.create_task(self.migrate_user_counts())
         self.bot.loop.create_task(self.periodic_save())
+        self.bot.loop.create_task(self.load_verdict_cache_settings())
 
     def _register_config(self):
         """Register configuration defaults."""
@@ -63,9 +294,45 @@ class Omni(commands.Cog):
             global_image_count=0,
             global_moderated_image_count=0,
             global_timeout_count=0,
-            global_total_timeout_duration=0
+            global_total_timeout_duration=0,
+            user_counts_migrated=False,
+            verdict_cache_size=10000,
+            verdict_cache_ttl=3600  # Seconds
+        )
+
+    async def load_verdict_cache_settings(self):
+        self.verdict_cache.configure(
+            await self.config.verdict_cache_size(),
+            await self.config.verdict_cache_ttl()
         )
 
+    async def hash_attachment(self, attachment):
+        """Hash an image's size, type and leading bytes so re-uploads of the same image share a verdict.
+
+        Only the first attachment_hash_bytes are fetched, with a Range request, and at most a few
+        attachments are read at once.
+        """
+        limit = self.attachment_hash_bytes
+        chunks = []
+        try:
+            async with self.attachment_semaphore:
+                async with self.session.get(attachment.url, headers={"Range": f"bytes=0-{limit - 1}"}) as response:
+                    if response.status not in (200, 206):
+                        return None
+                    # Servers that ignore Range send the whole file, stop reading at the limit
+                    while limit > 0:
+                        chunk = await response.content.read(limit)
+                        if not chunk:
+                            break
+                        chunks.append(chunk)
+                        limit -= len(chunk)
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            return None
+        digest = hashlib.sha256(f"{attachment.size}\0{attachment.content_type}\0".encode())
+        for chunk in chunks:
+            digest.update(chunk)
+        return digest.hexdigest()
+
     async def initialize(self):
         """Initialize the aiohttp session."""
         try:
@@ -76,14 +343,7 @@ class Omni(commands.Cog):
     def normalize_text(self, text):
         """Normalize text to replace with standard alphabetical/numeric characters."""
         try:
-            text = ''.join(
-                c if unicodedata.category(c).startswith(('L', 'N')) else ' '
-                for c in unicodedata.normalize('NFKD', text)
-            )
-            replacements = {'nègre': 'negro', 'reggin': 'nigger'}
-            for word, replacement in replacements.items():
-                text = text.replace(word, replacement)
-            return re.sub(r'\s+', ' ', text).strip()
+            return normalize(text)
         except Exception as e:
             raise ValueError(f"Failed to normalize text: {e}")
 
@@ -101,13 +361,13 @@ class Omni(commands.Cog):
         channel = message.channel
 
         # Increment the message count for the channel
-        self.memory_user_message_counts[guild.id][channel.id] += 1
+        self.channel_message_counts[guild.id][channel.id] += 1
 
         # Check if the message count has reached 50
-        if self.memory_user_message_counts[guild.id][channel.id] >= 50:
+        if self.channel_message_counts[guild.id][channel.id] >= 50:
             await self.send_monitoring_reminder(channel)
             # Reset the message count for the channel
-            self.memory_user_message_counts[guild.id][channel.id] = 0
+            self.channel_message_counts[guild.id][channel.id] = 0
 
     async def send_monitoring_reminder(self, channel):
         """Send a monitoring reminder to the specified channel."""
@@ -162,32 +422,56 @@ class Omni(commands.Cog):
 
             normalized_content = self.normalize_text(message.content)
             input_data = [{"type": "text", "text": normalized_content}]
+            image_inputs = []
+            image_attachments = []
 
             if message.attachments:
                 for attachment in message.attachments:
                     if attachment.content_type and attachment.content_type.startswith("image/") and not attachment.content_type.endswith("gif"):
-                        input_data.append({"type": "image_url", "image_url": {"url": attachment.url}})
+                        image_input = {"type": "image_url", "image_url": {"url": attachment.url}}
+                        input_data.append(image_input)
+                        image_inputs.append([image_input])
+                        image_attachments.append(attachment)
                         self.increment_statistic(guild.id, 'image_count')
                         self.increment_statistic('global', 'global_image_count')
 
-            # Analyze text content first
-            text_category_scores = await self.analyze_content(input_data, api_key, message)
+            if image_inputs:
+                image_hashes = await asyncio.gather(*(self.hash_attachment(attachment) for attachment in image_attachments))
+                cache_keys = [
+                    self.verdict_cache.key("text", normalized_content, *image_hashes) if all(image_hashes) else None,
+                    *(self.verdict_cache.key("image", image_hash) if image_hash else None for image_hash in image_hashes)
+                ]
+                inputs = [input_data, *image_inputs]
+                scores = [self.verdict_cache.get(cache_key) for cache_key in cache_keys]
+                misses = [index for index, category_scores in enumerate(scores) if category_scores is None]
+                if misses:
+                    # Text with all images, then each image on its own, all in flight at once
+                    results = await self.analyze_concurrently([inputs[index] for index in misses], api_key, message)
+                    for index, category_scores in zip(misses, results):
+                        scores[index] = category_scores
+                        self.verdict_cache.put(cache_keys[index], category_scores)
+                text_category_scores, *image_scores = scores
+            else:
+                # Text only, batched with other messages arriving at the same time
+                image_scores = []
+                cache_key = self.verdict_cache.key("text", normalized_content)
+                text_category_scores = self.verdict_cache.get(cache_key)
+                if text_category_scores is None:
+                    text_category_scores = await self.moderation_queue.submit(guild.id, (normalized_content, message))
+                    if text_category_scores is None:
+                        if self.moderation_queue.closed:
+                            return
+                        # Queue is full: moderate this message on its own rather than letting it through unchecked
+                        text_category_scores = (await self.analyze_text_batch([(normalized_content, message)]))[0]
+                    self.verdict_cache.put(cache_key, text_category_scores)
             moderation_threshold = await self.config.guild(guild).moderation_threshold()
             text_flagged = any(score > moderation_threshold for score in text_category_scores.values())
 
-            # Analyze each image separately
-            for attachment in message.attachments:
-                if attachment.content_type and attachment.content_type.startswith("image/") and not attachment.content_type.endswith("gif"):
-                    image_data = [{"type": "image_url", "image_url": {"url": attachment.url}}]
-                    image_category_scores = await self.analyze_content(image_data, api_key, message)
-                    image_flagged = any(score > moderation_threshold for score in image_category_scores.values())
-
-                    if image_flagged:
-                        self.update_moderation_stats(guild.id, message, image_category_scores)
-                        await self.handle_moderation(message, image_category_scores)
-
-                    # Space out requests
-                    await asyncio.sleep(1)
+            for image_category_scores in image_scores:
+                image_flagged = any(score > moderation_threshold for score in image_category_scores.values())
+                if image_flagged:
+                    self.update_moderation_stats(guild.id, message, image_category_scores)
+                    await self.handle_moderation(message, image_category_scores)
 
             if text_flagged:
                 self.update_moderation_stats(guild.id, message, text_category_scores)
@@ -221,9 +505,27 @@ class Omni(commands.Cog):
             if score > 0.2:
                 self.memory_category_counter[guild_id][category] += 1
 
-    async def analyze_content(self, input_data, api_key, message):
-        try:
-            while True:
+    async def analyze_concurrently(self, inputs, api_key, message):
+        """Analyze several inputs at once, returning their category scores in the same order."""
+        async def analyze(input_data):
+            async with self.moderation_semaphore:
+                return await self.analyze_content(input_data, api_key, message)
+
+        return await asyncio.gather(*(analyze(input_data) for input_data in inputs))
+
+    async def request_moderation(self, input_data, api_key):
+        """
+        Send one request to the moderation endpoint, retrying rate limits, server errors and
+        connection failures with capped, jittered exponential backoff.
+        Returns the HTTP status (None if no response was received) and the list of results.
+        """
+        status = None
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                self.retry_count += 1
+                await asyncio.sleep(random.uniform(0, min(30, 2 ** attempt)))
+            await self.rate_limiter.acquire()
+            try:
                 async with self.session.post(
                     "https://api.openai.com/v1/moderations",
                     headers={
@@ -235,17 +537,39 @@ class Omni(commands.Cog):
                         "input": input_data
                     }
                 ) as response:
-                    if response.status == 200:
+                    status = response.status
+                    if status == 200:
                         data = await response.json()
-                        return data.get("results", [{}])[0].get("category_scores", {})
-                    elif response.status == 500:
-                        await asyncio.sleep(5)
-                    else:
-                        await self.log_message(message, {}, error_code=response.status)
-                        return {}
+                        return status, data.get("results", [])
+                    if status != 429 and status < 500:
+                        return status, []
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                status = None
+        return status, []
+
+    async def analyze_content(self, input_data, api_key, message):
+        try:
+            status, results = await self.request_moderation(input_data, api_key)
+            if status != 200:
+                await self.log_message(message, {}, error_code=status or "No response")
+                return {}
+            return (results or [{}])[0].get("category_scores", {})
         except Exception as e:
             raise RuntimeError(f"Failed to analyze content: {e}")
 
+    async def analyze_text_batch(self, payloads):
+        """Moderate a batch of (normalized text, message) pairs in one request."""
+        api_key = (await self.bot.get_shared_api_tokens("openai")).get("api_key")
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession()
+        texts = [text for text, _ in payloads]
+        status, results = await self.request_moderation(texts, api_key)
+        if status != 200 or len(results) != len(texts):
+            for _, message in payloads:
+                await self.log_message(message, {}, error_code=status or "No response")
+            return [{} for _ in payloads]
+        return [result.get("category_scores", {}) for result in results]
+
     async def handle_moderation(self, message, category_scores):
         try:
             guild = message.guild
@@ -355,56 +679,93 @@ class Omni(commands.Cog):
             except Exception as e:
                 raise RuntimeError(f"Failed to save statistics: {e}")
 
-    async def _save_statistics(self):
-        """Save statistics to persistent storage."""
-        for guild_id, stats in self.memory_stats.items():
-            if guild_id == 'global':
-                for stat_name, value in stats.items():
-                    current_value = await self.config.get_attr(stat_name)()
-                    await self.config.get_attr(stat_name).set(current_value + value)
-            else:
-                guild_conf = self.config.guild_from_id(guild_id)
-                for stat_name, value in stats.items():
-                    current_value = await guild_conf.get_attr(stat_name)()
-                    await guild_conf.get_attr(stat_name).set(current_value + value)
+    async def migrate_user_counts(self):
+        """
+        Move per-user counts that older versions kept in Config into the SQLite store.
 
-        for guild_id, user_counts in self.memory_user_message_counts.items():
-            if guild_id != 'global':
-                guild_conf = self.config.guild_from_id(guild_id)
-                current_user_counts = await guild_conf.user_message_counts()
-                for user_id, count in user_counts.items():
-                    current_user_counts[user_id] = current_user_counts.get(user_id, 0) + count
-                await guild_conf.user_message_counts.set(current_user_counts)
+        The store records the import in the same transaction as the counts, so if we stop
+        before Config is cleared, the next run only finishes the cleanup.
+        """
+        if await self.config.user_counts_migrated():
+            return
+        rows = defaultdict(lambda: [0, 0])
+        for user_id, count in (await self.config.global_moderated_users()).items():
+            rows[(0, int(user_id))][1] += count
+        for guild_id, data in (await self.config.all_guilds()).items():
+            for user_id, count in data.get("user_message_counts", {}).items():
+                rows[(guild_id, int(user_id))][0] += count
+            for user_id, count in data.get("moderated_users", {}).items():
+                rows[(guild_id, int(user_id))][1] += count
+        await self.bot.loop.run_in_executor(
+            None, self.user_store.add_once, "config_user_counts",
+            [(guild_id, user_id, messages, moderated) for (guild_id, user_id), (messages, moderated) in rows.items()]
+        )
+        for guild_id in await self.config.all_guilds():
+            guild_conf = self.config.guild_from_id(guild_id)
+            await guild_conf.user_message_counts.clear()
+            await guild_conf.moderated_users.clear()
+        await self.config.global_moderated_users.clear()
+        await self.config.user_counts_migrated.set(True)
 
-        for guild_id, users in self.memory_moderated_users.items():
-            if guild_id == 'global':
-                current_users = await self.config.global_moderated_users()
-                for user_id, count in users.items():
-                    current_users[user_id] = current_users.get(user_id, 0) + count
-                await self.config.global_moderated_users.set(current_users)
-            else:
-                guild_conf = self.config.guild_from_id(guild_id)
-                current_users = await guild_conf.moderated_users()
-                for user_id, count in users.items():
-                    current_users[user_id] = current_users.get(user_id, 0) + count
-                await guild_conf.moderated_users.set(current_users)
+    async def _save_statistics(self):
+        """
+        Save statistics to persistent storage.
 
-        for guild_id, counter in self.memory_category_counter.items():
+        Per-user counts go to the SQLite store in one transaction. Counters are then written
+        with one Config transaction per guild. Each guild's in-memory data is taken out before
+        its write, so increments made during the flush are kept for the next one, and put
+        back if the write fails. Guilds not reached within the time budget also stay in memory
+        for the next flush.
+        """
+        user_counts = self.memory_user_message_counts
+        moderated_users = self.memory_moderated_users
+        self.memory_user_message_counts = defaultdict(lambda: defaultdict(int))
+        self.memory_moderated_users = defaultdict(lambda: defaultdict(int))
+
+        rows = defaultdict(lambda: [0, 0])
+        for guild_id, users in user_counts.items():
+            for user_id, count in users.items():
+                rows[(0 if guild_id == 'global' else guild_id, user_id)][0] += count
+        for guild_id, users in moderated_users.items():
+            for user_id, count in users.items():
+                rows[(0 if guild_id == 'global' else guild_id, user_id)][1] += count
+        if rows:
+            try:
+                await self.bot.loop.run_in_executor(
+                    None, self.user_store.add, [(guild_id, user_id, messages, moderated) for (guild_id, user_id), (messages, moderated) in rows.items()]
+                )
+            except Exception as e:
+                print(f"Failed to save user counts, keeping them for the next flush: {e}")
+                for memory, taken in ((self.memory_user_message_counts, user_counts), (self.memory_moderated_users, moderated_users)):
+                    for guild_id, users in taken.items():
+                        for user_id, count in users.items():
+                            memory[guild_id][user_id] += count
+
+        deadline = time.monotonic() + self.flush_time_budget
+        for guild_id in list(self.memory_stats.keys() | self.memory_category_counter.keys()):
+            if time.monotonic() > deadline:
+                break
+            stats = self.memory_stats.pop(guild_id, {})
+            counter = self.memory_category_counter.pop(guild_id, Counter())
             if guild_id == 'global':
-                current_counter = Counter(await self.config.global_category_counter())
-                current_counter.update(counter)
-                await self.config.global_category_counter.set(dict(current_counter))
+                conf = self.config
+                counter_key = 'global_category_counter'
             else:
-                guild_conf = self.config.guild_from_id(guild_id)
-                current_counter = Counter(await guild_conf.category_counter())
-                current_counter.update(counter)
-                await guild_conf.category_counter.set(dict(current_counter))
-
-        # Clear in-memory statistics after saving
-        self.memory_stats.clear()
-        self.memory_user_message_counts.clear()
-        self.memory_moderated_users.clear()
-        self.memory_category_counter.clear()
+                conf = self.config.guild_from_id(guild_id)
+                counter_key = 'category_counter'
+            try:
+                async with conf.all() as data:
+                    for stat_name, value in stats.items():
+                        data[stat_name] = data.get(stat_name, 0) + value
+                    if counter:
+                        current_counter = Counter(data.get(counter_key, {}))
+                        current_counter.update(counter)
+                        data[counter_key] = dict(current_counter)
+            except Exception as e:
+                print(f"Failed to save statistics for {guild_id}, keeping them for the next flush: {e}")
+                for stat_name, value in stats.items():
+                    self.memory_stats[guild_id][stat_name] += value
+                self.memory_category_counter[guild_id].update(counter)
 
     @commands.guild_only()
     @commands.group()
@@ -449,7 +810,7 @@ class Omni(commands.Cog):
             # Local statistics
             message_count = await self.config.guild(ctx.guild).message_count()
             moderated_count = await self.config.guild(ctx.guild).moderated_count()
-            moderated_users = await self.config.guild(ctx.guild).moderated_users()
+            moderated_users = await self.bot.loop.run_in_executor(None, self.user_store.count_moderated_users, ctx.guild.id)
             category_counter = Counter(await self.config.guild(ctx.guild).category_counter())
             image_count = await self.config.guild(ctx.guild).image_count()
             moderated_image_count = await self.config.guild(ctx.guild).moderated_image_count()
@@ -461,7 +822,7 @@ class Omni(commands.Cog):
 
             member_count = ctx.guild.member_count
             moderated_message_percentage = (moderated_count / message_count * 100) if message_count > 0 else 0
-            moderated_user_percentage = (len(moderated_users) / member_count * 100) if member_count > 0 else 0
+            moderated_user_percentage = (moderated_users / member_count * 100) if member_count > 0 else 0
             moderated_image_percentage = (moderated_image_count / image_count * 100) if image_count > 0 else 0
 
             # Calculate estimated moderator time saved
@@ -497,7 +858,7 @@ class Omni(commands.Cog):
             embed.add_field(name=f"In {ctx.guild.name}", value="", inline=False)
             embed.add_field(name="Messages processed", value=f"**{message_count:,}** message{'s' if message_count != 1 else ''}", inline=True)
             embed.add_field(name="Messages moderated", value=f"**{moderated_count:,}** message{'s' if moderated_count != 1 else ''} ({moderated_message_percentage:.2f}%)", inline=True)
-            embed.add_field(name="Users punished", value=f"**{len(moderated_users):,}** user{'s' if len(moderated_users) != 1 else ''} ({moderated_user_percentage:.2f}%)", inline=True)
+            embed.add_field(name="Users punished", value=f"**{moderated_users:,}** user{'s' if moderated_users != 1 else ''} ({moderated_user_percentage:.2f}%)", inline=True)
             embed.add_field(name="Images processed", value=f"**{image_count:,}** image{'s' if image_count != 1 else ''}", inline=True)
             embed.add_field(name="Images moderated", value=f"**{moderated_image_count:,}** image{'s' if moderated_image_count != 1 else ''} ({moderated_image_percentage:.2f}%)", inline=True)
             embed.add_field(name="Timeouts issued", value=f"**{timeout_count:,}** timeout{'s' if timeout_count != 1 else ''}", inline=True)
@@ -506,12 +867,16 @@ class Omni(commands.Cog):
             embed.add_field(name="Most frequent flags", value=top_categories_bullets, inline=False)
             embed.add_field(name="Feedback", value=f"**{too_weak_votes}** votes for too weak, **{too_tough_votes}** votes for too tough, **{just_right_votes}** votes for just right", inline=False)
 
+            cache_lookups = self.verdict_cache.hits + self.verdict_cache.misses
+            cache_hit_ratio = (self.verdict_cache.hits / cache_lookups * 100) if cache_lookups > 0 else 0
+            embed.add_field(name="Repeated content", value=f"**{cache_hit_ratio:.2f}%** of content was judged from cache, saving **{self.verdict_cache.hits:,}** API request{'s' if self.verdict_cache.hits != 1 else ''} since the last restart", inline=False)
+
             # Show global stats if in more than 45 servers
             if len(self.bot.guilds) > 45:
                 # Global statistics
                 global_message_count = await self.config.global_message_count()
                 global_moderated_count = await self.config.global_moderated_count()
-                global_moderated_users = await self.config.global_moderated_users()
+                global_moderated_users = await self.bot.loop.run_in_executor(None, self.user_store.count_moderated_users, 0)
                 global_category_counter = Counter(await self.config.global_category_counter())
                 global_image_count = await self.config.global_image_count()
                 global_moderated_image_count = await self.config.global_moderated_image_count()
@@ -552,7 +917,7 @@ class Omni(commands.Cog):
                 embed.add_field(name="Across all monitored servers", value="", inline=False)
                 embed.add_field(name="Messages processed", value=f"**{global_message_count:,}** message{'s' if global_message_count != 1 else ''}", inline=True)
                 embed.add_field(name="Messages moderated", value=f"**{global_moderated_count:,}** message{'s' if global_moderated_count != 1 else ''} ({global_moderated_message_percentage:.2f}%)", inline=True)
-                embed.add_field(name="Users punished", value=f"**{len(global_moderated_users):,}** user{'s' if len(global_moderated_users) != 1 else ''}", inline=True)
+                embed.add_field(name="Users punished", value=f"**{global_moderated_users:,}** user{'s' if global_moderated_users != 1 else ''}", inline=True)
                 embed.add_field(name="Images processed", value=f"**{global_image_count:,}** image{'s' if global_image_count != 1 else ''}", inline=True)
                 embed.add_field(name="Images moderated", value=f"**{global_moderated_image_count:,}** image{'s' if global_moderated_image_count != 1 else ''} ({global_moderated_image_percentage:.2f}%)", inline=True)
                 embed.add_field(name="Timeouts issued", value=f"**{global_timeout_count:,}** timeout{'s' if global_timeout_count != 1 else ''}", inline=True)
@@ -654,6 +1019,8 @@ class Omni(commands.Cog):
             await self.config.global_timeout_count.set(0)
             await self.config.global_total_timeout_duration.set(0)
 
+            await self.bot.loop.run_in_executor(None, self.user_store.clear)
+
             # Clear in-memory statistics
             self.memory_stats.clear()
             self.memory_user_message_counts.clear()
@@ -952,8 +1319,45 @@ class Omni(commands.Cog):
         except Exception as e:
             raise RuntimeError(f"Failed to toggle debug mode: {e}")
 
+    @omni.command(hidden=True)
+    @commands.is_owner()
+    async def cache(self, ctx, size: int, ttl: int):
+        """Set how many verdicts are cached for repeated content, and for how many seconds."""
+        try:
+            if size < 0 or ttl < 0:
+                await ctx.send("Cache size and TTL must be 0 or greater.")
+                return
+            await self.config.verdict_cache_size.set(size)
+            await self.config.verdict_cache_ttl.set(ttl)
+            self.verdict_cache.configure(size, ttl)
+            await ctx.send(f"Verdict cache set to {size:,} entries for {ttl:,} seconds.")
+        except Exception as e:
+            raise RuntimeError(f"Failed to set verdict cache: {e}")
+
+    @omni.command(hidden=True)
+    @commands.is_owner()
+    async def queue(self, ctx):
+        """Show the state of the moderation batching queue."""
+        try:
+            moderation_queue = self.moderation_queue
+            busiest = sorted(moderation_queue.queues.items(), key=lambda item: len(item[1]), reverse=True)[:5]
+            busiest_lines = "\n".join(f"- `{guild_id}`: {len(queue):,}" for guild_id, queue in busiest) or "None"
+
+            embed = discord.Embed(title="Omni moderation queue", color=0xfffffe)
+            embed.add_field(name="Queue depth", value=f"**{moderation_queue.depth:,}** / {moderation_queue.max_pending:,}", inline=True)
+            embed.add_field(name="Overflowed", value=f"**{moderation_queue.dropped:,}** message{'s' if moderation_queue.dropped != 1 else ''} sent unbatched", inline=True)
+            embed.add_field(name="Retries", value=f"**{self.retry_count:,}** request{'s' if self.retry_count != 1 else ''}", inline=True)
+            embed.add_field(name="Busiest servers", value=busiest_lines, inline=False)
+            embed.add_field(name="Batch size", value=moderation_queue.batch_sizes.format(), inline=True)
+            embed.add_field(name="End-to-end latency", value=moderation_queue.latency.format("s"), inline=True)
+            await ctx.send(embed=embed)
+        except Exception as e:
+            raise RuntimeError(f"Failed to display queue stats: {e}")
+
     def cog_unload(self):
         try:
+            self.moderation_queue_task.cancel()
+            self.moderation_queue.close()
             if self.session and not self.session.closed:
                 self.bot.loop.create_task(self.session.close())
         except Exception as e:
@@ -0,0 +1,80 @@
+"""Per-user count storage used by Omni.
+
+Kept free of discord/redbot imports so benchmark.py can load it on its own.
+"""
+import sqlite3
+
+
+class UserCountStore:
+    """
+    SQLite table of per-user message and moderation counts. These grow with every
+    user ever seen, so they live here instead of in one ever-growing Config dict per guild.
+    Global counts are stored under guild id 0. Methods block, run them in an executor.
+    """
+
+    def __init__(self, path):
+        self.path = str(path)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS user_counts ("
+                "guild_id INTEGER NOT NULL, user_id INTEGER NOT NULL, "
+                "messages INTEGER NOT NULL DEFAULT 0, moderated INTEGER NOT NULL DEFAULT 0, "
+                "PRIMARY KEY (guild_id, user_id)) WITHOUT ROWID"
+            )
+            conn.execute("CREATE TABLE IF NOT EXISTS migrations (name TEXT PRIMARY KEY)")
+        conn.close()
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def add(self, rows):
+        """Add (guild_id, user_id, messages, moderated) increments in one transaction."""
+        conn = self._connect()
+        try:
+            with conn:
+                conn.executemany(
+                    "INSERT INTO user_counts (guild_id, user_id, messages, moderated) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (guild_id, user_id) DO UPDATE SET "
+                    "messages = messages + excluded.messages, moderated = moderated + excluded.moderated",
+                    rows
+                )
+        finally:
+            conn.close()
+
+    def add_once(self, name, rows):
+        """
+        Add increments like add, unless a migration called name already ran. The marker is
+        written in the same transaction, so a crash can never apply the rows twice.
+        """
+        conn = self._connect()
+        try:
+            with conn:
+                if conn.execute("SELECT 1 FROM migrations WHERE name = ?", (name,)).fetchone():
+                    return False
+                conn.executemany(
+                    "INSERT INTO user_counts (guild_id, user_id, messages, moderated) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (guild_id, user_id) DO UPDATE SET "
+                    "messages = messages + excluded.messages, moderated = moderated + excluded.moderated",
+                    rows
+                )
+                conn.execute("INSERT INTO migrations (name) VALUES (?)", (name,))
+                return True
+        finally:
+            conn.close()
+
+    def count_moderated_users(self, guild_id):
+        conn = self._connect()
+        try:
+            return conn.execute(
+                "SELECT COUNT(*) FROM user_counts WHERE guild_id = ? AND moderated > 0", (guild_id,)
+            ).fetchone()[0]
+        finally:
+            conn.close()
+
+    def clear(self):
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute("DELETE FROM user_counts")
+        finally:
+            conn.close()
@@ -0,0 +1,101 @@
+"""Benchmark for Skysearch's gridded aircraft snapshot.
+
+Builds reproducible snapshots of clustered air traffic at a few sizes, then times
+radius queries against the brute-force haversine scan they replace and checks both
+return the same aircraft, including queries at the poles and across the antimeridian.
+NumPy is used when installed, as in the cog; --no-numpy times the pure Python path.
+Needs no Discord or Red install:
+
+    python skysearch/benchmark.py [--sizes 10000,25000,50000] [--queries 300] [--seed 1] [--no-numpy]
+"""
+import argparse
+import math
+import random
+import time
+
+import snapshot
+from snapshot import AircraftSnapshot
+
+# (lat, lon, spread in degrees) of busy airspace the traffic clusters around
+HUBS = (
+    (40.6, -73.8, 6), (51.5, -0.5, 5), (33.9, -118.4, 5), (49.0, 2.5, 5), (35.5, 139.8, 4),
+    (25.3, 55.4, 4), (1.4, 103.9, 4), (-33.9, 151.2, 4), (64.1, -21.9, 8), (-23.4, -46.5, 5),
+)
+EDGE_QUERIES = ((89.5, 0.0), (-89.5, 45.0), (10.0, 179.8), (-20.0, -179.9), (70.0, 179.5))
+RADII_NM = (25, 100, 250)
+
+
+def build_aircraft(count, r):
+    aircraft = []
+    for i in range(count):
+        if r.random() < 0.8:
+            lat, lon, spread = r.choice(HUBS)
+            lat, lon = r.gauss(lat, spread), r.gauss(lon, spread * 1.5)
+        else:
+            lat, lon = r.uniform(-90, 90), r.uniform(-180, 180)
+        lat = max(-90.0, min(90.0, lat))
+        lon = ((lon + 180) % 360) - 180
+        aircraft.append({"hex": f"{i:06x}", "lat": lat, "lon": lon})
+    # Feeds include aircraft without a position, the snapshot skips them
+    aircraft.extend({"hex": f"{count + i:06x}"} for i in range(count // 50))
+    return aircraft
+
+
+def brute_force(aircraft, lat, lon, radius_nm):
+    lat1, lon1 = math.radians(lat), math.radians(lon)
+    results = []
+    for aircraft_info in aircraft:
+        if "lat" not in aircraft_info:
+            continue
+        lat2, lon2 = math.radians(aircraft_info["lat"]), math.radians(aircraft_info["lon"])
+        a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+        distance = 2 * AircraftSnapshot.EARTH_RADIUS_NM * math.asin(math.sqrt(min(a, 1.0)))
+        if distance <= radius_nm:
+            results.append((distance, aircraft_info))
+    results.sort(key=lambda item: item[0])
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="10000,25000,50000", help="comma-separated snapshot sizes")
+    parser.add_argument("--queries", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--no-numpy", action="store_true", help="time the pure Python distance filter")
+    args = parser.parse_args()
+    if args.no_numpy:
+        snapshot.np = None
+    print(f"distance filter: {'pure Python' if snapshot.np is None else 'NumPy'}")
+
+    r = random.Random(args.seed)
+    for size in (int(size) for size in args.sizes.split(",")):
+        aircraft = build_aircraft(size, r)
+        start = time.perf_counter()
+        grid = AircraftSnapshot(aircraft, time.time())
+        build_time = time.perf_counter() - start
+
+        points = [(lat + r.uniform(-2, 2), lon + r.uniform(-2, 2)) for lat, lon, _ in r.choices(HUBS, k=args.queries)]
+        queries = [(lat, lon, r.choice(RADII_NM)) for lat, lon in points]
+        queries += [(lat, lon, radius) for lat, lon in EDGE_QUERIES for radius in RADII_NM]
+
+        grid_time = brute_time = 0.0
+        mismatches = 0
+        for lat, lon, radius in queries:
+            start = time.perf_counter()
+            found = grid.query_radius(lat, lon, radius)
+            grid_time += time.perf_counter() - start
+            start = time.perf_counter()
+            expected = brute_force(aircraft, lat, lon, radius)
+            brute_time += time.perf_counter() - start
+            if {id(a) for _, a in found} != {id(a) for _, a in expected}:
+                mismatches += 1
+
+        print(
+            f"{len(grid)} aircraft: build {build_time * 1000:.0f}ms, "
+            f"query {grid_time / len(queries) * 1000:.2f}ms (brute force {brute_time / len(queries) * 1000:.1f}ms), "
+            f"{mismatches} of {len(queries)} queries differ"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Button paginator used by Skysearch's aircraft lists.
+
+Only needs discord.py, so benchmark.py can load it without Red.
+"""
+import asyncio
+
+import discord #type: ignore
+
+
+class LazyPaginator(discord.ui.View):
+    """Button paginator that renders only the page being shown and prefetches the next.
+
+    render(index) returns (embed, link_buttons). At most the current and next page
+    are kept; everything is released when the view closes or times out.
+    """
+
+    def __init__(self, author_id, page_count, render, timeout=120):
+        super().__init__(timeout=timeout)
+        self.author_id = author_id
+        self.page_count = page_count
+        self.render = render
+        self.page = 0
+        self.message = None
+        self._rendered = {}  # page index -> asyncio.Task resolving to (embed, link_buttons)
+        self.previous_button = discord.ui.Button(emoji="⬅️", style=discord.ButtonStyle.secondary)
+        self.counter_button = discord.ui.Button(label=f"1/{page_count}", style=discord.ButtonStyle.secondary, disabled=True)
+        self.next_button = discord.ui.Button(emoji="➡️", style=discord.ButtonStyle.secondary)
+        self.close_button = discord.ui.Button(emoji="✖️", style=discord.ButtonStyle.secondary)
+        self.previous_button.callback = self._previous
+        self.next_button.callback = self._next
+        self.close_button.callback = self._close
+
+    def _render_task(self, index):
+        task = self._rendered.get(index)
+        if task is None:
+            task = self._rendered[index] = asyncio.ensure_future(self.render(index))
+        return task
+
+    async def _show(self, index):
+        task = self._render_task(index)
+        for stale in [key for key in self._rendered if key not in (index, index + 1)]:
+            self._rendered.pop(stale).cancel()
+        embed, link_buttons = await task
+        if index + 1 < self.page_count:
+            self._render_task(index + 1)
+        self.page = index
+        self.clear_items()
+        self.previous_button.disabled = index == 0
+        self.next_button.disabled = index >= self.page_count - 1
+        self.counter_button.label = f"{index + 1}/{self.page_count}"
+        for item in (self.previous_button, self.counter_button, self.next_button, self.close_button, *link_buttons):
+            self.add_item(item)
+        return embed
+
+    async def start(self, ctx):
+        embed = await self._show(0)
+        self.message = await ctx.send(embed=embed, view=self)
+
+    async def interaction_check(self, interaction):
+        if interaction.user.id != self.author_id:
+            await interaction.response.send_message("Only the person who ran this command can change pages.", ephemeral=True)
+            return False
+        return True
+
+    async def _go(self, interaction, index):
+        if self._render_task(index).done():
+            # Prefetched, so answer the click with the new page in one call
+            embed = await self._show(index)
+            await interaction.response.edit_message(embed=embed, view=self)
+            return
+        await interaction.response.defer()
+        embed = await self._show(index)
+        await interaction.edit_original_response(embed=embed, view=self)
+
+    async def _previous(self, interaction):
+        await self._go(interaction, max(0, self.page - 1))
+
+    async def _next(self, interaction):
+        await self._go(interaction, min(self.page_count - 1, self.page + 1))
+
+    async def _close(self, interaction):
+        await interaction.response.defer()
+        self._release()
+        self.stop()
+        try:
+            await interaction.delete_original_response()
+        except discord.HTTPException:
+            pass
+
+    def _release(self):
+        for task in self._rendered.values():
+            task.cancel()
+        self._rendered.clear()
+        self.render = None
+
+    async def on_timeout(self):
+        self._release()
+        if self.message is not None:
+            try:
+                await self.message.edit(view=None)
+            except discord.HTTPException:
+                pass
@@ -0,0 +1,169 @@
+"""Time-to-first-page benchmark for Skysearch's LazyPaginator.
+
+Drives the real LazyPaginator against stand-ins for Discord that sleep for a fixed
+API latency, with a render step that sleeps for a photo lookup, and compares it with
+the reaction-loop flows it replaced. Needs discord.py (installed with Red) but no bot
+or network:
+
+    python skysearch/paginator_benchmark.py [--pages 300] [--api-ms 100] [--photo-ms 150] [--read-ms 1000]
+"""
+import argparse
+import asyncio
+import time
+
+import discord #type: ignore
+
+from paginator import LazyPaginator
+
+
+class FakeDiscord:
+    """Counts as one Discord API round trip per call."""
+
+    def __init__(self, latency):
+        self.latency = latency
+
+    async def call(self):
+        await asyncio.sleep(self.latency)
+
+
+class FakeMessage:
+    def __init__(self, api):
+        self.api = api
+
+    async def edit(self, **kwargs):
+        await self.api.call()
+
+    async def add_reaction(self, emoji):
+        await self.api.call()
+
+    async def remove_reaction(self, emoji, member):
+        await self.api.call()
+
+
+class FakeContext:
+    def __init__(self, api):
+        self.api = api
+
+    async def send(self, **kwargs):
+        await self.api.call()
+        return FakeMessage(self.api)
+
+
+class FakeResponse:
+    def __init__(self, api):
+        self.api = api
+
+    async def defer(self):
+        await self.api.call()
+
+    async def edit_message(self, **kwargs):
+        await self.api.call()
+
+
+class FakeInteraction:
+    def __init__(self, api):
+        self.api = api
+        self.response = FakeResponse(api)
+
+    async def edit_original_response(self, **kwargs):
+        await self.api.call()
+
+
+def make_render(photo_latency):
+    async def render(index):
+        await asyncio.sleep(photo_latency)  # _get_photo_by_hex on a cold cache
+        embed = discord.Embed(title=f"Aircraft {index + 1}")
+        return embed, [discord.ui.Button(label="Track live", url=f"https://globe.airplanes.live/?icao={index:06x}")]
+    return render
+
+
+async def timed(coro):
+    start = time.perf_counter()
+    await coro
+    return time.perf_counter() - start
+
+
+async def lazy_paginator(api, render, pages, read_time):
+    """LazyPaginator: first page, then next after the user has read the page (prefetched)."""
+    ctx = FakeContext(api)
+    paginator = LazyPaginator(1, pages, render)
+    first = await timed(paginator.start(ctx))
+    await asyncio.sleep(read_time)
+    following = await timed(paginator._next(FakeInteraction(api)))
+    paginator._release()
+    paginator.stop()
+    return first, following
+
+
+async def reaction_loop(api, render, pages, read_time):
+    """The old military flow: render, send, add three reactions; each click edits. The next photo was prefetched."""
+    async def first_page():
+        await render(0)
+        prefetch.append(asyncio.ensure_future(render(1)))
+        message = await FakeContext(api).send(embed=None)
+        for emoji in ("⬅️", "❌", "➡️"):
+            await message.add_reaction(emoji)
+        return message
+
+    prefetch = []
+    start = time.perf_counter()
+    message = await first_page()
+    first = time.perf_counter() - start
+    await asyncio.sleep(read_time)
+    start = time.perf_counter()
+    await prefetch[0]
+    await message.edit(embed=None)
+    return first, time.perf_counter() - start
+
+
+async def message_per_plane(api, render, pages, read_time):
+    """The old scroll flow: two messages and two reactions per plane, and clearing the reaction on each click.
+    The next plane's photo was prefetched."""
+    async def plane(index):
+        ctx = FakeContext(api)
+        rendered = prefetch.pop(index) if index in prefetch else asyncio.ensure_future(render(index))
+        prefetch[index + 1] = asyncio.ensure_future(render(index + 1))
+        await rendered
+        await ctx.send(embed=None)
+        message = await ctx.send(embed=None)
+        for emoji in ("➡️", "⏹️"):
+            await message.add_reaction(emoji)
+        return message
+
+    prefetch = {}
+    first = await timed(plane(0))
+    await asyncio.sleep(read_time)
+    start = time.perf_counter()
+    await FakeMessage(api).remove_reaction("➡️", None)
+    await plane(1)
+    following = time.perf_counter() - start
+    for task in prefetch.values():
+        task.cancel()
+    return first, following
+
+
+async def run(args):
+    api = FakeDiscord(args.api_ms / 1000)
+    render = make_render(args.photo_ms / 1000)
+    read_time = args.read_ms / 1000
+    print(f"{args.pages} pages, {args.api_ms}ms per Discord call, {args.photo_ms}ms photo lookup")
+    for name, flow in (
+        ("reaction loop (military)", reaction_loop),
+        ("message per plane (scroll)", message_per_plane),
+        ("LazyPaginator", lazy_paginator),
+    ):
+        first, following = await flow(api, render, args.pages, read_time)
+        print(f"{name + ':':28}first page {first:.2f}s, next page {following:.2f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=300)
+    parser.add_argument("--api-ms", type=int, default=100, help="latency of each Discord API call")
+    parser.add_argument("--photo-ms", type=int, default=150, help="latency of a planespotters photo lookup")
+    parser.add_argument("--read-ms", type=int, default=1000, help="time the user spends on a page before clicking next")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -7,8 +7,23 @@ import os
 import io
 import tempfile
 import csv
+import gzip
+import html
+import pickle
+import functools
+import email.utils
+import sqlite3
 import datetime
-from urllib.parse import quote_plus
+import time
+import json
+import math
+import sys
+import bisect
+from array import array
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from urllib.parse import quote_plus, urlsplit
 from discord.ext import tasks, commands #type: ignore
 from redbot.core import commands, Config #type: ignore
 from reportlab.lib.pagesizes import letter, landscape, A4 #type: ignore
@@ -16,34 +31,903 @@ from reportlab.pdfgen import canvas #type: ignore
 from reportlab.lib import colors #type: ignore
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle #type: ignore
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak, Table, TableStyle #type: ignore
+from redbot.core.data_manager import cog_data_path #type: ignore
+
+try:
+    import numpy as np #type: ignore
+except ImportError:
+    np = None
 
 import skysearch #type: ignore
+from .paginator import LazyPaginator
+from .snapshot import AircraftSnapshot
 from .icao_codes import law_enforcement_icao_set, military_icao_set, medical_icao_set, suspicious_icao_set, newsagency_icao_set, balloons_icao_set, global_prior_known_accident_set, ukr_conflict_set, agri_utility_set
 
+class ResponseCache:
+    """Short-lived cache of API responses keyed by URL.
+
+    Concurrent requests for a URL that is not cached share a single upstream call, unless
+    the newcomer is more urgent (a lower priority number) than the call in flight: it then
+    makes its own call rather than waiting at the slower priority, and later callers share that.
+    """
+
+    def __init__(self, default_ttl=5, ttl_rules=None, max_entries=1024):
+        self.default_ttl = default_ttl
+        self.ttl_rules = ttl_rules or []  # (url substring, ttl seconds), first match wins
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # url -> (expires_at, data)
+        self._inflight = {}  # url -> (asyncio.Task, priority)
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def ttl_for(self, url):
+        for fragment, ttl in self.ttl_rules:
+            if fragment in url:
+                return ttl
+        return self.default_ttl
+
+    async def get(self, url, fetch, priority=None):
+        entry = self._entries.get(url)
+        if entry is not None:
+            if entry[0] > time.monotonic():
+                self._entries.move_to_end(url)
+                self.hits += 1
+                return entry[1]
+            del self._entries[url]
+
+        inflight = self._inflight.get(url)
+        if inflight is not None and (priority is None or inflight[1] is None or priority >= inflight[1]):
+            self.coalesced += 1
+            return await asyncio.shield(inflight[0])
+
+        self.misses += 1
+        task = asyncio.ensure_future(fetch(url))
+        self._inflight[url] = (task, priority)
+        try:
+            data = await asyncio.shield(task)
+        finally:
+            if self._inflight.get(url, (None,))[0] is task:
+                del self._inflight[url]
+        if data is not None:
+            self._entries[url] = (time.monotonic() + self.ttl_for(url), data)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return data
+
+    def hit_rate(self):
+        total = self.hits + self.coalesced + self.misses
+        return (self.hits + self.coalesced) / total if total else 0.0
+
+
+# Built-in tags, in the order they are shown on an aircraft embed
+ICAO_TAGS = [
+    ("law_enforcement", ":police_officer: Known for use by **state law enforcement**", law_enforcement_icao_set),
+    ("military", ":military_helmet: Known for use in **military** and **government**", military_icao_set),
+    ("medical", ":hospital: Known for use in **medical response** and **transport**", medical_icao_set),
+    ("suspicious", ":warning: Exhibits suspicious flight or **surveillance** activity", suspicious_icao_set),
+    ("prior_accident", ":boom: Prior involved in one or more **documented accidents**", global_prior_known_accident_set),
+    ("ukr_conflict", ":flag_ua: Utilized within the **[Russo-Ukrainian conflict](https://en.wikipedia.org/wiki/Russian-occupied_territories_of_Ukraine)**", ukr_conflict_set),
+    ("news", ":newspaper: Used by **news** or **media** organization", newsagency_icao_set),
+    ("balloon", ":balloon: Aircraft is a **balloon**", balloons_icao_set),
+    ("agri_utility", ":corn: Used for **agriculture surveys, easement validation, or land inspection**", agri_utility_set),
+]
+
+
+class RequestScheduler:
+    """Token bucket shared by every airplanes.live request, handing out slots by priority.
+
+    Waiting requests sit in one queue per priority class; inside a class, guilds take
+    turns so one busy server cannot starve the others. A 429 pauses every class until
+    its Retry-After has passed.
+    """
+
+    ALERT = 0
+    INTERACTIVE = 1
+    BULK = 2
+    NAMES = ("Alerts", "Interactive", "Exports & scroll")
+
+    def __init__(self, rate=1.0, capacity=2):
+        self.rate = rate  # tokens added per second
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.queues = [OrderedDict() for _ in self.NAMES]  # guild id -> deque of (future, queued_at)
+        self.dispatched = [0] * len(self.NAMES)
+        self.wait_total = [0.0] * len(self.NAMES)
+        self.rate_limited = 0
+        self._dispatcher = None
+
+    def depth(self, priority):
+        return sum(len(waiters) for waiters in self.queues[priority].values())
+
+    async def acquire(self, priority=INTERACTIVE, guild_id=None):
+        future = asyncio.get_running_loop().create_future()
+        self.queues[priority].setdefault(guild_id, deque()).append((future, time.monotonic()))
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.ensure_future(self._dispatch())
+        await future
+
+    def penalize(self, retry_after):
+        """Stop handing out slots until retry_after seconds from now."""
+        self.rate_limited += 1
+        self.tokens = 0
+        self.blocked_until = max(self.blocked_until, time.monotonic() + retry_after)
+
+    def _next(self):
+        for priority, queue in enumerate(self.queues):
+            while queue:
+                guild_id, waiters = next(iter(queue.items()))
+                future, queued_at = waiters.popleft()
+                if waiters:
+                    queue.move_to_end(guild_id)
+                else:
+                    del queue[guild_id]
+                if not future.done():
+                    return priority, future, queued_at
+        return None
+
+    async def _dispatch(self):
+        while any(self.queues):
+            now = time.monotonic()
+            if now < self.blocked_until:
+                await asyncio.sleep(self.blocked_until - now)
+                continue
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens < 1:
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+                continue
+            item = self._next()
+            if item is None:
+                break
+            priority, future, queued_at = item
+            self.tokens -= 1
+            self.dispatched[priority] += 1
+            self.wait_total[priority] += now - queued_at
+            future.set_result(None)
+
+    def close(self):
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+
+
+class IcaoTagIndex:
+    """Maps 24-bit ICAO addresses to a bitmask of tags.
+
+    Addresses are kept as a sorted array of ints with a parallel array of masks,
+    which stays small even for external lists with hundreds of thousands of entries.
+    """
+
+    MAX_TAGS = 32
+
+    def __init__(self):
+        self.tags = []  # bit position -> tag name
+        self.labels = {}  # tag name -> embed text
+        self._table = (array('I'), array('I'))  # sorted addresses, parallel masks; swapped as one
+        self._np_table = None
+
+    @staticmethod
+    def parse_hex(hex_id):
+        try:
+            value = int(hex_id.strip().lstrip('~'), 16)
+        except (AttributeError, ValueError):
+            return None
+        return value if 0 <= value <= 0xFFFFFF else None
+
+    def bit(self, tag, label=None):
+        if label or tag not in self.labels:
+            self.labels[tag] = label or f":label: Tagged as **{tag.replace('_', ' ')}**"
+        if tag not in self.tags:
+            if len(self.tags) >= self.MAX_TAGS:
+                raise ValueError(f"Too many ICAO tags, the index supports {self.MAX_TAGS}")
+            self.tags.append(tag)
+        return 1 << self.tags.index(tag)
+
+    def add_many(self, tag, hex_ids, label=None):
+        """Tag every address in hex_ids, returning how many were valid."""
+        bit = self.bit(tag, label)
+        merged = dict(zip(*self._table))
+        added = 0
+        for hex_id in hex_ids:
+            value = self.parse_hex(hex_id)
+            if value is None:
+                continue
+            merged[value] = merged.get(value, 0) | bit
+            added += 1
+        keys = sorted(merged)
+        self._table = (array('I', keys), array('I', (merged[key] for key in keys)))
+        self._np_table = None
+        return added
+
+    def load_file(self, path, tag=None, label=None):
+        """Load an external tag list, one hex address per line.
+
+        Lines may also be `HEX,tag` to tag several categories from one file; blank
+        lines and lines starting with # are ignored. Meant to run in an executor.
+        """
+        grouped = {}
+        with open(path, 'r', encoding='utf-8') as file:
+            for line in file:
+                line = line.strip()
+                if not line or line.startswith('#'):
+                    continue
+                hex_id, _, line_tag = line.partition(',')
+                line_tag = line_tag.strip() or tag
+                if line_tag:
+                    grouped.setdefault(line_tag, []).append(hex_id)
+        return {line_tag: self.add_many(line_tag, hex_ids, label if line_tag == tag else None) for line_tag, hex_ids in grouped.items()}
+
+    def lookup(self, hex_id):
+        value = self.parse_hex(hex_id)
+        if value is None:
+            return 0
+        keys, masks = self._table
+        index = bisect.bisect_left(keys, value)
+        if index < len(keys) and keys[index] == value:
+            return masks[index]
+        return 0
+
+    def tag_batch(self, hex_ids):
+        """Return the tag mask of every address in hex_ids in one pass."""
+        if np is None or not self._table[0]:
+            return [self.lookup(hex_id) for hex_id in hex_ids]
+        np_table = self._np_table
+        if np_table is None or np_table[0] is not self._table:
+            keys, masks = self._table
+            np_table = self._np_table = (self._table, np.frombuffer(keys, dtype=np.uint32), np.frombuffer(masks, dtype=np.uint32))
+        _, keys, masks = np_table
+        values = np.fromiter((self.parse_hex(hex_id) or 0 for hex_id in hex_ids), dtype=np.int64)
+        index = np.minimum(np.searchsorted(keys, values), len(keys) - 1)
+        return np.where(keys[index] == values, masks[index], 0).tolist()
+
+    def labels_for(self, mask):
+        return [self.labels[tag] for position, tag in enumerate(self.tags) if mask & (1 << position)]
+
+    def count(self, tag):
+        if tag not in self.tags:
+            return 0
+        bit = 1 << self.tags.index(tag)
+        return sum(1 for mask in self._table[1] if mask & bit)
+
+    def __len__(self):
+        return len(self._table[0])
+
+
+class AircraftTrack:
+    """Fixed-size ring buffer of (timestamp, lat, lon, alt, speed) samples for one aircraft."""
+
+    __slots__ = ('capacity', 'head', 'ts', 'lat', 'lon', 'alt', 'speed')
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.head = 0  # Next slot to overwrite once the buffer is full
+        self.ts = array('d')
+        self.lat = array('d')
+        self.lon = array('d')
+        self.alt = array('f')
+        self.speed = array('f')
+
+    def __len__(self):
+        return len(self.ts)
+
+    def last_timestamp(self):
+        if not self.ts:
+            return None
+        return self.ts[(self.head - 1) % len(self.ts)]
+
+    def append(self, ts, lat, lon, alt, speed):
+        if len(self.ts) < self.capacity:
+            self.ts.append(ts)
+            self.lat.append(lat)
+            self.lon.append(lon)
+            self.alt.append(alt)
+            self.speed.append(speed)
+            self.head = len(self.ts) % self.capacity
+            return
+        self.ts[self.head] = ts
+        self.lat[self.head] = lat
+        self.lon[self.head] = lon
+        self.alt[self.head] = alt
+        self.speed[self.head] = speed
+        self.head = (self.head + 1) % self.capacity
+
+    def points(self):
+        """Samples in chronological order."""
+        count = len(self.ts)
+        start = self.head if count == self.capacity else 0
+        for offset in range(count):
+            i = (start + offset) % count
+            yield self.ts[i], self.lat[i], self.lon[i], self.alt[i], self.speed[i]
+
+
+class TrackStore:
+    """Per-aircraft position history, capped by an LRU over aircraft."""
+
+    def __init__(self, points_per_aircraft=240, max_aircraft=2000):
+        self.points_per_aircraft = points_per_aircraft
+        self.max_aircraft = max_aircraft
+        self.tracks = OrderedDict()  # lowercase hex -> AircraftTrack
+
+    def ingest(self, response):
+        """Record every positioned aircraft in an airplanes.live style response."""
+        if not isinstance(response, dict):
+            return
+        now = response.get('now')
+        now = now / 1000 if isinstance(now, (int, float)) else time.time()
+        for aircraft_info in response.get('ac') or []:
+            hex_id = str(aircraft_info.get('hex', '')).lower()
+            lat, lon = aircraft_info.get('lat'), aircraft_info.get('lon')
+            if not hex_id or not isinstance(lat, (int, float)) or not isinstance(lon, (int, float)):
+                continue
+            seen_pos = aircraft_info.get('seen_pos')
+            ts = round(now - seen_pos if isinstance(seen_pos, (int, float)) else now, 1)
+            altitude = aircraft_info.get('alt_baro')
+            altitude = 0.0 if altitude == 'ground' else float(altitude) if isinstance(altitude, (int, float)) else math.nan
+            speed = aircraft_info.get('gs')
+            speed = float(speed) if isinstance(speed, (int, float)) else math.nan
+
+            track = self.tracks.get(hex_id)
+            if track is None:
+                track = self.tracks[hex_id] = AircraftTrack(self.points_per_aircraft)
+                if len(self.tracks) > self.max_aircraft:
+                    self.tracks.popitem(last=False)
+            else:
+                self.tracks.move_to_end(hex_id)
+                last = track.last_timestamp()
+                if last is not None and ts <= last:
+                    continue
+            track.append(ts, lat, lon, altitude, speed)
+
+    def get(self, hex_id):
+        return self.tracks.get(hex_id.lower().lstrip('~'))
+
+    @staticmethod
+    def to_csv(hex_id, track):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(["HEX", "TIMESTAMP", "LAT", "LON", "ALT_BARO_FT", "GROUND_SPEED_KT"])
+        for ts, lat, lon, alt, speed in track.points():
+            writer.writerow([
+                hex_id.upper(),
+                datetime.datetime.fromtimestamp(ts, datetime.timezone.utc).isoformat(),
+                lat, lon,
+                "" if math.isnan(alt) else int(alt),
+                "" if math.isnan(speed) else round(speed, 1),
+            ])
+        return buffer.getvalue()
+
+    @staticmethod
+    def to_geojson(hex_id, track):
+        points = list(track.points())
+        coordinates = [[lon, lat] for _, lat, lon, _, _ in points]
+        feature = {
+            "type": "Feature",
+            "geometry": {"type": "LineString", "coordinates": coordinates} if len(coordinates) > 1 else {"type": "Point", "coordinates": coordinates[0]},
+            "properties": {
+                "hex": hex_id.upper(),
+                "times": [datetime.datetime.fromtimestamp(ts, datetime.timezone.utc).isoformat() for ts, *_ in points],
+                "altitudes": [None if math.isnan(alt) else int(alt) for *_, alt, _ in points],
+                "speeds": [None if math.isnan(speed) else round(speed, 1) for *_, speed in points],
+            },
+        }
+        return json.dumps({"type": "FeatureCollection", "features": [feature]})
+
+
+class PhotoCache:
+    """LRU of planespotters lookups: hex -> (expires_at, thumbnail url, photographer).
+
+    Aircraft without photos are cached too (with empty values and a shorter TTL)
+    so they are not looked up again on every embed. Entries can be saved to and
+    loaded from a JSON file so the cache survives restarts.
+    """
+
+    def __init__(self, path=None, max_entries=5000, ttl=7 * 86400, negative_ttl=6 * 3600):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._entries = OrderedDict()
+        self._inflight = {}
+        self.dirty = False
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+
+    def get(self, hex_id):
+        """Return (url, photographer) for a cached hex, ("", "") if it has no photo, or None."""
+        entry = self._entries.get(hex_id)
+        if entry is None:
+            return None
+        if entry[0] <= time.time():
+            del self._entries[hex_id]
+            return None
+        self._entries.move_to_end(hex_id)
+        if entry[1]:
+            self.hits += 1
+        else:
+            self.negative_hits += 1
+        return entry[1], entry[2]
+
+    def put(self, hex_id, url, photographer):
+        ttl = self.ttl if url else self.negative_ttl
+        self._entries[hex_id] = (time.time() + ttl, url or "", photographer or "")
+        self._entries.move_to_end(hex_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        self.dirty = True
+
+    async def fetch(self, hex_id, lookup):
+        """Return the cached photo for hex_id, calling lookup once per uncached hex even when requested concurrently."""
+        cached = self.get(hex_id)
+        if cached is not None:
+            return cached
+        task = self._inflight.get(hex_id)
+        if task is None:
+            self.misses += 1
+            task = self._inflight[hex_id] = asyncio.ensure_future(lookup(hex_id))
+            task.add_done_callback(lambda _: self._inflight.pop(hex_id, None))
+        found, url, photographer = await asyncio.shield(task)
+        if found:
+            self.put(hex_id, url, photographer)
+        return url or "", photographer or ""
+
+    def read_file(self):
+        """Read saved entries from disk; safe to call from an executor."""
+        if self.path is None or not self.path.exists():
+            return {}
+        with open(self.path, 'r', encoding='utf-8') as file:
+            return json.load(file)
+
+    def merge(self, entries):
+        """Add unexpired saved entries behind any fresher lookups so they are evicted first."""
+        now = time.time()
+        for hex_id, (expires_at, url, photographer) in sorted(entries.items(), key=lambda item: item[1][0], reverse=True):
+            if expires_at > now and hex_id not in self._entries:
+                self._entries[hex_id] = (expires_at, url, photographer)
+                self._entries.move_to_end(hex_id, last=False)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def snapshot(self):
+        self.dirty = False
+        return dict(self._entries)
+
+    def write_file(self, entries):
+        """Write entries from snapshot() to disk; safe to call from an executor."""
+        if self.path is None:
+            return
+        temp_path = self.path.with_suffix('.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            json.dump(entries, file, separators=(',', ':'))
+        os.replace(temp_path, self.path)
+
+
+class AirportDatabase:
+    """
+    Local copy of the OurAirports airports, runways and navaids CSVs in SQLite.
+    Lookups never touch the network; the public APIs are only used when an airport
+    is missing here. Methods block, run them in an executor.
+    """
+
+    SOURCE_URL = "https://davidmegginson.github.io/ourairports-data/"
+    SOURCE_FILES = ("airports.csv", "runways.csv", "navaids.csv")
+    TYPE_RANK = "CASE type WHEN 'large_airport' THEN 0 WHEN 'medium_airport' THEN 1 WHEN 'small_airport' THEN 2 ELSE 3 END"
+
+    def __init__(self, path):
+        self.path = path
+
+    def _connect(self):
+        return sqlite3.connect(str(self.path), timeout=30)
+
+    def is_loaded(self):
+        return self.path.exists()
+
+    def import_csv(self, airports_csv, runways_csv, navaids_csv):
+        """Build a fresh database from the three CSV texts and swap it in atomically."""
+        temp_path = self.path.with_suffix('.tmp')
+        if temp_path.exists():
+            temp_path.unlink()
+        conn = sqlite3.connect(str(temp_path))
+        try:
+            with conn:
+                conn.execute(
+                    "CREATE TABLE airports (ident TEXT PRIMARY KEY, type TEXT, name TEXT COLLATE NOCASE, "
+                    "latitude REAL, longitude REAL, elevation_ft INTEGER, iso_country TEXT, iso_region TEXT, "
+                    "municipality TEXT, icao_code TEXT, iata_code TEXT, gps_code TEXT, home_link TEXT, wikipedia_link TEXT)"
+                )
+                conn.execute(
+                    "CREATE TABLE runways (airport_ident TEXT, length_ft INTEGER, width_ft INTEGER, surface TEXT, "
+                    "lighted INTEGER, closed INTEGER, le_ident TEXT, he_ident TEXT)"
+                )
+                conn.execute(
+                    "CREATE TABLE navaids (ident TEXT, name TEXT, type TEXT, frequency_khz INTEGER, latitude_deg REAL, "
+                    "longitude_deg REAL, elevation_ft INTEGER, usageType TEXT, power TEXT, associated_airport TEXT)"
+                )
+                conn.executemany(
+                    "INSERT OR REPLACE INTO airports VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        (
+                            row['ident'], row.get('type'), row.get('name'), self._float(row.get('latitude_deg')),
+                            self._float(row.get('longitude_deg')), self._int(row.get('elevation_ft')), row.get('iso_country'),
+                            row.get('iso_region'), row.get('municipality'), (row.get('icao_code') or '').upper() or None,
+                            (row.get('iata_code') or '').upper() or None, (row.get('gps_code') or '').upper() or None,
+                            row.get('home_link') or None, row.get('wikipedia_link') or None,
+                        )
+                        for row in csv.DictReader(io.StringIO(airports_csv)) if row.get('ident')
+                    )
+                )
+                conn.executemany(
+                    "INSERT INTO runways VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        (
+                            row.get('airport_ident'), self._int(row.get('length_ft')), self._int(row.get('width_ft')),
+                            row.get('surface'), self._int(row.get('lighted')), self._int(row.get('closed')),
+                            row.get('le_ident') or None, row.get('he_ident') or None,
+                        )
+                        for row in csv.DictReader(io.StringIO(runways_csv))
+                    )
+                )
+                conn.executemany(
+                    "INSERT INTO navaids VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        (
+                            row.get('ident'), row.get('name'), row.get('type'), self._int(row.get('frequency_khz')),
+                            self._float(row.get('latitude_deg')), self._float(row.get('longitude_deg')),
+                            self._int(row.get('elevation_ft')), row.get('usageType'), row.get('power'),
+                            row.get('associated_airport'),
+                        )
+                        for row in csv.DictReader(io.StringIO(navaids_csv))
+                    )
+                )
+                conn.execute("CREATE INDEX airports_icao ON airports (icao_code)")
+                conn.execute("CREATE INDEX airports_gps ON airports (gps_code)")
+                conn.execute("CREATE INDEX airports_iata ON airports (iata_code)")
+                conn.execute("CREATE INDEX airports_name ON airports (name)")
+                conn.execute("CREATE INDEX airports_position ON airports (latitude, longitude)")
+                conn.execute("CREATE INDEX runways_airport ON runways (airport_ident)")
+                conn.execute("CREATE INDEX navaids_airport ON navaids (associated_airport)")
+            counts = tuple(conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] for table in ("airports", "runways", "navaids"))
+        finally:
+            conn.close()
+        os.replace(temp_path, self.path)
+        return counts
+
+    @staticmethod
+    def _float(value):
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def _int(value):
+        try:
+            return int(float(value))
+        except (TypeError, ValueError):
+            return None
+
+    def _query(self, sql, params=()):
+        if not self.is_loaded():
+            return []
+        conn = self._connect()
+        conn.row_factory = sqlite3.Row
+        try:
+            return [dict(row) for row in conn.execute(sql, params)]
+        finally:
+            conn.close()
+
+    def find_by_code(self, code):
+        """Airport by ICAO (or GPS/ident) code when 4 characters long, otherwise by IATA code."""
+        code = code.strip().upper()
+        if len(code) == 3:
+            rows = self._query(f"SELECT * FROM airports WHERE iata_code = ? ORDER BY {self.TYPE_RANK} LIMIT 1", (code,))
+        else:
+            rows = self._query(
+                f"SELECT * FROM airports WHERE icao_code = ? OR gps_code = ? OR ident = ? ORDER BY {self.TYPE_RANK} LIMIT 1",
+                (code, code, code)
+            )
+        return rows[0] if rows else None
+
+    def search_name(self, prefix, limit=10):
+        prefix = prefix.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        return self._query(
+            f"SELECT * FROM airports WHERE name LIKE ? ESCAPE '\\' AND type != 'closed' ORDER BY {self.TYPE_RANK}, name LIMIT ?",
+            (prefix + '%', limit)
+        )
+
+    def nearest(self, lat, lon, limit=5, types=("large_airport", "medium_airport", "small_airport")):
+        """Closest open airports as (distance_nm, airport), widening the search box until enough are found."""
+        placeholders = ','.join('?' * len(types))
+        span = 0.5
+        while True:
+            dlon = min(180.0, span / max(math.cos(math.radians(lat)), 0.01))
+            if -180 <= lon - dlon and lon + dlon <= 180:
+                rows = self._query(
+                    f"SELECT * FROM airports WHERE latitude BETWEEN ? AND ? AND longitude BETWEEN ? AND ? AND type IN ({placeholders})",
+                    (lat - span, lat + span, lon - dlon, lon + dlon, *types)
+                )
+            else:  # Box crosses the antimeridian, filter longitude after the query
+                rows = self._query(
+                    f"SELECT * FROM airports WHERE latitude BETWEEN ? AND ? AND type IN ({placeholders})",
+                    (lat - span, lat + span, *types)
+                )
+                rows = [row for row in rows if abs(((row['longitude'] - lon + 180) % 360) - 180) <= dlon]
+            if len(rows) >= limit or span >= 180:
+                break
+            span *= 2
+        lat1, lon1 = math.radians(lat), math.radians(lon)
+        results = []
+        for row in rows:
+            lat2, lon2 = math.radians(row['latitude']), math.radians(row['longitude'])
+            a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+            results.append((2 * AircraftSnapshot.EARTH_RADIUS_NM * math.asin(math.sqrt(min(a, 1.0))), row))
+        results.sort(key=lambda item: item[0])
+        return results[:limit]
+
+    def airportdb_record(self, code):
+        """Airport with its runways and navaids, shaped like an airportdb.io response."""
+        airport = self.find_by_code(code)
+        if airport is None:
+            return None
+        runways = self._query("SELECT * FROM runways WHERE airport_ident = ?", (airport['ident'],))
+        navaids = self._query("SELECT * FROM navaids WHERE associated_airport = ?", (airport['ident'],))
+        for runway in runways:
+            for key in list(runway):
+                if runway[key] is None:
+                    del runway[key]
+        return {'name': airport['name'], 'ident': airport['ident'], 'runways': runways, 'navaids': navaids}
+
+    @staticmethod
+    def as_airport_info(airport):
+        """Shape a local airport row like an airport-data.com ap_info response."""
+        info = {'name': airport['name'], 'latitude': airport['latitude'], 'longitude': airport['longitude']}
+        icao = airport.get('icao_code') or airport.get('gps_code') or airport.get('ident')
+        if icao:
+            info['icao'] = icao
+        if airport.get('iata_code'):
+            info['iata'] = airport['iata_code']
+        if airport.get('iso_country'):
+            info['country_code'] = airport['iso_country']
+        if airport.get('municipality'):
+            info['location'] = airport['municipality']
+        link = airport.get('home_link') or airport.get('wikipedia_link')
+        if link:
+            info['link'] = link
+        return info
+
+
+EXPORT_FORMATS = ("csv", "txt", "html", "ndjson", "pdf")
+EXPORT_SPOOL_SIZE = 8 * 1024 * 1024  # Exports larger than this spill from memory to an anonymous temp file
+PDF_COLUMNS_PER_TABLE = 8
+PDF_ROWS_PER_TABLE = 200
+
+
+def export_columns(aircraft_list):
+    """Union of the keys of every aircraft, in first-seen order."""
+    columns = {}
+    for aircraft in aircraft_list:
+        for key in aircraft:
+            columns.setdefault(key, None)
+    return list(columns)
+
+
+def export_rows(aircraft_list, columns):
+    for aircraft in aircraft_list:
+        yield [aircraft.get(key, "") for key in columns]
+
+
+class EncodedWriter:
+    """Write-only text sink that encodes to UTF-8 in chunks onto a binary file.
+
+    Used instead of io.TextIOWrapper, which needs readable()/writable() on the wrapped
+    file; SpooledTemporaryFile only has those from Python 3.11.
+    """
+
+    def __init__(self, raw, chunk_size=64 * 1024):
+        self.raw = raw
+        self.chunk_size = chunk_size
+        self._parts = []
+        self._size = 0
+
+    def write(self, text):
+        self._parts.append(text)
+        self._size += len(text)
+        if self._size >= self.chunk_size:
+            self.flush()
+        return len(text)
+
+    def writelines(self, lines):
+        for line in lines:
+            self.write(line)
+
+    def flush(self):
+        if self._parts:
+            self.raw.write(''.join(self._parts).encode('utf-8'))
+            self._parts = []
+            self._size = 0
+
+
+def write_export(fp, file_format, columns, aircraft_list):
+    """Stream a text export into the binary file object fp, gzip-compressed for `<format>.gz`."""
+    compressed = file_format.endswith(".gz")
+    base_format = file_format[:-3] if compressed else file_format
+    raw = gzip.GzipFile(fileobj=fp, mode="wb", mtime=0) if compressed else fp
+    text = EncodedWriter(raw)
+    try:
+        if base_format == "csv":
+            writer = csv.writer(text)
+            writer.writerow([key.upper() for key in columns])
+            writer.writerows([str(value) for value in row] for row in export_rows(aircraft_list, columns))
+        elif base_format == "txt":
+            text.write(' '.join(key.upper() for key in columns) + '\n')
+            for row in export_rows(aircraft_list, columns):
+                text.write(' '.join(map(str, row)) + '\n')
+        elif base_format == "html":
+            text.write('<table>\n<tr>\n')
+            text.writelines(f'<th>{html.escape(key.upper())}</th>\n' for key in columns)
+            text.write('</tr>\n')
+            for row in export_rows(aircraft_list, columns):
+                text.write('<tr>\n')
+                text.writelines(f'<td>{html.escape(str(value))}</td>\n' for value in row)
+                text.write('</tr>\n')
+            text.write('</table>\n')
+        elif base_format == "ndjson":
+            for aircraft in aircraft_list:
+                text.write(json.dumps(aircraft, separators=(',', ':'), default=str) + '\n')
+        else:
+            raise ValueError(f"Unsupported export format: {file_format}")
+        text.flush()
+    finally:
+        if compressed:
+            raw.close()
+
+
+def render_pdf_export(title, columns, rows):
+    """Render rows as chunked ReportLab tables and return the PDF bytes.
+
+    Runs in a worker process; columns are split into groups that fit the page and
+    rows into fixed-size tables so ReportLab never lays out one huge flowable.
+    """
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=landscape(A4), leftMargin=24, rightMargin=24, topMargin=24, bottomMargin=24)
+    styles = getSampleStyleSheet()
+    styles.add(ParagraphStyle(name='Normal-Bold', fontName='Helvetica-Bold', fontSize=14, leading=16, alignment=1))
+    table_style = TableStyle([
+        ('FONT', (0, 0), (-1, -1), 'Helvetica', 7),
+        ('FONT', (0, 0), (-1, 0), 'Helvetica-Bold', 7),
+        ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+        ('GRID', (0, 0), (-1, -1), 0.25, colors.grey),
+        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+    ])
+    flowables = [Paragraph(f"<u>{html.escape(title)}</u>", styles['Normal-Bold']), Spacer(1, 24)]
+    col_width = doc.width / PDF_COLUMNS_PER_TABLE
+    for col_start in range(0, len(columns), PDF_COLUMNS_PER_TABLE):
+        header = [key.upper() for key in columns[col_start:col_start + PDF_COLUMNS_PER_TABLE]]
+        for row_start in range(0, len(rows), PDF_ROWS_PER_TABLE):
+            data = [header] + [
+                [str(value)[:60] for value in row[col_start:col_start + PDF_COLUMNS_PER_TABLE]]
+                for row in rows[row_start:row_start + PDF_ROWS_PER_TABLE]
+            ]
+            table = Table(data, colWidths=[col_width] * len(header), repeatRows=1)
+            table.setStyle(table_style)
+            flowables.append(table)
+        flowables.append(PageBreak())
+    doc.build(flowables)
+    return buffer.getvalue()
+
+
 class Skysearch(commands.Cog):
     
     def __init__(self, bot):
         self.bot = bot
         self.config = Config.get_conf(self, identifier=492089091320446976)  
         self.api_url = "https://api.airplanes.live/v2"
+        self.scheduler = RequestScheduler(rate=1.0, capacity=2)
+        self.response_cache = ResponseCache(default_ttl=5, ttl_rules=[("/stats", 300), ("/mil", 15), ("/ladd", 15), ("/pia", 15), ("airport-data.com", 3600)])
         self.max_requests_per_user = 10
         self.EMBED_COLOR = discord.Color(0xfffffe)
+        self.config.register_guild(alert_channel=None, alert_role=None, auto_icao=False, last_emergency_squawk_time=None)
+        self.config.register_global(snapshot_url=None, snapshot_interval=60)
+        self.active_emergencies = {}  # ICAO hex -> {squawk, first_seen, last_seen, landed}
+        self.emergency_expiry = 900  # Seconds an emergency may go unreported before it is forgotten
+        self._alert_targets = None
         self.check_emergency_squawks.start()
-        self.law_enforcement_icao_set = law_enforcement_icao_set
-        self.military_icao_set = military_icao_set
-        self.medical_icao_set = medical_icao_set
-        self.suspicious_icao_set = suspicious_icao_set
-        self.newsagency_icao_set = newsagency_icao_set
-        self.balloons_icao_set = balloons_icao_set
-        self.global_prior_known_accident_set = global_prior_known_accident_set
-        self.ukr_conflict_set = ukr_conflict_set
-        self.agri_utility_set = agri_utility_set
+        self.icao_tags = IcaoTagIndex()
+        for tag, label, hex_ids in ICAO_TAGS:
+            self.icao_tags.add_many(tag, hex_ids, label)
+        self.bot.loop.create_task(self._load_external_tags())
+        self.snapshot = None
+        self.snapshot_url = None
+        self.track_store = TrackStore()
+        self._export_pool = None
+        self.photo_cache = PhotoCache(cog_data_path(self) / "photo_cache.json")
+        self.airport_db = AirportDatabase(cog_data_path(self) / "airports.sqlite3")
+        self.bot.loop.create_task(self._load_photo_cache())
+        self.save_photo_cache.start()
+        self.refresh_snapshot.start()
         
     async def cog_unload(self):
+        try:
+            self.check_emergency_squawks.cancel()
+            self.refresh_snapshot.cancel()
+            self.save_photo_cache.cancel()
+        except Exception as e:
+            print(f"Error unloading cog: {e}")
+        self.scheduler.close()
+        if self._export_pool is not None:
+            if sys.version_info >= (3, 9):
+                self._export_pool.shutdown(wait=False, cancel_futures=True)
+            else:
+                self._export_pool.shutdown(wait=False)
+        if self.photo_cache.dirty:
+            try:
+                self.photo_cache.write_file(self.photo_cache.snapshot())
+            except OSError as e:
+                print(f"Error saving photo cache: {e}")
         if hasattr(self, '_http_client'):
             await self._http_client.close()
 
-    async def _make_request(self, url):
+    async def _load_external_tags(self):
+        """Merge any tag lists dropped into the cog's data folder under icao_tags/."""
+        tags_dir = cog_data_path(self) / "icao_tags"
+        if not tags_dir.is_dir():
+            return
+        loop = asyncio.get_running_loop()
+        for path in sorted(tags_dir.iterdir()):
+            if path.suffix.lower() not in ('.txt', '.csv'):
+                continue
+            try:
+                counts = await loop.run_in_executor(None, self.icao_tags.load_file, path, path.stem)
+                print(f"Loaded ICAO tags from {path.name}: {counts}")
+            except (OSError, ValueError) as e:
+                print(f"Error loading ICAO tags from {path.name}: {e}")
+
+    async def _make_request(self, url, priority=RequestScheduler.INTERACTIVE, guild_id=None):
+        return await self.response_cache.get(url, functools.partial(self._fetch_and_track, priority=priority, guild_id=guild_id), priority)
+
+    async def _fetch_and_track(self, url, priority=RequestScheduler.INTERACTIVE, guild_id=None):
+        if urlsplit(url).hostname == "api.airplanes.live":
+            data = await self._fetch_scheduled(url, priority, guild_id)
+        else:
+            data = await self._fetch_json(url)
+        self.track_store.ingest(data)
+        return data
+
+    @staticmethod
+    def _retry_after(value, default=5.0):
+        if value:
+            try:
+                return min(120.0, max(0.0, float(value)))
+            except ValueError:
+                try:
+                    retry_at = email.utils.parsedate_to_datetime(value)
+                    return min(120.0, max(0.0, (retry_at - datetime.datetime.now(datetime.timezone.utc)).total_seconds()))
+                except (TypeError, ValueError):
+                    pass
+        return default
+
+    async def _fetch_scheduled(self, url, priority, guild_id, attempts=3):
+        """Fetch from airplanes.live once the scheduler grants a slot, waiting out any 429."""
+        if not hasattr(self, '_http_client'):
+            self._http_client = aiohttp.ClientSession()
+        for _ in range(attempts):
+            await self.scheduler.acquire(priority, guild_id)
+            try:
+                async with self._http_client.get(url) as response:
+                    if response.status == 429:
+                        self.scheduler.penalize(self._retry_after(response.headers.get('Retry-After')))
+                        continue
+                    response.raise_for_status()
+                    return await response.json()
+            except aiohttp.ClientError as e:
+                print(f"Error making request: {e}")
+                return None
+        print(f"Error making request: still rate limited after {attempts} attempts for {url}")
+        return None
+
+    async def _fetch_json(self, url):
         if not hasattr(self, '_http_client'):
             self._http_client = aiohttp.ClientSession()
         try:
@@ -57,186 +941,8 @@ class Skysearch(commands.Cog):
     async def _send_aircraft_info(self, ctx, response):
         if 'ac' in response and response['ac']:
             await ctx.typing()
-            aircraft_data = response['ac'][0]
-            emergency_squawk_codes = ['7500', '7600', '7700']
-            hex_id = aircraft_data.get('hex', '')                                      
-            image_url, photographer = await self._get_photo_by_hex(hex_id)
-            link = f"https://globe.airplanes.live/?icao={hex_id}"
-            squawk_code = aircraft_data.get('squawk', 'N/A')
-            description = f"{aircraft_data.get('desc', 'N/A')}"
-            if aircraft_data.get('year', None) is not None:
-                description += f" ({aircraft_data.get('year')})"
-            if squawk_code == '7500':
-                embed = discord.Embed(title=description, color=0xff4545)
-                emergency_status = "Aircraft reports it's been hijacked"
-            elif squawk_code == '7600':
-                embed = discord.Embed(title=description, color=0xff4545)
-                emergency_status = "Aircraft has lost radio contact"
-            elif squawk_code == '7700':
-                embed = discord.Embed(title=description, color=0xff4545)
-                emergency_status = "Aircraft has declared a general emergency"
-            else:
-                embed = discord.Embed(title=description, color=0xfffffe)
-                emergency_status = "Aircraft reports normal conditions"
-            callsign = aircraft_data.get('flight', 'N/A').strip()
-            if not callsign or callsign == 'N/A':
-                callsign = 'BLOCKED'
-            embed.add_field(name="Callsign", value=f"{callsign}", inline=True)
-            registration = aircraft_data.get('reg', None)
-            if registration is not None:
-                registration = registration.upper()
-                embed.add_field(name="Registration", value=f"{registration}", inline=True)
-            icao = aircraft_data.get('hex', 'N/A').upper()
-            embed.add_field(name="ICAO", value=f"{icao}", inline=True)
-            altitude = aircraft_data.get('alt_baro', 'N/A')
-            if altitude == 'ground':
-                embed.add_field(name="Status", value="On ground", inline=True)
-            elif altitude != 'N/A':
-                if isinstance(altitude, int):
-                    altitude = "{:,}".format(altitude)
-                altitude_feet = f"{altitude} ft"
-                embed.add_field(name="Altitude", value=f"{altitude_feet}", inline=True)
-            heading = aircraft_data.get('true_heading', None)
-            if heading is not None:
-                if 0 <= heading < 45:
-                    emoji = ":arrow_upper_right:"
-                elif 45 <= heading < 90:
-                    emoji = ":arrow_right:"
-                elif 90 <= heading < 135:
-                    emoji = ":arrow_lower_right:"
-                elif 135 <= heading < 180:
-                    emoji = ":arrow_down:"
-                elif 180 <= heading < 225:
-                    emoji = ":arrow_lower_left:"
-                elif 225 <= heading < 270:
-                    emoji = ":arrow_left:"
-                elif 270 <= heading < 315:
-                    emoji = ":arrow_upper_left:"
-                else:
-                    emoji = ":arrow_up:"
-                embed.add_field(name="Heading", value=f"{emoji} {heading}°", inline=True)
-            lat = aircraft_data.get('lat', 'N/A')
-            lon = aircraft_data.get('lon', 'N/A')
-            if lat != 'N/A':
-                lat = round(float(lat), 2)
-                lat_dir = "N" if lat >= 0 else "S"
-                lat = f"{abs(lat)}{lat_dir}"
-            if lon != 'N/A':
-                lon = round(float(lon), 2)
-                lon_dir = "E" if lon >= 0 else "W"
-                lon = f"{abs(lon)}{lon_dir}"
-            if lat != 'N/A' and lon != 'N/A':
-                embed.add_field(name="Position", value=f"- {lat}\n- {lon}", inline=True)
-            embed.add_field(name="Squawk", value=f"{aircraft_data.get('squawk', 'BLOCKED')}", inline=True)
-            
-            aircraft_model = aircraft_data.get('t', None)
-            if aircraft_model is not None:
-                embed.add_field(name="Model", value=f"{aircraft_model}", inline=True)
-            ground_speed_knots = aircraft_data.get('gs', 'N/A')
-            if ground_speed_knots != 'N/A':
-                ground_speed_mph = round(float(ground_speed_knots) * 1.15078)
-                embed.add_field(name="Speed", value=f"{ground_speed_mph} mph", inline=True)
-            category_code_to_label = {
-                "A0": "No info available",
-                "A1": "Light aircraft",
-                "A2": "Small aircraft",
-                "A3": "Large aircraft",
-                "A4": "High vortex large aircraft",
-                "A5": "Heavy aircraft",
-                "A6": "High performance aircraft",
-                "A7": "Rotorcraft",
-                "B0": "No info available",
-                "B1": "Glider / sailplane",
-                "B2": "Lighter-than-air",
-                "B3": "Parachutist / skydiver",
-                "B4": "Ultralight / hang-glider / paraglider",
-                "B5": "Reserved",
-                "B6": "UAV",
-                "B7": "Space / trans-atmospheric vehicle",
-                "C0": "No info available",
-                "C1": "Emergency vehicle",
-                "C2": "Service vehicle",
-                "C3": "Point obstacle",
-                "C4": "Cluster obstacle",
-                "C5": "Line obstacle",
-                "C6": "Reserved",
-                "C7": "Reserved"
-            }
-            category = aircraft_data.get('category', None)
-            if category is not None:
-                category_label = category_code_to_label.get(category, "Unknown category")
-                embed.add_field(name="Category", value=f"{category_label}", inline=True)
-
-            operator = aircraft_data.get('ownOp', None)
-            if operator is not None:
-                operator_encoded = quote_plus(operator)
-                embed.add_field(name="Operated by", value=f"[{operator}](https://www.google.com/search?q={operator_encoded})", inline=True)
-            
-            last_seen = aircraft_data.get('seen', 'N/A')
-            if last_seen != 'N/A':
-                last_seen_text = "Just now" if float(last_seen) < 1 else f"{int(float(last_seen))} seconds ago"
-                embed.add_field(name="Last signal", value=last_seen_text, inline=True)
-            
-            last_seen_pos = aircraft_data.get('seen_pos', 'N/A')
-            if last_seen_pos != 'N/A':
-                last_seen_pos_text = "Just now" if float(last_seen_pos) < 1 else f"{int(float(last_seen_pos))} seconds ago"
-                embed.add_field(name="Last position", value=last_seen_pos_text, inline=True)
-            
-            baro_rate = aircraft_data.get('baro_rate', 'N/A')
-            if baro_rate == 'N/A':
-                embed.add_field(name="Altitude trend", value="Altitude trends unavailable, **not enough data**", inline=True)
-            else:
-                baro_rate_fps = round(int(baro_rate) / 60, 2)  # Convert feet per minute to feet per second
-                if abs(baro_rate_fps) < 50/60:
-                    embed.add_field(name="Altitude data", value="Maintaining consistent altitude", inline=True)
-                elif baro_rate_fps > 0:
-                    embed.add_field(name="Altitude data", value=" **Climbing** " + f"{baro_rate_fps} feet/sec", inline=True)
-                else:
-                    embed.add_field(name="Altitude data", value=" **Descending** " + f"{abs(baro_rate_fps)} feet/sec", inline=True)
-
-            embed.add_field(name="Flight status", value=emergency_status, inline=True)
-
-
-            icao = aircraft_data.get('hex', None).upper()
-            if icao and icao.upper() in self.law_enforcement_icao_set:
-                embed.add_field(name="Asset intelligence", value=":police_officer: Known for use by **state law enforcement**", inline=False)
-            if icao and icao.upper() in self.military_icao_set:
-                embed.add_field(name="Asset intelligence", value=":military_helmet: Known for use in **military** and **government**", inline=False)
-            if icao and icao.upper() in self.medical_icao_set:
-                embed.add_field(name="Asset intelligence", value=":hospital: Known for use in **medical response** and **transport**", inline=False)
-            if icao and icao.upper() in self.suspicious_icao_set:
-                embed.add_field(name="Asset intelligence", value=":warning: Exhibits suspicious flight or **surveillance** activity", inline=False)
-            if icao and icao.upper() in self.global_prior_known_accident_set:
-                embed.add_field(name="Asset intelligence", value=":boom: Prior involved in one or more **documented accidents**", inline=False)
-            if icao and icao.upper() in self.ukr_conflict_set:
-                embed.add_field(name="Asset intelligence", value=":flag_ua: Utilized within the **[Russo-Ukrainian conflict](https://en.wikipedia.org/wiki/Russian-occupied_territories_of_Ukraine)**", inline=False)
-            if icao and icao.upper() in self.newsagency_icao_set:
-                embed.add_field(name="Asset intelligence", value=":newspaper: Used by **news** or **media** organization", inline=False)
-            if icao and icao.upper() in self.balloons_icao_set:
-                embed.add_field(name="Asset intelligence", value=":balloon: Aircraft is a **balloon**", inline=False)
-            if icao and icao.upper() in self.agri_utility_set:
-                embed.add_field(name="Asset intelligence", value=":corn: Used for **agriculture surveys, easement validation, or land inspection**", inline=False)
-
-            image_url, photographer = await self._get_photo_by_hex(icao)
-            if image_url and photographer:
-                embed.set_thumbnail(url=image_url)
-                embed.set_footer(text=f"Photo by {photographer}")
-
-            view = discord.ui.View()
-            view.add_item(discord.ui.Button(label="View on airplanes.live", emoji="🗺️", url=f"{link}", style=discord.ButtonStyle.link))
-            ground_speed_mph = ground_speed_mph if 'ground_speed_mph' in locals() else 'unknown'
-            squawk_code = aircraft_data.get('squawk', 'N/A')
-            if squawk_code in emergency_squawk_codes:
-                tweet_text = f"Spotted an aircraft declaring an emergency! #Squawk #{squawk_code}, flight {aircraft_data.get('flight', '')} at position {lat}, {lon} with speed {ground_speed_mph} mph. #SkySearch #Emergency\n\nJoin via Discord to search and discuss planes with your friends for free - https://discord.gg/X8huyaeXrA"
-            else:
-                tweet_text = f"Tracking flight {aircraft_data.get('flight', '')} at position {lat}, {lon} with speed {ground_speed_mph} mph using #SkySearch\n\nJoin via Discord to search and discuss planes with your friends for free - https://discord.gg/X8huyaeXrA"
-            tweet_url = f"https://twitter.com/intent/tweet?text={urllib.parse.quote_plus(tweet_text)}"
-            view.add_item(discord.ui.Button(label=f"Post on 𝕏", emoji="📣", url=tweet_url, style=discord.ButtonStyle.link))
-            whatsapp_text = f"Check out this aircraft! Flight {aircraft_data.get('flight', '')} at position {lat}, {lon} with speed {ground_speed_mph} mph. Track live @ https://globe.airplanes.live/?icao={icao} #SkySearch"
-            whatsapp_url = f"https://api.whatsapp.com/send?text={urllib.parse.quote_plus(whatsapp_text)}"
-            view.add_item(discord.ui.Button(label="Send on WhatsApp", emoji="📱", url=whatsapp_url, style=discord.ButtonStyle.link))
+            embed, view = await self._build_aircraft_embed(response['ac'][0])
             await ctx.send(embed=embed, view=view)
-
         else:
             embed = discord.Embed(title='No results found for your query', color=discord.Colour(0xff4545))
             embed.add_field(name="Details", value="No aircraft information found or the response format is incorrect.", inline=False)
@@ -251,7 +957,179 @@ class Skysearch(commands.Cog):
             except discord.errors.Forbidden:
                 pass
 
+    async def _build_aircraft_embed(self, aircraft_data, tag_mask=None):
+        emergency_squawk_codes = ['7500', '7600', '7700']
+        hex_id = aircraft_data.get('hex', '')                                      
+        link = f"https://globe.airplanes.live/?icao={hex_id}"
+        squawk_code = aircraft_data.get('squawk', 'N/A')
+        description = f"{aircraft_data.get('desc', 'N/A')}"
+        if aircraft_data.get('year', None) is not None:
+            description += f" ({aircraft_data.get('year')})"
+        if squawk_code == '7500':
+            embed = discord.Embed(title=description, color=0xff4545)
+            emergency_status = "Aircraft reports it's been hijacked"
+        elif squawk_code == '7600':
+            embed = discord.Embed(title=description, color=0xff4545)
+            emergency_status = "Aircraft has lost radio contact"
+        elif squawk_code == '7700':
+            embed = discord.Embed(title=description, color=0xff4545)
+            emergency_status = "Aircraft has declared a general emergency"
+        else:
+            embed = discord.Embed(title=description, color=0xfffffe)
+            emergency_status = "Aircraft reports normal conditions"
+        callsign = aircraft_data.get('flight', 'N/A').strip()
+        if not callsign or callsign == 'N/A':
+            callsign = 'BLOCKED'
+        embed.add_field(name="Callsign", value=f"{callsign}", inline=True)
+        registration = aircraft_data.get('reg', None)
+        if registration is not None:
+            registration = registration.upper()
+            embed.add_field(name="Registration", value=f"{registration}", inline=True)
+        icao = aircraft_data.get('hex', 'N/A').upper()
+        embed.add_field(name="ICAO", value=f"{icao}", inline=True)
+        altitude = aircraft_data.get('alt_baro', 'N/A')
+        if altitude == 'ground':
+            embed.add_field(name="Status", value="On ground", inline=True)
+        elif altitude != 'N/A':
+            if isinstance(altitude, int):
+                altitude = "{:,}".format(altitude)
+            altitude_feet = f"{altitude} ft"
+            embed.add_field(name="Altitude", value=f"{altitude_feet}", inline=True)
+        heading = aircraft_data.get('true_heading', None)
+        if heading is not None:
+            if 0 <= heading < 45:
+                emoji = ":arrow_upper_right:"
+            elif 45 <= heading < 90:
+                emoji = ":arrow_right:"
+            elif 90 <= heading < 135:
+                emoji = ":arrow_lower_right:"
+            elif 135 <= heading < 180:
+                emoji = ":arrow_down:"
+            elif 180 <= heading < 225:
+                emoji = ":arrow_lower_left:"
+            elif 225 <= heading < 270:
+                emoji = ":arrow_left:"
+            elif 270 <= heading < 315:
+                emoji = ":arrow_upper_left:"
+            else:
+                emoji = ":arrow_up:"
+            embed.add_field(name="Heading", value=f"{emoji} {heading}°", inline=True)
+        lat = aircraft_data.get('lat', 'N/A')
+        lon = aircraft_data.get('lon', 'N/A')
+        if lat != 'N/A':
+            lat = round(float(lat), 2)
+            lat_dir = "N" if lat >= 0 else "S"
+            lat = f"{abs(lat)}{lat_dir}"
+        if lon != 'N/A':
+            lon = round(float(lon), 2)
+            lon_dir = "E" if lon >= 0 else "W"
+            lon = f"{abs(lon)}{lon_dir}"
+        if lat != 'N/A' and lon != 'N/A':
+            embed.add_field(name="Position", value=f"- {lat}\n- {lon}", inline=True)
+        embed.add_field(name="Squawk", value=f"{aircraft_data.get('squawk', 'BLOCKED')}", inline=True)
+        
+        aircraft_model = aircraft_data.get('t', None)
+        if aircraft_model is not None:
+            embed.add_field(name="Model", value=f"{aircraft_model}", inline=True)
+        ground_speed_knots = aircraft_data.get('gs', 'N/A')
+        if ground_speed_knots != 'N/A':
+            ground_speed_mph = round(float(ground_speed_knots) * 1.15078)
+            embed.add_field(name="Speed", value=f"{ground_speed_mph} mph", inline=True)
+        category_code_to_label = {
+            "A0": "No info available",
+            "A1": "Light aircraft",
+            "A2": "Small aircraft",
+            "A3": "Large aircraft",
+            "A4": "High vortex large aircraft",
+            "A5": "Heavy aircraft",
+            "A6": "High performance aircraft",
+            "A7": "Rotorcraft",
+            "B0": "No info available",
+            "B1": "Glider / sailplane",
+            "B2": "Lighter-than-air",
+            "B3": "Parachutist / skydiver",
+            "B4": "Ultralight / hang-glider / paraglider",
+            "B5": "Reserved",
+            "B6": "UAV",
+            "B7": "Space / trans-atmospheric vehicle",
+            "C0": "No info available",
+            "C1": "Emergency vehicle",
+            "C2": "Service vehicle",
+            "C3": "Point obstacle",
+            "C4": "Cluster obstacle",
+            "C5": "Line obstacle",
+            "C6": "Reserved",
+            "C7": "Reserved"
+        }
+        category = aircraft_data.get('category', None)
+        if category is not None:
+            category_label = category_code_to_label.get(category, "Unknown category")
+            embed.add_field(name="Category", value=f"{category_label}", inline=True)
+
+        operator = aircraft_data.get('ownOp', None)
+        if operator is not None:
+            operator_encoded = quote_plus(operator)
+            embed.add_field(name="Operated by", value=f"[{operator}](https://www.google.com/search?q={operator_encoded})", inline=True)
+        
+        last_seen = aircraft_data.get('seen', 'N/A')
+        if last_seen != 'N/A':
+            last_seen_text = "Just now" if float(last_seen) < 1 else f"{int(float(last_seen))} seconds ago"
+            embed.add_field(name="Last signal", value=last_seen_text, inline=True)
+        
+        last_seen_pos = aircraft_data.get('seen_pos', 'N/A')
+        if last_seen_pos != 'N/A':
+            last_seen_pos_text = "Just now" if float(last_seen_pos) < 1 else f"{int(float(last_seen_pos))} seconds ago"
+            embed.add_field(name="Last position", value=last_seen_pos_text, inline=True)
+        
+        baro_rate = aircraft_data.get('baro_rate', 'N/A')
+        if baro_rate == 'N/A':
+            embed.add_field(name="Altitude trend", value="Altitude trends unavailable, **not enough data**", inline=True)
+        else:
+            baro_rate_fps = round(int(baro_rate) / 60, 2)  # Convert feet per minute to feet per second
+            if abs(baro_rate_fps) < 50/60:
+                embed.add_field(name="Altitude data", value="Maintaining consistent altitude", inline=True)
+            elif baro_rate_fps > 0:
+                embed.add_field(name="Altitude data", value=" **Climbing** " + f"{baro_rate_fps} feet/sec", inline=True)
+            else:
+                embed.add_field(name="Altitude data", value=" **Descending** " + f"{abs(baro_rate_fps)} feet/sec", inline=True)
+
+        embed.add_field(name="Flight status", value=emergency_status, inline=True)
+
+
+        icao = aircraft_data.get('hex', '').upper()
+        if tag_mask is None:
+            tag_mask = self.icao_tags.lookup(icao)
+        for label in self.icao_tags.labels_for(tag_mask):
+            embed.add_field(name="Asset intelligence", value=label, inline=False)
+
+        image_url, photographer = await self._get_photo_by_hex(icao)
+        if image_url and photographer:
+            embed.set_thumbnail(url=image_url)
+            embed.set_footer(text=f"Photo by {photographer}")
+
+        view = discord.ui.View()
+        view.add_item(discord.ui.Button(label="View on airplanes.live", emoji="🗺️", url=f"{link}", style=discord.ButtonStyle.link))
+        ground_speed_mph = ground_speed_mph if 'ground_speed_mph' in locals() else 'unknown'
+        squawk_code = aircraft_data.get('squawk', 'N/A')
+        if squawk_code in emergency_squawk_codes:
+            tweet_text = f"Spotted an aircraft declaring an emergency! #Squawk #{squawk_code}, flight {aircraft_data.get('flight', '')} at position {lat}, {lon} with speed {ground_speed_mph} mph. #SkySearch #Emergency\n\nJoin via Discord to search and discuss planes with your friends for free - https://discord.gg/X8huyaeXrA"
+        else:
+            tweet_text = f"Tracking flight {aircraft_data.get('flight', '')} at position {lat}, {lon} with speed {ground_speed_mph} mph using #SkySearch\n\nJoin via Discord to search and discuss planes with your friends for free - https://discord.gg/X8huyaeXrA"
+        tweet_url = f"https://twitter.com/intent/tweet?text={urllib.parse.quote_plus(tweet_text)}"
+        view.add_item(discord.ui.Button(label=f"Post on 𝕏", emoji="📣", url=tweet_url, style=discord.ButtonStyle.link))
+        whatsapp_text = f"Check out this aircraft! Flight {aircraft_data.get('flight', '')} at position {lat}, {lon} with speed {ground_speed_mph} mph. Track live @ https://globe.airplanes.live/?icao={icao} #SkySearch"
+        whatsapp_url = f"https://api.whatsapp.com/send?text={urllib.parse.quote_plus(whatsapp_text)}"
+        view.add_item(discord.ui.Button(label="Send on WhatsApp", emoji="📱", url=whatsapp_url, style=discord.ButtonStyle.link))
+        return embed, view
+
     async def _get_photo_by_hex(self, hex_id):
+        if not hex_id:
+            return None, None
+        url, photographer = await self.photo_cache.fetch(hex_id.lower(), self._lookup_photo)
+        return url or None, photographer or None
+
+    async def _lookup_photo(self, hex_id):
+        """Query planespotters, returning (cacheable, url, photographer); failures are not cached."""
         if not hasattr(self, '_http_client'):
             self._http_client = aiohttp.ClientSession()
         try:
@@ -262,10 +1140,31 @@ class Skysearch(commands.Cog):
                         photo = json_out['photos'][0]
                         url = photo.get('thumbnail_large', {}).get('src', '')
                         photographer = photo.get('photographer', '')
-                        return url, photographer
-        except (KeyError, IndexError, aiohttp.ClientError):
+                        return True, url, photographer
+                    return True, None, None
+                if response.status == 404:
+                    return True, None, None
+        except (KeyError, IndexError, aiohttp.ClientError, asyncio.TimeoutError):
             pass
-        return None, None
+        return False, None, None
+
+    async def _load_photo_cache(self):
+        loop = asyncio.get_running_loop()
+        try:
+            entries = await loop.run_in_executor(None, self.photo_cache.read_file)
+            self.photo_cache.merge(entries)
+        except (OSError, ValueError, TypeError) as e:
+            print(f"Error loading photo cache: {e}")
+
+    @tasks.loop(minutes=10)
+    async def save_photo_cache(self):
+        if not self.photo_cache.dirty:
+            return
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(None, self.photo_cache.write_file, self.photo_cache.snapshot())
+        except OSError as e:
+            print(f"Error saving photo cache: {e}")
 
     @commands.guild_only()
     @commands.group(name='skysearch', help='Core menu for the cog', invoke_without_command=True)
@@ -282,13 +1181,9 @@ class Skysearch(commands.Cog):
         url = "https://api.airplanes.live/stats"
 
         try:
-            if not hasattr(self, '_http_client'):
-                self._http_client = aiohttp.ClientSession()
-            async with self._http_client.get(url) as response:
-                if response.status == 200:
-                    data = await response.json()
-                else:
-                    raise aiohttp.ClientError(f"API responded with status code: {response.status}")
+            data = await self._make_request(url, guild_id=ctx.guild.id)
+            if data is None:
+                raise aiohttp.ClientError("API did not return statistics")
 
             embed = discord.Embed(title="SkySearch Statistics", description="Consolidated statistics and data sources for SkySearch.", color=0xfffffe)
             embed.set_thumbnail(url="https://www.beehive.systems/hubfs/Icon%20Packs/White/airplane.png")
@@ -304,21 +1199,25 @@ class Skysearch(commands.Cog):
 
             embed.add_field(name="This data appears in the following commands", value="`callsign` `icao` `reg` `squawk` `type` `radius` `pia` `mil` `ladd` `export`", inline=False)
 
-            embed.add_field(name="Law enforcement aircraft", value="**{:,}** tagged".format(len(self.law_enforcement_icao_set)), inline=True)
-            embed.add_field(name="Military & government aircraft", value="**{:,}** tagged".format(len(self.military_icao_set)), inline=True)
-            embed.add_field(name="Medical aircraft", value="**{:,}** tagged".format(len(self.medical_icao_set)), inline=True)
-            embed.add_field(name="Media aircraft", value="**{:,}** known".format(len(self.newsagency_icao_set)), inline=True)
-            embed.add_field(name="Damaged aircraft", value="**{:,}** known".format(len(self.global_prior_known_accident_set)), inline=True)
-            embed.add_field(name="Wartime aircraft", value="**{:,}** observed".format(len(self.ukr_conflict_set)), inline=True)
-            embed.add_field(name="Utility aircraft", value="**{:,}** spotted".format(len(self.agri_utility_set)), inline=True)
-            embed.add_field(name="Balloons", value="**{:,}** known".format(len(self.balloons_icao_set)), inline=True)
-            embed.add_field(name="Suspicious aircraft", value="**{:,}** identifiers".format(len(self.suspicious_icao_set)), inline=True)
+            embed.add_field(name="Law enforcement aircraft", value="**{:,}** tagged".format(self.icao_tags.count('law_enforcement')), inline=True)
+            embed.add_field(name="Military & government aircraft", value="**{:,}** tagged".format(self.icao_tags.count('military')), inline=True)
+            embed.add_field(name="Medical aircraft", value="**{:,}** tagged".format(self.icao_tags.count('medical')), inline=True)
+            embed.add_field(name="Media aircraft", value="**{:,}** known".format(self.icao_tags.count('news')), inline=True)
+            embed.add_field(name="Damaged aircraft", value="**{:,}** known".format(self.icao_tags.count('prior_accident')), inline=True)
+            embed.add_field(name="Wartime aircraft", value="**{:,}** observed".format(self.icao_tags.count('ukr_conflict')), inline=True)
+            embed.add_field(name="Utility aircraft", value="**{:,}** spotted".format(self.icao_tags.count('agri_utility')), inline=True)
+            embed.add_field(name="Balloons", value="**{:,}** known".format(self.icao_tags.count('balloon')), inline=True)
+            embed.add_field(name="Suspicious aircraft", value="**{:,}** identifiers".format(self.icao_tags.count('suspicious')), inline=True)
             embed.add_field(name="This data appears in the following commands", value="`callsign` `icao` `reg` `squawk` `type` `radius` `pia` `mil` `ladd`", inline=False)
             embed.add_field(name="Other services", value="Additional data used in this cog is shown below", inline=False)
             embed.add_field(name="Photography", value="Photos are powered by community contributions at [planespotters.net](https://www.planespotters.net/)", inline=True)
             embed.add_field(name="Airport data", value="Airport data is powered by the [airport-data.com](https://airport-data.com/) API service", inline=True)
             embed.add_field(name="Runway data", value="Runway data is powered by the [airportdb.io](https://airportdb.io) API service", inline=True)
             embed.add_field(name="Mapping and imagery", value="Mapping and ground imagery powered by [Google Maps](https://maps.google.com) and the [Maps Static API](https://developers.google.com/maps/documentation/maps-static)", inline=False)
+            photos = self.photo_cache
+            embed.add_field(name="Photo cache", value=f"**{photos.hits:,}** hits, **{photos.negative_hits:,}** known without photos, **{photos.misses:,}** lookups", inline=False)
+            cache = self.response_cache
+            embed.add_field(name="Response cache", value=f"**{cache.hits + cache.coalesced:,}** hits ({cache.coalesced:,} coalesced), **{cache.misses:,}** misses, **{cache.hit_rate():.0%}** hit rate", inline=False)
 
             await ctx.send(embed=embed)
         except aiohttp.ClientError as e:
@@ -326,6 +1225,53 @@ class Skysearch(commands.Cog):
             await ctx.send(embed=embed)
         
 
+    @commands.is_owner()
+    @skysearch.command(name='snapshot', hidden=True)
+    async def snapshot_settings(self, ctx, url: str = None, interval: int = 60):
+        """Answer radius queries from a local copy of a global aircraft feed.
+
+        The URL must return JSON with an `ac` or `aircraft` list, such as a readsb
+        aircraft.json. Use `off` to go back to querying the API for every radius.
+        """
+        if url is None:
+            snapshot = self.snapshot
+            if not self.snapshot_url:
+                description = "Local radius queries are **disabled**."
+            elif snapshot is None:
+                description = f"Waiting for the first snapshot from `{self.snapshot_url}`."
+            else:
+                description = f"**{len(snapshot):,}** aircraft in **{len(snapshot.cells):,}** grid cells, fetched <t:{int(snapshot.fetched_at)}:R> from `{self.snapshot_url}` every {int(self.refresh_snapshot.seconds)}s."
+            await ctx.send(embed=discord.Embed(title="Aircraft snapshot", description=description, color=0xfffffe))
+            return
+        if url.lower() == "off":
+            await self.config.snapshot_url.clear()
+            self.snapshot_url = None
+            self.snapshot = None
+            await ctx.send(embed=discord.Embed(description="Local radius queries disabled.", color=0xfffffe))
+            return
+        interval = max(15, interval)
+        await self.config.snapshot_url.set(url)
+        await self.config.snapshot_interval.set(interval)
+        self.snapshot_url = url
+        self.refresh_snapshot.change_interval(seconds=interval)
+        self.refresh_snapshot.restart()
+        await ctx.send(embed=discord.Embed(description=f"Radius queries will be answered from `{url}`, refreshed every {interval}s.", color=0xfffffe))
+
+    @commands.is_owner()
+    @skysearch.command(name='queue', hidden=True)
+    async def queue_stats(self, ctx):
+        """Show the state of the airplanes.live request scheduler."""
+        scheduler = self.scheduler
+        embed = discord.Embed(title="SkySearch request scheduler", color=0xfffffe)
+        for priority, name in enumerate(scheduler.NAMES):
+            dispatched = scheduler.dispatched[priority]
+            average_wait = scheduler.wait_total[priority] / dispatched if dispatched else 0.0
+            embed.add_field(name=name, value=f"**{scheduler.depth(priority):,}** waiting in {len(scheduler.queues[priority]):,} server{'s' if len(scheduler.queues[priority]) != 1 else ''}\n**{dispatched:,}** sent, {average_wait:.2f}s average wait", inline=True)
+        blocked = max(0.0, scheduler.blocked_until - time.monotonic())
+        embed.add_field(name="Rate", value=f"{scheduler.rate:g} request{'s' if scheduler.rate != 1 else ''}/s, burst {scheduler.capacity}", inline=True)
+        embed.add_field(name="Rate limited", value=f"**{scheduler.rate_limited:,}** time{'s' if scheduler.rate_limited != 1 else ''}" + (f", paused for {blocked:.0f}s" if blocked else ""), inline=True)
+        await ctx.send(embed=embed)
+
     @commands.guild_only()
     @commands.group(name='aircraft', help='Command center for aircraft related commands')
     async def aircraft_group(self, ctx):
@@ -336,7 +1282,7 @@ class Skysearch(commands.Cog):
     @aircraft_group.command(name='icao', help='Get information about an aircraft by its 24-bit ICAO Address')
     async def aircraft_by_icao(self, ctx, hex_id: str):
         url = f"{self.api_url}/hex/{hex_id}"
-        response = await self._make_request(url)
+        response = await self._make_request(url, guild_id=ctx.guild.id)
         if response:
             if 'ac' in response and len(response['ac']) > 1:
                 for aircraft_info in response['ac']:
@@ -351,7 +1297,7 @@ class Skysearch(commands.Cog):
     @aircraft_group.command(name='callsign', help='Get information about an aircraft by its callsign.')
     async def aircraft_by_callsign(self, ctx, callsign: str):
         url = f"{self.api_url}/callsign/{callsign}"
-        response = await self._make_request(url)
+        response = await self._make_request(url, guild_id=ctx.guild.id)
         if response:
             await self._send_aircraft_info(ctx, response)
         else:
@@ -362,7 +1308,7 @@ class Skysearch(commands.Cog):
     @aircraft_group.command(name='reg', help='Get information about an aircraft by its registration.')
     async def aircraft_by_reg(self, ctx, registration: str):
         url = f"{self.api_url}/reg/{registration}"
-        response = await self._make_request(url)
+        response = await self._make_request(url, guild_id=ctx.guild.id)
         if response:
             await self._send_aircraft_info(ctx, response)
         else:
@@ -373,7 +1319,7 @@ class Skysearch(commands.Cog):
     @aircraft_group.command(name='type', help='Get information about aircraft by its type.')
     async def aircraft_by_type(self, ctx, aircraft_type: str):
         url = f"{self.api_url}/type/{aircraft_type}"
-        response = await self._make_request(url)
+        response = await self._make_request(url, guild_id=ctx.guild.id)
         if response:
             await self._send_aircraft_info(ctx, response)
         else:
@@ -384,7 +1330,7 @@ class Skysearch(commands.Cog):
     @aircraft_group.command(name='squawk', help='Get information about an aircraft by its squawk code.')
     async def aircraft_by_squawk(self, ctx, squawk_value: str):
         url = f"{self.api_url}/squawk/{squawk_value}"
-        response = await self._make_request(url)
+        response = await self._make_request(url, guild_id=ctx.guild.id)
         if response:
             await self._send_aircraft_info(ctx, response)
         else:
@@ -395,13 +1341,12 @@ class Skysearch(commands.Cog):
     @aircraft_group.command(name='military', help='Get information about military aircraft.')
     async def show_military_aircraft(self, ctx):
         url = f"{self.api_url}/mil"
-        response = await self._make_request(url)
+        response = await self._make_request(url, guild_id=ctx.guild.id)
         if response:
             aircraft_list = response['ac']
             if aircraft_list:
-                page_index = 0
-
-                async def create_embed(aircraft):
+                async def create_page(page_index):
+                    aircraft = aircraft_list[page_index]
                     embed = discord.Embed(title=f"Live military aircraft ({page_index + 1} of {len(aircraft_list)})", color=0xfffffe)
                     embed.set_thumbnail(url="https://www.beehive.systems/hubfs/Icon%20Packs/White/airplane.png")
                     aircraft_description = aircraft.get('desc', 'N/A')  # Aircraft Description
@@ -426,43 +1371,9 @@ class Skysearch(commands.Cog):
                     if photographer:
                         embed.set_footer(text=f"Photo by {photographer}")
 
-                    view = discord.ui.View()
-                    view.add_item(discord.ui.Button(label=f"Track {aircraft_hex} live", url=f"https://globe.airplanes.live/?icao={aircraft_hex}"))
-
-                    return embed, view
-
-                async def update_message(message, page_index):
-                    embed, view = await create_embed(aircraft_list[page_index])
-                    await message.edit(embed=embed, view=view)
-
-                embed, view = await create_embed(aircraft_list[page_index])
-                message = await ctx.send(embed=embed, view=view)
+                    return embed, [discord.ui.Button(label=f"Track {aircraft_hex} live", url=f"https://globe.airplanes.live/?icao={aircraft_hex}")]
 
-                await message.add_reaction("⬅️")
-                await message.add_reaction("❌")
-                await message.add_reaction("➡️")
-                
-                def check(reaction, user):
-                    return user == ctx.author and str(reaction.emoji) in ["⬅️", "❌", "➡️"]
-
-                while True:
-                    try:
-                        reaction, user = await self.bot.wait_for("reaction_add", timeout=60.0, check=check)
-
-                        if str(reaction.emoji) == "⬅️" and page_index > 0:
-                            page_index -= 1
-                            await update_message(message, page_index)
-                        elif str(reaction.emoji) == "➡️" and page_index < len(aircraft_list) - 1:
-                            page_index += 1
-                            await update_message(message, page_index)
-                        elif str(reaction.emoji) == "❌":
-                            await message.delete()
-                            break
-
-                        await message.remove_reaction(reaction, user)
-                    except asyncio.TimeoutError:
-                        await message.clear_reactions()
-                        break
+                await LazyPaginator(ctx.author.id, len(aircraft_list), create_page).start(ctx)
             else:
                 await self._send_aircraft_info(ctx, response)
         else:
@@ -473,48 +1384,10 @@ class Skysearch(commands.Cog):
     @aircraft_group.command(name='ladd', help='Get information on LADD-restricted aircraft')
     async def ladd_aircraft(self, ctx):
         url = f"{self.api_url}/ladd"
-        response = await self._make_request(url)
+        response = await self._make_request(url, guild_id=ctx.guild.id)
         if response:
             if len(response['ac']) > 1:
-                pages = [response['ac'][i:i + 10] for i in range(0, len(response['ac']), 10)]  # Split aircraft list into pages of 10
-                for page_index, page in enumerate(pages):
-                    embed = discord.Embed(title=f"Limited Aircraft Data Displayed (Page {page_index + 1}/{len(pages)})", color=0xfffffe)
-                    embed.set_thumbnail(url="https://www.beehive.systems/hubfs/Icon%20Packs/White/airplane.png")
-                    for aircraft in page:
-                        aircraft_description = aircraft.get('desc', 'N/A')  # Aircraft Description
-                        aircraft_squawk = aircraft.get('squawk', 'N/A')  # Squawk
-                        aircraft_lat = aircraft.get('lat', 'N/A')  # Latitude
-                        aircraft_lon = aircraft.get('lon', 'N/A')  # Longitude
-                        aircraft_heading = aircraft.get('heading', 'N/A')  # Heading
-                        aircraft_speed = aircraft.get('spd', 'N/A')  # Speed
-                        aircraft_hex = aircraft.get('hex', 'N/A')  # Hex
-
-                        aircraft_info = f"**Squawk:** {aircraft_squawk}\n"
-                        aircraft_info += f"**Coordinates:** Lat: {aircraft_lat}, Lon: {aircraft_lon}\n"
-                        aircraft_info += f"**Heading:** {aircraft_heading}\n"
-                        aircraft_info += f"**Speed:** {aircraft_speed}\n"
-                        aircraft_info += f"**ICAO:** {aircraft_hex}"
-
-                        embed.add_field(name=aircraft_description, value=aircraft_info, inline=False)
-
-                    message = await ctx.send(embed=embed)
-                    await message.add_reaction("⬅️")  # Adding a reaction to scroll to the previous page
-                    await message.add_reaction("➡️")  # Adding a reaction to scroll to the next page
-
-                    def check(reaction, user):
-                        return user == ctx.author and str(reaction.emoji) in ['⬅️', '➡️']
-
-                    try:
-                        reaction, user = await self.bot.wait_for('reaction_add', timeout=60.0, check=check)
-                        if str(reaction.emoji) == '⬅️' and page_index > 0:  # Check if the previous page reaction was added and it's not the first page
-                            await message.delete()
-                            page_index -= 1
-                        elif str(reaction.emoji) == '➡️' and page_index < len(pages) - 1:  # Check if the next page reaction was added and it's not the last page
-                            await message.delete()
-                            page_index += 1
-                    except asyncio.TimeoutError:
-                        await message.delete()
-                        break
+                await self._paginate_aircraft_list(ctx, "Limited Aircraft Data Displayed", response['ac'])
             else:
                 await self._send_aircraft_info(ctx, response)
         else:
@@ -525,65 +1398,95 @@ class Skysearch(commands.Cog):
     @aircraft_group.command(name='pia', help='View live aircraft using private ICAO addresses')
     async def pia_aircraft(self, ctx):
         url = f"{self.api_url}/pia"
-        response = await self._make_request(url)
+        response = await self._make_request(url, guild_id=ctx.guild.id)
         if response:
             if len(response['ac']) > 1:
-                pages = [response['ac'][i:i + 10] for i in range(0, len(response['ac']), 10)]  # Split aircraft list into pages of 10
-                for page_index, page in enumerate(pages):
-                    embed = discord.Embed(title=f"Private ICAO Aircraft Data Displayed (Page {page_index + 1}/{len(pages)})", color=0xfffffe)
-                    embed.set_thumbnail(url="https://www.beehive.systems/hubfs/Icon%20Packs/White/airplane.png")
-                    for aircraft in page:
-                        aircraft_description = aircraft.get('desc', 'N/A')  # Aircraft Description
-                        aircraft_squawk = aircraft.get('squawk', 'N/A')  # Squawk
-                        aircraft_lat = aircraft.get('lat', 'N/A')  # Latitude
-                        aircraft_lon = aircraft.get('lon', 'N/A')  # Longitude
-                        aircraft_heading = aircraft.get('heading', 'N/A')  # Heading
-                        aircraft_speed = aircraft.get('spd', 'N/A')  # Speed
-                        aircraft_hex = aircraft.get('hex', 'N/A')  # Hex
-
-                        aircraft_info = f"**Squawk:** {aircraft_squawk}\n"
-                        aircraft_info += f"**Coordinates:** Lat: {aircraft_lat}, Lon: {aircraft_lon}\n"
-                        aircraft_info += f"**Heading:** {aircraft_heading}\n"
-                        aircraft_info += f"**Speed:** {aircraft_speed}\n"
-                        aircraft_info += f"**ICAO:** {aircraft_hex}"
-
-                        embed.add_field(name=aircraft_description, value=aircraft_info, inline=False)
-
-                    message = await ctx.send(embed=embed)
-                    await message.add_reaction("⬅️")  # Adding a reaction to scroll to the previous page
-                    await message.add_reaction("➡️")  # Adding a reaction to scroll to the next page
-
-                    def check(reaction, user):
-                        return user == ctx.author and str(reaction.emoji) in ['⬅️', '➡️']
-
-                    try:
-                        reaction, user = await self.bot.wait_for('reaction_add', timeout=60.0, check=check)
-                        if str(reaction.emoji) == '⬅️' and page_index > 0:  # Check if the previous page reaction was added and it's not the first page
-                            await message.delete()
-                            page_index -= 1
-                        elif str(reaction.emoji) == '➡️' and page_index < len(pages) - 1:  # Check if the next page reaction was added and it's not the last page
-                            await message.delete()
-                            page_index += 1
-                    except asyncio.TimeoutError:
-                        await message.delete()
-                        break
+                await self._paginate_aircraft_list(ctx, "Private ICAO Aircraft Data Displayed", response['ac'])
             else:
                 await self._send_aircraft_info(ctx, response)
         else:
             embed = discord.Embed(title="Error", description="Error retrieving aircraft information.", color=0xff4545)
             await ctx.send(embed=embed)
 
+    async def _paginate_aircraft_list(self, ctx, title, aircraft_list, per_page=10):
+        page_count = (len(aircraft_list) + per_page - 1) // per_page
+        tag_masks = self.icao_tags.tag_batch([aircraft.get('hex', '') for aircraft in aircraft_list])
+
+        async def create_page(page_index):
+            embed = discord.Embed(title=f"{title} (Page {page_index + 1}/{page_count})", color=0xfffffe)
+            embed.set_thumbnail(url="https://www.beehive.systems/hubfs/Icon%20Packs/White/airplane.png")
+            start = page_index * per_page
+            for aircraft, tag_mask in zip(aircraft_list[start:start + per_page], tag_masks[start:start + per_page]):
+                aircraft_description = aircraft.get('desc', 'N/A')  # Aircraft Description
+                aircraft_info = f"**Squawk:** {aircraft.get('squawk', 'N/A')}\n"
+                aircraft_info += f"**Coordinates:** Lat: {aircraft.get('lat', 'N/A')}, Lon: {aircraft.get('lon', 'N/A')}\n"
+                aircraft_info += f"**Heading:** {aircraft.get('heading', 'N/A')}\n"
+                aircraft_info += f"**Speed:** {aircraft.get('spd', 'N/A')}\n"
+                aircraft_info += f"**ICAO:** {aircraft.get('hex', 'N/A')}"
+                for label in self.icao_tags.labels_for(tag_mask):
+                    aircraft_info += f"\n{label}"
+                embed.add_field(name=aircraft_description, value=aircraft_info[:1024], inline=False)
+            return embed, []
+
+        await LazyPaginator(ctx.author.id, page_count, create_page).start(ctx)
+
     @commands.guild_only()
     @aircraft_group.command(name='radius', help='Get information about aircraft within a specified radius.')
     async def aircraft_within_radius(self, ctx, lat: str, lon: str, radius: str):
-        url = f"{self.api_url}/point/{lat}/{lon}/{radius}"
-        response = await self._make_request(url)
+        response = self._query_snapshot_radius(lat, lon, radius)
+        if response is None:
+            url = f"{self.api_url}/point/{lat}/{lon}/{radius}"
+            response = await self._make_request(url, guild_id=ctx.guild.id)
         if response:
             await self._send_aircraft_info(ctx, response)
         else:
             embed = discord.Embed(title="Error", description="Error retrieving aircraft information for aircraft within the specified radius.", color=0xff4545)
             await ctx.send(embed=embed)
 
+    @commands.guild_only()
+    @aircraft_group.command(name='track', help='Show or export the recorded track of an aircraft by its ICAO address.')
+    async def aircraft_track(self, ctx, hex_id: str, file_format: str = None):
+        """Show the positions SkySearch has recorded for an aircraft, optionally exported as csv or geojson."""
+        track = self.track_store.get(hex_id)
+        if track is None or not len(track):
+            embed = discord.Embed(title="Error", description="No track recorded for that aircraft yet. Tracks build up as the aircraft appears in lookups and squawk alerts.", color=0xff4545)
+            await ctx.send(embed=embed)
+            return
+
+        if file_format is not None:
+            file_format = file_format.lower()
+            if file_format == "csv":
+                content = self.track_store.to_csv(hex_id, track)
+            elif file_format == "geojson":
+                content = self.track_store.to_geojson(hex_id, track)
+            else:
+                embed = discord.Embed(title="Error", description="Invalid file format specified. Use one of: csv or geojson.", color=0xfa4545)
+                await ctx.send(embed=embed)
+                return
+            file = discord.File(io.BytesIO(content.encode('utf-8')), filename=f"track_{hex_id.lower()}.{file_format}")
+            await ctx.send(file=file)
+            return
+
+        points = list(track.points())
+        first_ts, *_ = points[0]
+        last_ts, last_lat, last_lon, last_alt, last_speed = points[-1]
+        altitudes = [alt for *_, alt, _ in points if not math.isnan(alt)]
+        embed = discord.Embed(title=f"Track for {hex_id.upper()}", color=0xfffffe)
+        embed.add_field(name="Positions", value=f"**{len(points):,}** recorded", inline=True)
+        embed.add_field(name="First seen", value=f"<t:{int(first_ts)}:R>", inline=True)
+        embed.add_field(name="Last seen", value=f"<t:{int(last_ts)}:R>", inline=True)
+        embed.add_field(name="Last position", value=f"{last_lat:.4f}, {last_lon:.4f}", inline=True)
+        if not math.isnan(last_alt):
+            embed.add_field(name="Last altitude", value=f"{int(last_alt):,} ft", inline=True)
+        if not math.isnan(last_speed):
+            embed.add_field(name="Last speed", value=f"{round(last_speed * 1.15078)} mph", inline=True)
+        if altitudes:
+            embed.add_field(name="Altitude range", value=f"{int(min(altitudes)):,} – {int(max(altitudes)):,} ft", inline=True)
+        embed.set_footer(text="Export with csv or geojson after the ICAO address")
+        view = discord.ui.View()
+        view.add_item(discord.ui.Button(label=f"Track {hex_id.upper()} live", url=f"https://globe.airplanes.live/?icao={hex_id.lower()}"))
+        await ctx.send(embed=embed, view=view)
+
     @commands.guild_only()
     @aircraft_group.command(name='export', help='Search aircraft by ICAO, callsign, squawk, or type and export the results.')
     async def export_aircraft(self, ctx, search_type: str, search_value: str, file_format: str):
@@ -595,114 +1498,82 @@ class Skysearch(commands.Cog):
         if search_type == "icao":
             search_type = "hex"
 
+        file_format = file_format.lower()
+        if file_format not in EXPORT_FORMATS and not (file_format.endswith(".gz") and file_format[:-3] in EXPORT_FORMATS and file_format != "pdf.gz"):
+            embed = discord.Embed(title="Error", description="Invalid file format specified. Use one of: csv, pdf, txt, html or ndjson. Add .gz to any format except pdf to compress it.", color=0xfa4545)
+            await ctx.send(embed=embed)
+            return
+
         url = f"{self.api_url}/{search_type}/{search_value}"
-        response = await self._make_request(url)
+        response = await self._make_request(url, RequestScheduler.BULK, ctx.guild.id)
         if response:
-            if file_format not in ["csv", "pdf", "txt", "html"]:
-                embed = discord.Embed(title="Error", description="Invalid file format specified. Use one of: csv, pdf, txt, or html.", color=0xfa4545)
-                await ctx.send(embed=embed)
-                return
-
             if not response['ac']:
                 embed = discord.Embed(title="Error", description="No aircraft data found.", color=0xfa4545)
                 await ctx.send(embed=embed)
                 return
 
-            file_name = f"{search_type}_{search_value}.{file_format.lower()}"
-            file_path = os.path.join(tempfile.gettempdir(), file_name)
-
+            # The file only ever lives in memory (or an anonymous spool file), so concurrent exports cannot collide
+            safe_value = re.sub(r'[^A-Za-z0-9_-]', '_', search_value)[:32]
+            file_name = f"{search_type}_{safe_value}_{ctx.message.id}.{file_format}"
+            async with ctx.typing():
+                try:
+                    fp = await self._render_export(file_format, f"{search_type.capitalize()} {search_value}", response['ac'])
+                except Exception as e:
+                    embed = discord.Embed(title="Error", description=f"Error building export: {e}", color=0xff4545)
+                    await ctx.send(embed=embed)
+                    return
             try:
-                if file_format.lower() == "csv":
-                    with open(file_path, "w", newline='', encoding='utf-8') as file:
-                        writer = csv.writer(file)
-                        aircraft_keys = list(response['ac'][0].keys())
-                        writer.writerow([key.upper() for key in aircraft_keys])
-                        for aircraft in response['ac']:
-                            aircraft_values = list(map(str, aircraft.values()))
-                            writer.writerow(aircraft_values)
-                elif file_format.lower() == "pdf":
-                    doc = SimpleDocTemplate(file_path, pagesize=landscape(A4)) 
-                    styles = getSampleStyleSheet()
-                    styles.add(ParagraphStyle(name='Normal-Bold', fontName='Helvetica-Bold', fontSize=14, leading=16, alignment=1)) 
-                    flowables = []
-
-                    flowables.append(Paragraph(f"<u>{search_type.capitalize()} {search_value}</u>", styles['Normal-Bold'])) 
-                    flowables.append(Spacer(1, 24)) 
-
-                    aircraft_keys = list(response['ac'][0].keys())
-                    data = [Paragraph(f"<b>{key}</b>", styles['Normal-Bold']) for key in aircraft_keys]
-                    flowables.extend(data)
-
-                    for aircraft in response['ac']:
-                        aircraft_values = list(map(str, aircraft.values()))
-                        data = [Paragraph(value, styles['Normal']) for value in aircraft_values]
-                        flowables.extend(data)
-                        flowables.append(PageBreak())
-
-                    doc.build(flowables)
-                elif file_format.lower() in ["txt"]:
-                    with open(file_path, "w", newline='', encoding='utf-8') as file:
-                        aircraft_keys = list(response['ac'][0].keys())
-                        file.write(' '.join([key.upper() for key in aircraft_keys]) + '\n')
-                        for aircraft in response['ac']:
-                            aircraft_values = list(map(str, aircraft.values()))
-                            file.write(' '.join(aircraft_values) + '\n')
-                elif file_format.lower() == "html":
-                    with open(file_path, "w", newline='', encoding='utf-8') as file:
-                        aircraft_keys = list(response['ac'][0].keys())
-                        file.write('<table>\n')
-                        file.write('<tr>\n')
-                        for key in aircraft_keys:
-                            file.write(f'<th>{key.upper()}</th>\n')
-                        file.write('</tr>\n')
-                        for aircraft in response['ac']:
-                            aircraft_values = list(map(str, aircraft.values()))
-                            file.write('<tr>\n')
-                            for value in aircraft_values:
-                                file.write(f'<td>{value}</td>\n')
-                            file.write('</tr>\n')
-                        file.write('</table>\n')
-            except PermissionError as e:
-                embed = discord.Embed(title="Error", description="I do not have permission to write to the file system.", color=0xff4545)
-                await ctx.send(embed=embed)
-                if os.path.exists(file_path):
-                    os.remove(file_path)
-
-            with open(file_path, 'rb') as fp:
-                await ctx.send(file=discord.File(fp, filename=os.path.basename(file_path)))
+                await ctx.send(file=discord.File(fp, filename=file_name))
+            finally:
+                fp.close()
         else:
             embed = discord.Embed(title="Error", description="Error retrieving aircraft information.", color=0xff4545)
             await ctx.send(embed=embed)
 
+    async def _render_export(self, file_format, title, aircraft_list):
+        """Build an export off the event loop and return a spooled file positioned at the start."""
+        loop = asyncio.get_running_loop()
+        columns = export_columns(aircraft_list)
+        fp = tempfile.SpooledTemporaryFile(max_size=EXPORT_SPOOL_SIZE)
+        try:
+            if file_format == "pdf":
+                rows = [[str(value) for value in row] for row in export_rows(aircraft_list, columns)]
+                try:
+                    if self._export_pool is None:
+                        self._export_pool = ProcessPoolExecutor(max_workers=1)
+                    data = await loop.run_in_executor(self._export_pool, render_pdf_export, title, columns, rows)
+                except (BrokenProcessPool, OSError, RuntimeError, ImportError, AttributeError, pickle.PicklingError) as e:
+                    # A worker process may be unavailable on some hosts; render in a thread instead
+                    print(f"Export worker unavailable, rendering PDF in a thread: {e}")
+                    self._export_pool = None
+                    data = await loop.run_in_executor(None, render_pdf_export, title, columns, rows)
+                fp.write(data)
+            else:
+                await loop.run_in_executor(None, write_export, fp, file_format, columns, aircraft_list)
+            fp.seek(0)
+        except BaseException:
+            fp.close()
+            raise
+        return fp
 
     @commands.guild_only()
     @aircraft_group.command(name='scroll', help='Scroll through available planes.')
     async def scroll_planes(self, ctx):
         url = f"{self.api_url}/mil"
         try:
-            response = await self._make_request(url)
-            if response and 'ac' in response:
-                for index, aircraft_info in enumerate(response['ac']):
-                    await self._send_aircraft_info(ctx, {'ac': [aircraft_info]})
-                    embed = discord.Embed(description=f"Plane {index + 1}/{len(response['ac'])}. React with ➡️ to view the next plane or ⏹️ to stop.")
-                    message = await ctx.send(embed=embed)
-                    await message.add_reaction("➡️")
-                    await message.add_reaction("⏹️") 
-
-                    def check(reaction, user):
-                        return user == ctx.author and str(reaction.emoji) == '➡️' or str(reaction.emoji) == '⏹️'
-
-                    try:
-                        reaction, user = await self.bot.wait_for('reaction_add', timeout=60.0, check=check)
-                        await message.remove_reaction(reaction.emoji, ctx.author)
-                        if str(reaction.emoji) == '⏹️':
-                            embed = discord.Embed(description="Stopping.")
-                            await ctx.send(embed=embed)
-                            break
-                    except asyncio.TimeoutError:
-                        embed = discord.Embed(description="No reaction received. Stopping.")
-                        await ctx.send(embed=embed)
-                        break
+            response = await self._make_request(url, RequestScheduler.BULK, ctx.guild.id)
+            if response and response.get('ac'):
+                aircraft_list = response['ac']
+                tag_masks = self.icao_tags.tag_batch([aircraft.get('hex', '') for aircraft in aircraft_list])
+
+                async def create_page(page_index):
+                    embed, view = await self._build_aircraft_embed(aircraft_list[page_index], tag_masks[page_index])
+                    return embed, list(view.children)
+
+                await LazyPaginator(ctx.author.id, len(aircraft_list), create_page).start(ctx)
+            else:
+                embed = discord.Embed(title="Error", description="Error retrieving aircraft information.", color=0xff4545)
+                await ctx.send(embed=embed)
         except Exception as e:
             embed = discord.Embed(description=f"An error occurred during scrolling: {e}.")
             await ctx.send(embed=embed)
@@ -742,6 +1613,7 @@ class Skysearch(commands.Cog):
                     embed.add_field(name="Last Emergency Squawk", value=f"Time: {last_emergency_squawk_time_formatted}", inline=False)
                 else:
                     embed.add_field(name="Last Emergency Squawk", value="No emergency squawks yet.", inline=False)
+                embed.add_field(name="Active emergencies", value=f"**{len(self.active_emergencies)}** aircraft being tracked", inline=False)
             else:
                 embed.add_field(name="Status", value="No alert channel set.", inline=False)
         else:
@@ -755,6 +1627,7 @@ class Skysearch(commands.Cog):
         if channel:
             try:
                 await self.config.guild(ctx.guild).alert_channel.set(channel.id)
+                self._invalidate_alert_targets()
                 embed = discord.Embed(description=f"Alert channel set to {channel.mention}", color=0xfffffe)
                 await ctx.send(embed=embed)
             except Exception as e:
@@ -763,6 +1636,7 @@ class Skysearch(commands.Cog):
         else:
             try:
                 await self.config.guild(ctx.guild).alert_channel.clear()
+                self._invalidate_alert_targets()
                 embed = discord.Embed(description="Alert channel cleared. No more alerts will be sent.", color=0xfffffe)
                 await ctx.send(embed=embed)
             except Exception as e:
@@ -776,6 +1650,7 @@ class Skysearch(commands.Cog):
         if role:
             try:
                 await self.config.guild(ctx.guild).alert_role.set(role.id)
+                self._invalidate_alert_targets()
                 embed = discord.Embed(description=f"Alert role set to {role.mention}", color=0xfffffe)
                 await ctx.send(embed=embed)
             except Exception as e:
@@ -784,6 +1659,7 @@ class Skysearch(commands.Cog):
         else:
             try:
                 await self.config.guild(ctx.guild).alert_role.clear()
+                self._invalidate_alert_targets()
                 embed = discord.Embed(description="Alert role cleared. No more role mentions will be made.", color=0xfffffe)
                 await ctx.send(embed=embed)
             except Exception as e:
@@ -818,6 +1694,94 @@ class Skysearch(commands.Cog):
     async def airport_group(self, ctx):
          """Command center for airport related commands"""
 
+    async def _airport_db_call(self, method, *args):
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(None, method, *args)
+        except sqlite3.Error as e:
+            print(f"Error reading airport database: {e}")
+            return None
+
+    async def _lookup_airport(self, code):
+        """Airport info from the local database, falling back to airport-data.com."""
+        airport = await self._airport_db_call(self.airport_db.find_by_code, code)
+        if airport is not None:
+            return self.airport_db.as_airport_info(airport)
+        code_type = 'iata' if len(code) == 3 else 'icao'
+        return await self._make_request(f"https://airport-data.com/api/ap_info.json?{code_type}={code}") or {}
+
+    async def _lookup_airportdb(self, code):
+        """Runways and navaids from the local database, falling back to airportdb.io when a token is set."""
+        record = await self._airport_db_call(self.airport_db.airportdb_record, code)
+        if record is not None:
+            return record
+        api_token = await self.bot.get_shared_api_tokens("airportdbio")
+        if not api_token or 'api_token' not in api_token:
+            return None
+        if not hasattr(self, '_http_client'):
+            self._http_client = aiohttp.ClientSession()
+        async with self._http_client.get(f"https://airportdb.io/api/v1/airport/{code}?apiToken={api_token['api_token']}") as response:
+            return await response.json()
+
+    @commands.is_owner()
+    @airport_group.command(name='importdb', hidden=True)
+    async def import_airport_db(self, ctx, source_url: str = None):
+        """Download the OurAirports airports, runways and navaids CSVs into the local airport database."""
+        source_url = (source_url or AirportDatabase.SOURCE_URL).rstrip('/') + '/'
+        if not hasattr(self, '_http_client'):
+            self._http_client = aiohttp.ClientSession()
+        async with ctx.typing():
+            try:
+                texts = []
+                for file_name in AirportDatabase.SOURCE_FILES:
+                    async with self._http_client.get(source_url + file_name) as response:
+                        response.raise_for_status()
+                        texts.append(await response.text(encoding='utf-8'))
+                loop = asyncio.get_running_loop()
+                airports, runways, navaids = await loop.run_in_executor(None, self.airport_db.import_csv, *texts)
+            except (aiohttp.ClientError, asyncio.TimeoutError, OSError, sqlite3.Error, csv.Error) as e:
+                embed = discord.Embed(title="Error", description=f"Error importing airport database: {e}", color=0xff4545)
+                await ctx.send(embed=embed)
+                return
+        embed = discord.Embed(title="Airport database updated", description=f"Imported **{airports:,}** airports, **{runways:,}** runways and **{navaids:,}** navaids.", color=0xfffffe)
+        await ctx.send(embed=embed)
+
+    @commands.guild_only()
+    @airport_group.command(name='search')
+    async def airport_search(self, ctx, *, name: str):
+        """Find airports whose name starts with the given text."""
+        airports = await self._airport_db_call(self.airport_db.search_name, name)
+        if not airports:
+            description = "No airports found." if self.airport_db.is_loaded() else "The local airport database has not been imported yet."
+            await ctx.send(embed=discord.Embed(title="Error", description=description, color=0xff4545))
+            return
+        embed = discord.Embed(title=f"Airports matching {name}", color=0xfffffe)
+        for airport in airports:
+            info = self.airport_db.as_airport_info(airport)
+            codes = ' / '.join(code for code in (info.get('icao'), info.get('iata')) if code)
+            place = ', '.join(part for part in (info.get('location'), info.get('country_code')) if part)
+            embed.add_field(name=airport['name'], value=f"**`{codes}`** {place}", inline=False)
+        await ctx.send(embed=embed)
+
+    @commands.guild_only()
+    @airport_group.command(name='nearest')
+    async def airport_nearest(self, ctx, lat: float, lon: float):
+        """Show the airports closest to a latitude and longitude."""
+        if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+            await ctx.send(embed=discord.Embed(title="Error", description="Latitude must be between -90 and 90 and longitude between -180 and 180.", color=0xff4545))
+            return
+        airports = await self._airport_db_call(self.airport_db.nearest, lat, lon)
+        if not airports:
+            description = "No airports found." if self.airport_db.is_loaded() else "The local airport database has not been imported yet."
+            await ctx.send(embed=discord.Embed(title="Error", description=description, color=0xff4545))
+            return
+        embed = discord.Embed(title=f"Airports nearest {lat:.4f}, {lon:.4f}", color=0xfffffe)
+        for distance, airport in airports:
+            info = self.airport_db.as_airport_info(airport)
+            codes = ' / '.join(code for code in (info.get('icao'), info.get('iata')) if code)
+            embed.add_field(name=airport['name'], value=f"**`{codes}`** {distance:,.1f} nm away", inline=False)
+        await ctx.send(embed=embed)
+
     @commands.guild_only()
     @airport_group.command(name='info')
     async def airportinfo(self, ctx, code: str = None):
@@ -827,23 +1791,16 @@ class Skysearch(commands.Cog):
             await ctx.send(embed=embed)
             return
 
-        # Determine if the code is ICAO or IATA based on length
-        if len(code) == 4:
-            code_type = 'icao'
-        elif len(code) == 3:
-            code_type = 'iata'
-        else:
+        # ICAO codes are 4 characters and IATA codes 3; _lookup_airport works out which from the length
+        if len(code) not in (3, 4):
             embed = discord.Embed(title="Error", description="Invalid ICAO or IATA code. ICAO codes are 4 characters long and IATA codes are 3 characters long.", color=0xff4545)
             await ctx.send(embed=embed)
             return
 
         try:
             async with ctx.typing():
-                url1 = f"https://airport-data.com/api/ap_info.json?{code_type}={code}"
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(url1) as response1:
-                        data1 = await response1.json()
-                
+                data1 = await self._lookup_airport(code)
+
                 if 'error' in data1 or not data1 or 'name' not in data1:
                     embed = discord.Embed(title="Error", description="No airport found with the provided code.", color=0xff4545)
                     await ctx.send(embed=embed)
@@ -954,24 +1911,16 @@ class Skysearch(commands.Cog):
 
         try:
             if code_type == 'iata':
-                url1 = f"https://airport-data.com/api/ap_info.json?iata={code}"
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(url1) as response1:
-                        data1 = await response1.json()
-                        if 'icao' in data1:
-                            code = data1['icao']
-                        else:
-                            embed = discord.Embed(title="Error", description="No ICAO code found for the provided IATA code.", color=0xff4545)
-                            await ctx.send(embed=embed)
-                            return
-
-            api_token = await self.bot.get_shared_api_tokens("airportdbio")
-            if api_token and 'api_token' in api_token:
-                url2 = f"https://airportdb.io/api/v1/airport/{code}?apiToken={api_token['api_token']}"
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(url2) as response2:
-                        data2 = await response2.json()
+                data1 = await self._lookup_airport(code)
+                if 'icao' in data1:
+                    code = data1['icao']
+                else:
+                    embed = discord.Embed(title="Error", description="No ICAO code found for the provided IATA code.", color=0xff4545)
+                    await ctx.send(embed=embed)
+                    return
 
+            data2 = await self._lookup_airportdb(code)
+            if data2 is not None:
                 if 'error' in data2:
                     error_message = data2['error']
                     if len(error_message) > 1024:
@@ -1023,7 +1972,7 @@ class Skysearch(commands.Cog):
 
                     await self.paginate_embed(ctx, combined_pages)
             else:
-                embed = discord.Embed(title="Error", description="API token for airportdb.io not configured.", color=0xff4545)
+                embed = discord.Embed(title="Error", description="Airport not in the local airport database, and the airportdb.io API token is not configured.", color=0xff4545)
                 await ctx.send(embed=embed)
         except Exception as e:
             embed = discord.Embed(title="Error", description=str(e), color=0xff4545)
@@ -1076,24 +2025,16 @@ class Skysearch(commands.Cog):
 
         try:
             if code_type == 'iata':
-                url1 = f"https://airport-data.com/api/ap_info.json?iata={code}"
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(url1) as response1:
-                        data1 = await response1.json()
-                        if 'icao' in data1:
-                            code = data1['icao']
-                        else:
-                            embed = discord.Embed(title="Error", description="No ICAO code found for the provided IATA code.", color=0xff4545)
-                            await ctx.send(embed=embed)
-                            return
-
-            api_token = await self.bot.get_shared_api_tokens("airportdbio")
-            if api_token and 'api_token' in api_token:
-                url = f"https://airportdb.io/api/v1/airport/{code}?apiToken={api_token['api_token']}"
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(url) as response:
-                        data = await response.json()
+                data1 = await self._lookup_airport(code)
+                if 'icao' in data1:
+                    code = data1['icao']
+                else:
+                    embed = discord.Embed(title="Error", description="No ICAO code found for the provided IATA code.", color=0xff4545)
+                    await ctx.send(embed=embed)
+                    return
 
+            data = await self._lookup_airportdb(code)
+            if data is not None:
                 if 'error' in data:
                     error_message = data['error']
                     if len(error_message) > 1024:
@@ -1145,7 +2086,7 @@ class Skysearch(commands.Cog):
 
                     await self.paginate_embed(ctx, combined_pages)
             else:
-                embed = discord.Embed(title="Error", description="API token for airportdb.io not configured.", color=0xff4545)
+                embed = discord.Embed(title="Error", description="Airport not in the local airport database, and the airportdb.io API token is not configured.", color=0xff4545)
                 await ctx.send(embed=embed)
         except Exception as e:
             embed = discord.Embed(title="Error", description=str(e), color=0xff4545)
@@ -1161,17 +2102,16 @@ class Skysearch(commands.Cog):
             return
 
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(f"https://airport-data.com/api/ap_info.json?{code_type}={code}") as response1:
-                    data1 = await response1.json()
-                    latitude, longitude = data1.get('latitude'), data1.get('longitude')
-                    if not latitude or not longitude:
-                        await ctx.send(embed=discord.Embed(title="Error", description="Could not fetch latitude and longitude for the provided code.", color=0xff4545))
-                        return
-                    if data1.get('country_code') != 'US':
-                        await ctx.send(embed=discord.Embed(title="Error", description="Weather forecasts are currently only available for airports in the United States.", color=0xff4545))
-                        return
+            data1 = await self._lookup_airport(code)
+            latitude, longitude = data1.get('latitude'), data1.get('longitude')
+            if not latitude or not longitude:
+                await ctx.send(embed=discord.Embed(title="Error", description="Could not fetch latitude and longitude for the provided code.", color=0xff4545))
+                return
+            if data1.get('country_code') != 'US':
+                await ctx.send(embed=discord.Embed(title="Error", description="Weather forecasts are currently only available for airports in the United States.", color=0xff4545))
+                return
 
+            async with aiohttp.ClientSession() as session:
                 async with session.get(f"https://api.weather.gov/points/{latitude},{longitude}") as response2:
                     data2 = await response2.json()
                     forecast_url = data2.get('properties', {}).get('forecast')
@@ -1272,42 +2212,126 @@ class Skysearch(commands.Cog):
 
 
 
+    def _query_snapshot_radius(self, lat, lon, radius):
+        """Answer a radius query from the local snapshot, or None to fall back to the API."""
+        snapshot = self.snapshot
+        if snapshot is None or time.time() - snapshot.fetched_at > self.refresh_snapshot.seconds * 3:
+            return None
+        try:
+            lat, lon, radius = float(lat), float(lon), float(radius)
+        except ValueError:
+            return None
+        if not (-90 <= lat <= 90 and -180 <= lon <= 180 and 0 < radius <= 250):
+            return None
+        return {'ac': [aircraft for _, aircraft in snapshot.query_radius(lat, lon, radius)]}
+
+    @tasks.loop(seconds=60)
+    async def refresh_snapshot(self):
+        if not self.snapshot_url:
+            return
+        data = await self._fetch_json(self.snapshot_url)
+        if not data:
+            return
+        aircraft = data.get('ac') or data.get('aircraft') or []
+        loop = asyncio.get_running_loop()
+        self.snapshot = await loop.run_in_executor(None, AircraftSnapshot, aircraft, time.time())
+
+    @refresh_snapshot.before_loop
+    async def before_refresh_snapshot(self):
+        await self.bot.wait_until_ready()
+        self.snapshot_url = await self.config.snapshot_url()
+        self.refresh_snapshot.change_interval(seconds=await self.config.snapshot_interval())
+
+    async def _get_alert_targets(self):
+        """Return the cached (guild_id, channel_id, role_id) list of guilds subscribed to squawk alerts."""
+        if self._alert_targets is None:
+            targets = []
+            all_guilds = await self.config.all_guilds()
+            for guild_id, data in all_guilds.items():
+                if data.get('alert_channel'):
+                    targets.append((guild_id, data['alert_channel'], data.get('alert_role')))
+            self._alert_targets = targets
+        return self._alert_targets
+
+    def _invalidate_alert_targets(self):
+        self._alert_targets = None
+
+    @staticmethod
+    def _has_landed(aircraft_info):
+        altitude = aircraft_info.get('alt_baro')
+        if altitude == 'ground':
+            return True
+        return isinstance(altitude, (int, float)) and altitude < 25
+
+    async def _send_emergency_alert(self, target, embed, view, landed_embed, mention_role):
+        guild_id, channel_id, role_id = target
+        alert_channel = self.bot.get_channel(channel_id)
+        if alert_channel is None:
+            print(f"Error: Alert channel not found for guild {guild_id}")
+            return
+        try:
+            if mention_role and role_id:
+                await alert_channel.send(f"<@&{role_id}>", allowed_mentions=discord.AllowedMentions(roles=True))
+            if embed is not None:
+                await alert_channel.send(embed=embed, view=view)
+                await self.config.guild_from_id(guild_id).last_emergency_squawk_time.set(datetime.datetime.now(datetime.timezone.utc).timestamp())
+            if landed_embed is not None:
+                await alert_channel.send(embed=landed_embed)
+        except discord.HTTPException as e:
+            print(f"Error sending emergency alert to guild {guild_id}: {e}")
+
+    async def _dispatch_emergency(self, aircraft_info, squawk_code, transition):
+        """Build the alert once and fan it out to every subscribed guild concurrently."""
+        targets = await self._get_alert_targets()
+        if not targets:
+            return
+        embed = view = landed_embed = None
+        if transition in ("new", "squawk"):
+            embed, view = await self._build_aircraft_embed(aircraft_info)
+        if transition == "landed" or (transition == "new" and self._has_landed(aircraft_info)):
+            landed_embed = discord.Embed(title="Aircraft landed", description=f"Aircraft {aircraft_info.get('hex', '').upper()} has landed while squawking {squawk_code}.", color=0x00ff00)
+        await asyncio.gather(
+            *(self._send_emergency_alert(target, embed, view, landed_embed, transition != "landed") for target in targets),
+            return_exceptions=True
+        )
+
     @tasks.loop(minutes=2)
     async def check_emergency_squawks(self):
         try:
             emergency_squawk_codes = ['7500', '7600', '7700']
+            now = datetime.datetime.now(datetime.timezone.utc).timestamp()
+            transitions = []
             for squawk_code in emergency_squawk_codes:
                 url = f"{self.api_url}/squawk/{squawk_code}"
-                response = await self._make_request(url)
+                response = await self._make_request(url, RequestScheduler.ALERT)
                 if response and 'ac' in response:
                     for aircraft_info in response['ac']:
-                        # Ignore aircraft with the callsign 00000000
-                        if aircraft_info.get('icao') == '00000000':
+                        hex_id = aircraft_info.get('hex', '').lower()
+                        # Ignore aircraft without a usable address
+                        if not hex_id or hex_id == '00000000':
                             continue
-                        guilds = self.bot.guilds
-                        for guild in guilds:
-                            alert_channel_id = await self.config.guild(guild).alert_channel()
-                            if alert_channel_id:
-                                alert_channel = self.bot.get_channel(alert_channel_id)
-                                if alert_channel:
-                                    # Get the alert role
-                                    alert_role_id = await self.config.guild(guild).alert_role()
-                                    alert_role_mention = f"<@&{alert_role_id}>" if alert_role_id else ""
-                                    
-                                    # Send the new alert with role mention if available
-                                    if alert_role_mention:
-                                        await alert_channel.send(alert_role_mention, allowed_mentions=discord.AllowedMentions(roles=True))
-                                    await self._send_aircraft_info(alert_channel, {'ac': [aircraft_info]})
-                                    
-                                    # Check if aircraft has landed
-                                    if aircraft_info.get('altitude') is not None and aircraft_info.get('altitude') < 25:
-                                        embed = discord.Embed(title="Aircraft landed", description=f"Aircraft {aircraft_info.get('icao')} has landed while squawking {squawk_code}.", color=0x00ff00)
-                                        await alert_channel.send(embed=embed)
-                                else:
-                                    print(f"Error: Alert channel not found for guild {guild.name}")
-                            else:
-                                print(f"Error: No alert channel set for guild {guild.name}")
-                await asyncio.sleep(2)  # Add a delay to respect API rate limit
+                        landed = self._has_landed(aircraft_info)
+                        state = self.active_emergencies.get(hex_id)
+                        if state is None:
+                            self.active_emergencies[hex_id] = {'squawk': squawk_code, 'first_seen': now, 'last_seen': now, 'landed': landed}
+                            transitions.append((aircraft_info, squawk_code, "new"))
+                            continue
+                        state['last_seen'] = now
+                        if state['squawk'] != squawk_code:
+                            state['squawk'] = squawk_code
+                            state['landed'] = landed
+                            transitions.append((aircraft_info, squawk_code, "squawk"))
+                        elif landed and not state['landed']:
+                            state['landed'] = True
+                            transitions.append((aircraft_info, squawk_code, "landed"))
+
+            # Forget emergencies that have not been reported for a while so a later squawk alerts again
+            expired = [hex_id for hex_id, state in self.active_emergencies.items() if now - state['last_seen'] > self.emergency_expiry]
+            for hex_id in expired:
+                del self.active_emergencies[hex_id]
+
+            for aircraft_info, squawk_code, transition in transitions:
+                await self._dispatch_emergency(aircraft_info, squawk_code, transition)
         except Exception as e:
             print(f"Error checking emergency squawks: {e}")
 
@@ -1333,9 +2357,3 @@ class Skysearch(commands.Cog):
         if icao_pattern.match(content):
             ctx = await self.bot.get_context(message)
             await self.aircraft_by_icao(ctx, content)
-
-    def cog_unload(self):
-        try:
-            self.check_emergency_squawks.cancel()
-        except Exception as e:
-            print(f"Error unloading cog: {e}")
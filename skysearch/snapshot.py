@@ -0,0 +1,115 @@
+"""Gridded aircraft snapshot used by Skysearch for radius and bounding-box queries.
+
+Kept free of discord/redbot imports so benchmark.py can load it on its own.
+"""
+import math
+from array import array
+
+try:
+    import numpy as np #type: ignore
+except ImportError:
+    np = None
+
+
+class AircraftSnapshot:
+    """Columnar copy of a global aircraft feed with a one-degree grid index.
+
+    Positions live in parallel array('d') columns; each grid cell holds the row
+    numbers of the aircraft inside it, so radius and bounding-box queries only
+    look at the handful of cells they overlap.
+    """
+
+    EARTH_RADIUS_NM = 3440.065
+
+    def __init__(self, aircraft, fetched_at):
+        self.fetched_at = fetched_at
+        self.aircraft = []
+        self.lat = array('d')
+        self.lon = array('d')
+        self.cells = {}
+        for aircraft_info in aircraft:
+            lat, lon = aircraft_info.get('lat'), aircraft_info.get('lon')
+            if not isinstance(lat, (int, float)) or not isinstance(lon, (int, float)):
+                continue
+            row = len(self.aircraft)
+            self.aircraft.append(aircraft_info)
+            self.lat.append(lat)
+            self.lon.append(lon)
+            self.cells.setdefault(self._cell(lat, lon), array('I')).append(row)
+        self._np_lat = self._np_lon = None
+        if np is not None and self.aircraft:
+            self._np_lat = np.radians(np.frombuffer(self.lat, dtype=np.float64))
+            self._np_lon = np.radians(np.frombuffer(self.lon, dtype=np.float64))
+
+    @staticmethod
+    def _wrap_lon(lon):
+        return ((lon + 180) % 360) - 180
+
+    @classmethod
+    def _cell(cls, lat, lon):
+        return min(math.floor(lat), 89), cls._wrap_lon(math.floor(lon))
+
+    def __len__(self):
+        return len(self.aircraft)
+
+    def _candidate_rows(self, south, west, north, east):
+        if west <= east:
+            lon_ranges = [range(math.floor(west), math.floor(east) + 1)]
+        else:  # Box crosses the antimeridian
+            lon_ranges = [range(math.floor(west), 180), range(-180, math.floor(east) + 1)]
+        rows = []
+        for cell_lat in range(max(math.floor(south), -90), min(math.floor(north), 89) + 1):
+            for lon_range in lon_ranges:
+                for cell_lon in lon_range:
+                    cell = self.cells.get((cell_lat, self._wrap_lon(cell_lon)))
+                    if cell:
+                        rows.extend(cell)
+        return rows
+
+    def query_bbox(self, south, west, north, east):
+        """Aircraft inside a box; west > east means the box wraps the antimeridian."""
+        west, east = self._wrap_lon(west), self._wrap_lon(east)
+        results = []
+        for row in self._candidate_rows(south, west, north, east):
+            lat, lon = self.lat[row], self.lon[row]
+            in_lon = west <= lon <= east if west <= east else (lon >= west or lon <= east)
+            if south <= lat <= north and in_lon:
+                results.append(self.aircraft[row])
+        return results
+
+    def query_radius(self, lat, lon, radius_nm):
+        """Aircraft within radius_nm of a point as (distance_nm, aircraft) pairs, nearest first."""
+        dlat = radius_nm / 60.0
+        south, north = lat - dlat, lat + dlat
+        cos_lat = math.cos(math.radians(lat))
+        # The circle's widest east-west extent is asin(sin(d) / cos(lat)), wider than d / cos(lat)
+        ratio = math.sin(math.radians(dlat)) / cos_lat if cos_lat > 1e-6 else 1.0
+        if south <= -90 or north >= 90 or ratio >= 1.0:
+            west, east = -180.0, 179.999999
+        else:
+            dlon = math.degrees(math.asin(ratio))
+            west, east = self._wrap_lon(lon - dlon), self._wrap_lon(lon + dlon)
+        rows = self._candidate_rows(south, west, north, east)
+        if not rows:
+            return []
+
+        lat1, lon1 = math.radians(lat), math.radians(lon)
+        if self._np_lat is not None:
+            index = np.fromiter(rows, dtype=np.int64, count=len(rows))
+            lat2, lon2 = self._np_lat[index], self._np_lon[index]
+            a = np.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+            distances = 2 * self.EARTH_RADIUS_NM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+            inside = np.nonzero(distances <= radius_nm)[0]
+            inside = inside[np.argsort(distances[inside], kind='stable')]
+            return [(float(distances[i]), self.aircraft[rows[i]]) for i in inside]
+
+        results = []
+        cos_lat1 = math.cos(lat1)
+        for row in rows:
+            lat2, lon2 = math.radians(self.lat[row]), math.radians(self.lon[row])
+            a = math.sin((lat2 - lat1) / 2) ** 2 + cos_lat1 * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+            distance = 2 * self.EARTH_RADIUS_NM * math.asin(math.sqrt(min(a, 1.0)))
+            if distance <= radius_nm:
+                results.append((distance, self.aircraft[row]))
+        results.sort(key=lambda item: item[0])
+        return results
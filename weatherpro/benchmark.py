@@ -0,0 +1,114 @@
+"""Load-time benchmark for weatherpro's ZIP centroid index.
+
+Loads the bundled ZIP data in a fresh interpreter per run, once the way the cog used
+to (zipcodes.csv parsed into a dict) and once through ZipIndex over zipcodes.bin,
+and reports time to the first lookup, resident memory added and lookup cost. It also
+checks that every 5 digit ZIP in the CSV resolves to the same coordinates through the
+index. RSS is read from /proc, so it is only reported on Linux. Needs no Discord or
+Red install:
+
+    python weatherpro/benchmark.py [--runs 5] [--lookups 100000] [--seed 1]
+"""
+import argparse
+import csv
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+CSV_PATH = os.path.join(DATA_DIR, "zipcodes.csv")
+BIN_PATH = os.path.join(DATA_DIR, "zipcodes.bin")
+
+
+def rss_kb():
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def child(loader, lookups, seed):
+    """Runs in a fresh interpreter: load one way, then time lookups. Prints a JSON result."""
+    rss_before = rss_kb()
+    start = time.perf_counter()
+    if loader == "csv":
+        with open(CSV_PATH, mode="r") as zip_code_file:
+            csv_reader = csv.reader(zip_code_file)
+            zip_codes = {row[0]: (row[1], row[2]) for i, row in enumerate(csv_reader) if i != 0}
+    else:
+        from zipindex import ZipIndex
+        zip_codes = ZipIndex(BIN_PATH)
+    zip_codes.get("10001")
+    load_time = time.perf_counter() - start
+    rss_after = rss_kb()
+
+    r = random.Random(seed)
+    keys = [f"{r.randint(0, 99999):05d}" for _ in range(lookups)]
+    start = time.perf_counter()
+    for key in keys:
+        zip_codes.get(key)
+    lookup_time = time.perf_counter() - start
+    print(json.dumps({
+        "load_ms": load_time * 1000,
+        "rss_kb": None if rss_before is None else rss_after - rss_before,
+        "lookup_us": lookup_time / lookups * 1e6,
+    }))
+
+
+def check_index():
+    """Every plain 5 digit ZIP in the CSV must come back from the index at float32 precision."""
+    from zipindex import ZipIndex
+    index = ZipIndex(BIN_PATH)
+    checked = mismatched = 0
+    with open(CSV_PATH, mode="r", newline="") as zip_code_file:
+        csv_reader = csv.reader(zip_code_file)
+        next(csv_reader, None)
+        for row in csv_reader:
+            zip_code = row[0].strip()
+            if len(zip_code) != 5 or not zip_code.isdigit():
+                continue
+            checked += 1
+            point = index.get(zip_code)
+            if point is None or abs(point[0] - float(row[1])) > 1e-4 or abs(point[1] - float(row[2])) > 1e-4:
+                mismatched += 1
+    return checked, mismatched
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--lookups", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--child", choices=("csv", "bin"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(args.child, args.lookups, args.seed)
+        return
+
+    checked, mismatched = check_index()
+    print(f"{checked} ZIP codes checked against zipcodes.bin, {mismatched} mismatches")
+    for loader, label in (("csv", "csv dict"), ("bin", "ZipIndex")):
+        results = []
+        for _ in range(args.runs):
+            output = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--child", loader,
+                 "--lookups", str(args.lookups), "--seed", str(args.seed)],
+                check=True, capture_output=True, text=True,
+            ).stdout
+            results.append(json.loads(output))
+        load_times = sorted(result["load_ms"] for result in results)
+        rss = [result["rss_kb"] for result in results if result["rss_kb"] is not None]
+        rss_text = f"+{sum(rss) / len(rss) / 1024:.1f} MB RSS" if rss else "RSS n/a"
+        lookup = min(result["lookup_us"] for result in results)
+        print(f"{label + ':':10}{load_times[0]:.1f}-{load_times[-1]:.1f} ms to first lookup, {rss_text}, {lookup:.2f} us per lookup")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,82 @@
 import discord #type: ignore
 import aiohttp #type: ignore
 import asyncio
-import csv
+import functools
+import time
+from collections import OrderedDict
 from datetime import datetime
 from redbot.core import commands, Config #type: ignore
 from redbot.core.data_manager import bundled_data_path #type: ignore
+from .zipindex import GeoGrid, ZipIndex
+
+
+class WeatherCache:
+    """Bounded TTL cache of upstream weather responses.
+
+    Keys are (endpoint, location...) tuples. Concurrent lookups for a key that is not
+    cached share a single upstream call, and the least recently used entries are
+    dropped once max_entries is reached.
+    """
+
+    def __init__(self, max_entries=512):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (expires_at, data)
+        self._inflight = {}  # key -> asyncio.Task
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    async def get(self, key, ttl, fetch):
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            del self._entries[key]
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+            return await asyncio.shield(task)
+
+        self.misses += 1
+        task = asyncio.ensure_future(fetch())
+        self._inflight[key] = task
+        try:
+            data = await asyncio.shield(task)
+        finally:
+            if self._inflight.get(key) is task:
+                del self._inflight[key]
+        if data is not None:
+            self._entries[key] = (time.monotonic() + ttl, data)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return data
+
+    def lookups(self):
+        return self.hits + self.coalesced + self.misses
+
+    def hit_rate(self):
+        total = self.lookups()
+        return (self.hits + self.coalesced) / total if total else 0.0
+
 
 class Weather(commands.Cog):
     """It's beautiful out there"""
+
+    STATION_SOURCES = {
+        "stations": "https://api.weather.gov/stations?limit=500",
+        "radars": "https://api.weather.gov/radar/stations",
+    }
+    STATION_TTL = 86400
+    # Stops a runaway pagination cursor; each stations page holds up to 500 entries
+    STATION_MAX_PAGES = 100
+    # Matched to how often upstream refreshes: open-meteo current conditions every 15 minutes,
+    # NWS gridpoint forecasts roughly hourly
+    CURRENT_TTL = 600
+    FORECAST_TTL = 3600
+    ALERTS_TTL = 120
     
     def __init__(self, bot):
         self.bot = bot
@@ -19,6 +88,7 @@ class Weather(commands.Cog):
             "freezealerts": False,
             "heatalerts": False,
             "sent_alerts": [],
+            "sent_forecast_alerts": [],
         }
         self.config.register_user(**default_user)
         default_global = {
@@ -42,25 +112,102 @@ class Weather(commands.Cog):
             "highest_snowfall_date": None,
             "highest_rainfall": None,
             "highest_rainfall_date": None,
+            "zip_points": {},
         }
         self.config.register_global(**default_global)
+        self.zip_points = None
+        self.zip_points_dirty = False
+        self.alert_semaphore = asyncio.Semaphore(8)
+        self.station_cache = {}
+        self.weather_cache = WeatherCache()
+        self.station_locks = {"stations": asyncio.Lock(), "radars": asyncio.Lock()}
         data_dir = bundled_data_path(self)
-        with (data_dir / "zipcodes.csv").open(mode="r") as zip_code_file:
-            csv_reader = csv.reader(zip_code_file)
-            self.zip_codes = {
-                row[0]: (row[1], row[2])
-                for i, row in enumerate(csv_reader)
-                if i != 0
-            }
+        self.zip_codes = ZipIndex(data_dir / "zipcodes.bin", data_dir / "zipcodes.csv")
         
     def cog_load(self):
         self.bot.loop.create_task(self.start_severe_alerts_task())
-        self.bot.loop.create_task(self.start_freeze_alerts_task())
-        self.bot.loop.create_task(self.start_heat_alerts_task())
+        self.bot.loop.create_task(self.start_forecast_alerts_task())
 
     def cog_unload(self):
         self.bot.loop.create_task(self.session.close())
 
+    async def _fetch_json(self, url):
+        try:
+            async with self.session.get(url) as response:
+                if response.status != 200:
+                    return None
+                return await response.json()
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            return None
+
+    async def _forecast_periods(self, point):
+        """Forecast periods for a resolved zip code, shared by the forecast command and the freeze/heat scan"""
+        grid_key = "/".join(str(part) for part in point["grid"])
+        return await self.weather_cache.get(
+            ("forecast", grid_key), self.FORECAST_TTL, functools.partial(self._fetch_forecast_periods, point["forecast"])
+        )
+
+    async def _fetch_station_features(self, kind):
+        """Download every observation station or radar, following pagination"""
+        url = self.STATION_SOURCES[kind]
+        headers = {"accept": "application/geo+json"}
+        features = []
+        for _ in range(self.STATION_MAX_PAGES):
+            try:
+                async with self.session.get(url, headers=headers) as response:
+                    if response.status != 200:
+                        return None
+                    data = await response.json()
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                return None
+            page = data.get("features", [])
+            if kind == "stations":
+                # Only keep what the stations listing and nearest lookups read, the full records add up
+                page = [
+                    {
+                        "properties": {
+                            key: station["properties"][key]
+                            for key in ("name", "stationIdentifier", "elevation", "timeZone")
+                            if key in station.get("properties", {})
+                        },
+                        "geometry": station.get("geometry"),
+                    }
+                    for station in page
+                ]
+            features.extend(page)
+            url = data.get("pagination", {}).get("next")
+            if kind == "radars" or not page or not url:
+                break
+        return features
+
+    async def _station_index(self, kind):
+        """Return (features, GeoGrid) for observation stations or radars.
+
+        The lists are downloaded on first use, cached for a day and shared between commands;
+        concurrent callers wait on the same download, and a failed refresh keeps serving the
+        previous copy.
+        """
+        cached = self.station_cache.get(kind)
+        if cached and time.monotonic() - cached[0] < self.STATION_TTL:
+            return cached[1], cached[2]
+        async with self.station_locks[kind]:
+            cached = self.station_cache.get(kind)
+            if cached and time.monotonic() - cached[0] < self.STATION_TTL:
+                return cached[1], cached[2]
+            features = await self._fetch_station_features(kind)
+            if not features:
+                return (cached[1], cached[2]) if cached else (None, None)
+            features = [
+                feature for feature in features
+                if len((feature.get("geometry") or {}).get("coordinates") or ()) >= 2
+            ]
+            grid = GeoGrid(
+                [feature["geometry"]["coordinates"][1] for feature in features],
+                [feature["geometry"]["coordinates"][0] for feature in features],
+            )
+            self.station_cache[kind] = (time.monotonic(), features, grid)
+            return features, grid
+
     def fahrenheit_to_celsius(self, f):
         result = round((f - 32) * 5.0 / 9.0, 1)
         return f"{result:.1f}"
@@ -77,60 +224,6 @@ class Weather(commands.Cog):
         millimeters = inches * 25.4
         return f"{millimeters:.1f}"
     
-    async def check_weather_alerts(self):
-        """Check for weather alerts and DM users if any severe or extreme warnings are issued"""
-        all_users = await self.config.all_users()
-        users_with_alerts = [user_id for user_id, data in all_users.items() if data.get("severealerts")]
-
-        for user_id in users_with_alerts:
-            user_data = await self.config.user_from_id(user_id).all()
-            zip_code = user_data.get("zip_code")
-            if not zip_code or zip_code not in self.zip_codes:
-                continue
-
-            latitude, longitude = self.zip_codes[zip_code]
-            alerts_url = f"https://api.weather.gov/alerts/active?point={latitude.strip()},{longitude.strip()}"
-
-            async with self.session.get(alerts_url) as response:
-                if response.status != 200:
-                    continue
-
-                data = await response.json()
-                alerts = data.get('features', [])
-                severe_alerts = [alert for alert in alerts if alert['properties']['severity'] in ['Severe', 'Extreme']]
-
-                if severe_alerts:
-                    user = self.bot.get_user(user_id)
-                    if user:
-                        sent_alerts = user_data.get("sent_alerts", [])
-                        new_alerts = [alert for alert in severe_alerts if alert['id'] not in sent_alerts]
-
-                        if new_alerts:
-                            for alert in new_alerts:
-                                embed = discord.Embed(
-                                    title=alert['properties']['event'],
-                                    description=f"{'An' if alert['properties']['event'][0].lower() in 'aeiou' else 'A'} **{alert['properties']['event']}** was issued at **<t:{int(datetime.fromisoformat(alert['properties']['sent']).timestamp())}:F>** for your location and is in effect until **<t:{int(datetime.fromisoformat(alert['properties']['expires']).timestamp())}:F>**.",
-                                    color=0xff4545
-                                )
-                                if 'instruction' in alert['properties']:
-                                    instruction = alert['properties']['instruction'].replace('\n', ' ').strip()
-                                    embed.add_field(name="Instruction", value=instruction, inline=False)
-                                if 'severity' in alert['properties']:
-                                    embed.add_field(name="Severity", value=alert['properties']['severity'], inline=True)
-                                if 'urgency' in alert['properties']:
-                                    embed.add_field(name="Urgency", value=alert['properties']['urgency'], inline=True)
-                                if 'certainty' in alert['properties']:
-                                    embed.add_field(name="Certainty", value=alert['properties']['certainty'], inline=True)
-                                if 'senderName' in alert['properties']:
-                                    embed.set_footer(text=f"Issued by {alert['properties']['senderName']}")
-
-                                await user.send(embed=embed)
-                                sent_alerts.append(alert['id'])
-
-                            await self.config.user_from_id(user_id).sent_alerts.set(sent_alerts)
-                            total_alerts_sent = await self.config.total_alerts_sent()
-                            await self.config.total_alerts_sent.set(total_alerts_sent + len(new_alerts))
-
     @commands.group()
     async def weather(self, ctx):
         """Fetch current and upcoming conditions, search and explore hundreds of weather-focused words, check alert statistics across the country, and fetch information on observation stations and radar installations"""
@@ -150,80 +243,68 @@ class Weather(commands.Cog):
             await ctx.send("Invalid zip code. Please set a valid zip code.")
             return
         
-        latitude, longitude = self.zip_codes[zip_code]
-        points_url = f"https://api.weather.gov/points/{latitude.strip()},{longitude.strip()}"
-        
-        # Fetch weather data using the latitude and longitude
-        async with self.session.get(points_url) as response:
-            if response.status != 200:
-                await ctx.send(f"Failed to fetch the weather data. Status Code: {response.status}")
-                return
+        point = await self._resolve_point(zip_code)
+        if point is None:
+            await ctx.send("Failed to fetch the weather data.")
+            return
+        await self._save_zip_points()
 
-            data = await response.json()
-            forecast_url = data.get('properties', {}).get('forecast')
-            if not forecast_url:
-                await ctx.send(f"Failed to retrieve forecast URL.")
-                return
+        periods = await self._forecast_periods(point)
+        if periods is None:
+            await ctx.send(f"Failed to fetch the forecast data.")
+            return
+        if not periods:
+            await ctx.send(f"Failed to retrieve forecast periods.")
+            return
+        
+        embeds = []
+        
+        for period in periods[:10]:  # Create a page for each of the next 10 forecast periods
+            name = period.get('name', 'N/A')
+            detailed_forecast = period.get('detailedForecast', 'No detailed forecast available.')
+            temperature = period.get('temperature', 'N/A')
+            if temperature != 'N/A':
+                temperature = f"{temperature}°F"
+            wind_speed = period.get('windSpeed', 'N/A')
+            wind_direction = period.get('windDirection', 'N/A')
             
-            async with self.session.get(forecast_url) as forecast_response:
-                if forecast_response.status != 200:
-                    await ctx.send(f"Failed to fetch the forecast data.")
-                    return
-                
-                forecast_data = await forecast_response.json()
-                periods = forecast_data.get('properties', {}).get('periods', [])
-                if not periods:
-                    await ctx.send(f"Failed to retrieve forecast periods.")
-                    return
-                
-                embeds = []
-                
-                for period in periods[:10]:  # Create a page for each of the next 10 forecast periods
-                    name = period.get('name', 'N/A')
-                    detailed_forecast = period.get('detailedForecast', 'No detailed forecast available.')
-                    temperature = period.get('temperature', 'N/A')
-                    if temperature != 'N/A':
-                        temperature = f"{temperature}°F"
-                    wind_speed = period.get('windSpeed', 'N/A')
-                    wind_direction = period.get('windDirection', 'N/A')
-                    
-                    embed = discord.Embed(
-                        title=f"Weather forecast for {name}",
-                        description=f"{detailed_forecast}",
-                        color=0xfffffe
-                    )
-                    embed.add_field(name="Temperature", value=temperature)
-                    embed.add_field(name="Wind speed", value=wind_speed)
-                    embed.add_field(name="Wind direction", value=wind_direction)
-                    
-                    embeds.append(embed)
+            embed = discord.Embed(
+                title=f"Weather forecast for {name}",
+                description=f"{detailed_forecast}",
+                color=0xfffffe
+            )
+            embed.add_field(name="Temperature", value=temperature)
+            embed.add_field(name="Wind speed", value=wind_speed)
+            embed.add_field(name="Wind direction", value=wind_direction)
+            
+            embeds.append(embed)
+        
+        message = await ctx.send(embed=embeds[0])
+        forecasts_fetched = await self.config.forecasts_fetched()
+        await self.config.forecasts_fetched.set(forecasts_fetched + 1)
+        page = 0
+        await message.add_reaction("⬅️")
+        await message.add_reaction("❌")
+        await message.add_reaction("➡️")
+
+        def check(reaction, user):
+            return user == ctx.author and str(reaction.emoji) in ["⬅️", "➡️", "❌"] and reaction.message.id == message.id
+
+        while True:
+            try:
+                reaction, user = await self.bot.wait_for("reaction_add", timeout=60.0, check=check)
+                if str(reaction.emoji) == "➡️":
+                    page = (page + 1) % len(embeds)
+                elif str(reaction.emoji) == "⬅️":
+                    page = (page - 1) % len(embeds)
+                elif str(reaction.emoji) == "❌":
+                    await message.delete()
+                    break
                 
-                message = await ctx.send(embed=embeds[0])
-                forecasts_fetched = await self.config.forecasts_fetched()
-                await self.config.forecasts_fetched.set(forecasts_fetched + 1)
-                page = 0
-                await message.add_reaction("⬅️")
-                await message.add_reaction("❌")
-                await message.add_reaction("➡️")
-
-                def check(reaction, user):
-                    return user == ctx.author and str(reaction.emoji) in ["⬅️", "➡️", "❌"] and reaction.message.id == message.id
-
-                while True:
-                    try:
-                        reaction, user = await self.bot.wait_for("reaction_add", timeout=60.0, check=check)
-                        if str(reaction.emoji) == "➡️":
-                            page = (page + 1) % len(embeds)
-                        elif str(reaction.emoji) == "⬅️":
-                            page = (page - 1) % len(embeds)
-                        elif str(reaction.emoji) == "❌":
-                            await message.delete()
-                            break
-                        
-                        await message.edit(embed=embeds[page])
-                        await message.remove_reaction(reaction, user)
-                    except asyncio.TimeoutError:
-                        break
+                await message.edit(embed=embeds[page])
+                await message.remove_reaction(reaction, user)
+            except asyncio.TimeoutError:
+                break
 
     @weather.command(name="stats")
     async def stats(self, ctx):
@@ -256,6 +337,8 @@ class Weather(commands.Cog):
             usage.add_field(name="Nowcasts served", value=f"**{nowcasts_fetched}** nowcast{'s' if nowcasts_fetched != 1 else ''}", inline=True)
             usage.add_field(name="Forecasts served", value=f"**{forecasts_fetched}** forecast{'s' if forecasts_fetched != 1 else ''}", inline=True)
             usage.add_field(name="Glossary terms shown", value=f"**{glossary_definitions_shown}** term{'s' if glossary_definitions_shown != 1 else ''}", inline=True)
+            lookups = self.weather_cache.lookups()
+            usage.add_field(name="Cache hit rate", value=f"**{self.weather_cache.hit_rate():.0%}** of {lookups} lookup{'s' if lookups != 1 else ''} since load", inline=True)
 
             await ctx.send(embed=usage)
 
@@ -326,8 +409,9 @@ class Weather(commands.Cog):
             # Fetch current weather data using the latitude and longitude
             url = "https://api.open-meteo.com/v1/forecast"
             params = {
-                "latitude": str(latitude).strip(),
-                "longitude": str(longitude).strip(),
+                # Rounded to ~1km so nearby zip codes share a cached response
+                "latitude": str(round(latitude, 2)),
+                "longitude": str(round(longitude, 2)),
                 "current": "temperature_2m,relative_humidity_2m,apparent_temperature,precipitation,rain,showers,snowfall,cloud_cover,pressure_msl,surface_pressure,wind_speed_10m,wind_direction_10m,wind_gusts_10m",
                 "hourly": "uv_index,cape,direct_radiation_instant,soil_temperature_0cm",
                 "minutely_15": "lightning_potential,visibility,soil_moisture_0_to_1cm",
@@ -341,276 +425,275 @@ class Weather(commands.Cog):
             queryString = "&".join(f"{key}={value}" for key, value in params.items())
             weather_url = f"{url}?{queryString}"
             
-            async with self.session.get(weather_url) as response:
-                if response.status != 200:
-                    await ctx.send(f"Failed to fetch the weather data. URL: {weather_url}, Status Code: {response.status}")
-                    return
-
-                data = await response.json()
-                if not data:
-                    await ctx.send(f"Failed to retrieve current weather data. URL: {weather_url}, Data: {data}")
-                    return
-                
-                current = data.get('current', {})
-                hourly = data.get('hourly', {})
-                minutely_15 = data.get('minutely_15', {})
-                
-                embed = discord.Embed(
-                    title=f"Current conditions",
-                    color=0xfffffe
-                )
-                temperature = current.get('temperature_2m', 'N/A')
-                embed.add_field(name="Temperature", value=f"**{temperature}°F** • {self.fahrenheit_to_celsius(temperature)}°C")
-                embed.add_field(name="Feels like", value=f"**{current.get('apparent_temperature', 'N/A')}°F** • {self.fahrenheit_to_celsius(current.get('apparent_temperature', 'N/A'))}°C")
-
-                ground_temp = hourly.get('soil_temperature_0cm', 'N/A')
-                if isinstance(ground_temp, list) and ground_temp:
-                    ground_temp = ground_temp[0]
-                embed.add_field(name="Ground temperature", value=f"**{ground_temp}°F** • {self.fahrenheit_to_celsius(ground_temp)}°C")
-
-                wind_direction = current.get('wind_direction_10m', 'N/A')
-                if wind_direction != 'N/A':
-                    if (wind_direction >= 0 and wind_direction <= 22.5) or (wind_direction > 337.5 and wind_direction <= 360):
-                        wind_direction_str = 'North'
-                    elif wind_direction > 22.5 and wind_direction <= 67.5:
-                        wind_direction_str = 'Northeast'
-                    elif wind_direction > 67.5 and wind_direction <= 112.5:
-                        wind_direction_str = 'East'
-                    elif wind_direction > 112.5 and wind_direction <= 157.5:
-                        wind_direction_str = 'Southeast'
-                    elif wind_direction > 157.5 and wind_direction <= 202.5:
-                        wind_direction_str = 'South'
-                    elif wind_direction > 202.5 and wind_direction <= 247.5:
-                        wind_direction_str = 'Southwest'
-                    elif wind_direction > 247.5 and wind_direction <= 292.5:
-                        wind_direction_str = 'West'
-                    else:
-                        wind_direction_str = 'Northwest'
-                else:
-                    wind_direction_str = 'N/A'
-                embed.add_field(name="Wind direction", value=wind_direction_str)
-
-                wind_speed = current.get('wind_speed_10m', 'N/A')
-                if wind_speed != 'N/A':
-                    wind_speed_knots = self.mph_to_knots(wind_speed)
-                    embed.add_field(name="Wind speed", value=f"**{wind_speed} mph** • {wind_speed_knots} kts")
-
-                wind_gusts = current.get('wind_gusts_10m', 'N/A')
-                if wind_gusts != 'N/A':
-                    wind_gusts_knots = self.mph_to_knots(wind_gusts)
-                    embed.add_field(name="Wind gusts", value=f"**{wind_gusts} mph** • {wind_gusts_knots} kts")
-                
-                embed.add_field(name="Humidity", value=f"{current.get('relative_humidity_2m', 'N/A')}%")
-                
-                precipitation = current.get('precipitation', 'N/A')
-                if precipitation != 'N/A' and precipitation != 0.0:
-                    embed.add_field(name="Precipitation", value=f"{precipitation} inches")
-                
-                rain = current.get('rain', 'N/A')
-                if rain != 'N/A' and rain != 0.0:
-                    embed.add_field(name="Rain", value=f"{rain} inches")
-                
-                showers = current.get('showers', 'N/A')
-                if showers != 'N/A' and showers != 0.0:
-                    embed.add_field(name="Showers", value=f"{showers} inches")
-                
-                snowfall = current.get('snowfall', 'N/A')
-                if snowfall != 'N/A' and snowfall != 0.0:
-                    embed.add_field(name="Snowfall", value=f"{snowfall} inches")
-                
-                embed.add_field(name="Cloud cover", value=f"{current.get('cloud_cover', 'N/A')}%")
-
-                visibility = minutely_15.get('visibility', [0])
-                if isinstance(visibility, list) and visibility:
-                    visibility_value_miles = visibility[0] / 5280
-                    visibility_value_meters = float(self.miles_to_meters(visibility_value_miles))
-                    if visibility_value_meters < 1000:
-                        visibility_str = f"{visibility_value_meters:.1f} m"
-                    else:
-                        visibility_value_km = visibility_value_meters / 1000
-                        visibility_str = f"{visibility_value_km:.1f} km"
+            data = await self.weather_cache.get(
+                ("current", params["latitude"], params["longitude"]), self.CURRENT_TTL, functools.partial(self._fetch_json, weather_url)
+            )
+            if not data:
+                await ctx.send(f"Failed to fetch the weather data. URL: {weather_url}")
+                return
+            
+            current = data.get('current', {})
+            hourly = data.get('hourly', {})
+            minutely_15 = data.get('minutely_15', {})
+            
+            embed = discord.Embed(
+                title=f"Current conditions",
+                color=0xfffffe
+            )
+            temperature = current.get('temperature_2m', 'N/A')
+            embed.add_field(name="Temperature", value=f"**{temperature}°F** • {self.fahrenheit_to_celsius(temperature)}°C")
+            embed.add_field(name="Feels like", value=f"**{current.get('apparent_temperature', 'N/A')}°F** • {self.fahrenheit_to_celsius(current.get('apparent_temperature', 'N/A'))}°C")
+
+            ground_temp = hourly.get('soil_temperature_0cm', 'N/A')
+            if isinstance(ground_temp, list) and ground_temp:
+                ground_temp = ground_temp[0]
+            embed.add_field(name="Ground temperature", value=f"**{ground_temp}°F** • {self.fahrenheit_to_celsius(ground_temp)}°C")
+
+            wind_direction = current.get('wind_direction_10m', 'N/A')
+            if wind_direction != 'N/A':
+                if (wind_direction >= 0 and wind_direction <= 22.5) or (wind_direction > 337.5 and wind_direction <= 360):
+                    wind_direction_str = 'North'
+                elif wind_direction > 22.5 and wind_direction <= 67.5:
+                    wind_direction_str = 'Northeast'
+                elif wind_direction > 67.5 and wind_direction <= 112.5:
+                    wind_direction_str = 'East'
+                elif wind_direction > 112.5 and wind_direction <= 157.5:
+                    wind_direction_str = 'Southeast'
+                elif wind_direction > 157.5 and wind_direction <= 202.5:
+                    wind_direction_str = 'South'
+                elif wind_direction > 202.5 and wind_direction <= 247.5:
+                    wind_direction_str = 'Southwest'
+                elif wind_direction > 247.5 and wind_direction <= 292.5:
+                    wind_direction_str = 'West'
                 else:
-                    visibility_value_miles = 0
-                    visibility_str = "0.0 miles"
-                embed.add_field(name="Visibility", value=f"{visibility_value_miles:.2f} mi • {visibility_str}")
-
-                embed.add_field(name="Pressure (MSL)", value=f"{current.get('pressure_msl', 'N/A')} hPa")
-                embed.add_field(name="Surface pressure", value=f"{current.get('surface_pressure', 'N/A')} hPa")
-                
-                lightning_potential = minutely_15.get('lightning_potential', [None])
-                if isinstance(lightning_potential, list) and lightning_potential:
-                    lightning_potential = lightning_potential[0]
-                if lightning_potential is None or lightning_potential == 0:
-                    lightning_potential_str = 'None'
-                elif lightning_potential < 500:
-                    lightning_potential_str = 'Low'
-                elif lightning_potential < 1000:
-                    lightning_potential_str = 'Medium'
-                elif lightning_potential < 2000:
-                    lightning_potential_str = 'High'
+                    wind_direction_str = 'Northwest'
+            else:
+                wind_direction_str = 'N/A'
+            embed.add_field(name="Wind direction", value=wind_direction_str)
+
+            wind_speed = current.get('wind_speed_10m', 'N/A')
+            if wind_speed != 'N/A':
+                wind_speed_knots = self.mph_to_knots(wind_speed)
+                embed.add_field(name="Wind speed", value=f"**{wind_speed} mph** • {wind_speed_knots} kts")
+
+            wind_gusts = current.get('wind_gusts_10m', 'N/A')
+            if wind_gusts != 'N/A':
+                wind_gusts_knots = self.mph_to_knots(wind_gusts)
+                embed.add_field(name="Wind gusts", value=f"**{wind_gusts} mph** • {wind_gusts_knots} kts")
+            
+            embed.add_field(name="Humidity", value=f"{current.get('relative_humidity_2m', 'N/A')}%")
+            
+            precipitation = current.get('precipitation', 'N/A')
+            if precipitation != 'N/A' and precipitation != 0.0:
+                embed.add_field(name="Precipitation", value=f"{precipitation} inches")
+            
+            rain = current.get('rain', 'N/A')
+            if rain != 'N/A' and rain != 0.0:
+                embed.add_field(name="Rain", value=f"{rain} inches")
+            
+            showers = current.get('showers', 'N/A')
+            if showers != 'N/A' and showers != 0.0:
+                embed.add_field(name="Showers", value=f"{showers} inches")
+            
+            snowfall = current.get('snowfall', 'N/A')
+            if snowfall != 'N/A' and snowfall != 0.0:
+                embed.add_field(name="Snowfall", value=f"{snowfall} inches")
+            
+            embed.add_field(name="Cloud cover", value=f"{current.get('cloud_cover', 'N/A')}%")
+
+            visibility = minutely_15.get('visibility', [0])
+            if isinstance(visibility, list) and visibility:
+                visibility_value_miles = visibility[0] / 5280
+                visibility_value_meters = float(self.miles_to_meters(visibility_value_miles))
+                if visibility_value_meters < 1000:
+                    visibility_str = f"{visibility_value_meters:.1f} m"
                 else:
-                    lightning_potential_str = 'Extreme'
-                embed.add_field(name="Lightning potential", value=f"{lightning_potential_str}")
-                
-                # Fetch severe and extreme weather alerts
-                alerts_url = f"https://api.weather.gov/alerts/active?point={latitude.strip()},{longitude.strip()}"
-                async with self.session.get(alerts_url) as alerts_response:
-                    try:
-                        alerts_response.raise_for_status()
-                        alerts_data = await alerts_response.json()
-                        alerts = alerts_data.get('features', [])
-                        if alerts:
-                            embed.set_footer(text="When thunder roars, go indoors. If you can hear thunder, you can be struck by lightning.")
-                            alert_titles = []
-                            event_emojis = {
-                                "Tornado Warning": ":cloud_tornado:",
-                                "Severe Thunderstorm Warning": ":thunder_cloud_rain:",
-                                "Flood Warning": ":ocean:",
-                                "Flood Watch": ":ocean:",
-                                "Heat Advisory": ":desert:",
-                                "Special Weather Statement": ":information_source:",
-                                "Winter Storm Warning": ":cloud_snow:",
-                                "High Wind Warning": ":wind_blowing_face:",
-                                "Excessive Heat Warning": ":thermometer:",
-                                "Fire Weather Watch": ":fire:",
-                                "Flood Advisory": ":ocean:",
-                                "Hurricane Warning": ":cyclone:",
-                                "Tsunami Warning": ":ocean:",
-                                "Earthquake Warning": ":earth_americas:",
-                                "Blizzard Warning": ":snowflake:",
-                                "Freeze Warning": ":snowflake:",
-                                "Dust Storm Warning": ":dash:",
-                                "Extreme Cold Warning": ":cold_face:",
-                                "Extreme Heat Warning": ":hot_face:",
-                                "Gale Warning": ":wind_face:",
-                                "Ice Storm Warning": ":ice_cube:",
-                                "Red Flag Warning": ":triangular_flag_on_post:",
-                                "Severe Weather Statement": ":cloud_with_lightning_and_rain:",
-                                "Special Marine Warning": ":anchor:",
-                                "Storm Surge Warning": ":ocean:",
-                                "Tropical Storm Warning": ":thunder_cloud_rain:",
-                                "Tropical Cyclone Statement": ":cyclone:",
-                                "Volcano Warning": ":volcano:",
-                                "Flash Flood Warning": ":ocean:",
-                                "Frost Advisory": ":snowflake:",
-                                "Hydrologic Outlook": ":notepad_spiral:",
-                                "Rip Current Statement": ":ocean:",
-                                "Mandatory evacuation order": ":person_running:",
-                                "Air Quality Alert": ":face_in_clouds:",
-                                "Coastal Flood Warning": ":beach_umbrella:",
-                                # Add more event types and corresponding emojis as needed
-                            }
-                            event_transformations = {
-                                "Evacuation - Immediate": "Mandatory evacuation order",
-                                # Add more event transformations as needed
-                            }
-                            for alert in alerts:
-                                event = alert['properties']['event']
-                                event = event_transformations.get(event, event)  # Transform event name if applicable
-                                emoji = event_emojis.get(event, ":warning:")  # Default to warning emoji if event not found
-                                expires = alert['properties'].get('expires')
-                                if expires:
-                                    try:
-                                        expires_timestamp = f"<t:{int(datetime.fromisoformat(expires[:-1]).timestamp())}:R>"
-                                    except ValueError:
-                                        # Attempt to correct the timestamp format
-                                        try:
-                                            corrected_expires = expires + '0'  # Adding missing zero
-                                            expires_timestamp = f"<t:{int(datetime.fromisoformat(corrected_expires[:-1]).timestamp())}:R>"
-                                        except ValueError as ve:
-                                            expires_timestamp = f"Invalid expiry time format: {expires}"
-                                    alert_titles.append(f"{emoji} **{event}** expiring **{expires_timestamp}**")
-                                else:
-                                    alert_titles.append(f"{emoji} **{event}**")
-                            alert_status = "\n".join(alert_titles)
-                        else:
-                            alert_status = "None right now - **#It'sAmazingOutThere**"
-                    except Exception as e:
-                        alert_status = f"Failed to fetch alerts: {str(e)}, url={alerts_url}"
-                
-                embed.add_field(name="Active alerts", value=alert_status, inline=False)
-
-                # Check if OpenAI key is set and generate AI weather summary
-                tokens = await self.bot.get_shared_api_tokens("openai")
-                openai_key = tokens.get("api_key") if tokens else None
-                if openai_key:
-                    openai_url = "https://api.openai.com/v1/chat/completions"
-                    headers = {
-                        "Authorization": f"Bearer {openai_key}",
-                        "Content-Type": "application/json"
+                    visibility_value_km = visibility_value_meters / 1000
+                    visibility_str = f"{visibility_value_km:.1f} km"
+            else:
+                visibility_value_miles = 0
+                visibility_str = "0.0 miles"
+            embed.add_field(name="Visibility", value=f"{visibility_value_miles:.2f} mi • {visibility_str}")
+
+            embed.add_field(name="Pressure (MSL)", value=f"{current.get('pressure_msl', 'N/A')} hPa")
+            embed.add_field(name="Surface pressure", value=f"{current.get('surface_pressure', 'N/A')} hPa")
+            
+            lightning_potential = minutely_15.get('lightning_potential', [None])
+            if isinstance(lightning_potential, list) and lightning_potential:
+                lightning_potential = lightning_potential[0]
+            if lightning_potential is None or lightning_potential == 0:
+                lightning_potential_str = 'None'
+            elif lightning_potential < 500:
+                lightning_potential_str = 'Low'
+            elif lightning_potential < 1000:
+                lightning_potential_str = 'Medium'
+            elif lightning_potential < 2000:
+                lightning_potential_str = 'High'
+            else:
+                lightning_potential_str = 'Extreme'
+            embed.add_field(name="Lightning potential", value=f"{lightning_potential_str}")
+            
+            # Fetch severe and extreme weather alerts
+            alerts_url = f"https://api.weather.gov/alerts/active?point={latitude},{longitude}"
+            alerts_data = await self.weather_cache.get(
+                ("alerts", latitude, longitude), self.ALERTS_TTL, functools.partial(self._fetch_json, alerts_url)
+            )
+            try:
+                if alerts_data is None:
+                    raise aiohttp.ClientError("no response from weather.gov")
+                alerts = alerts_data.get('features', [])
+                if alerts:
+                    embed.set_footer(text="When thunder roars, go indoors. If you can hear thunder, you can be struck by lightning.")
+                    alert_titles = []
+                    event_emojis = {
+                        "Tornado Warning": ":cloud_tornado:",
+                        "Severe Thunderstorm Warning": ":thunder_cloud_rain:",
+                        "Flood Warning": ":ocean:",
+                        "Flood Watch": ":ocean:",
+                        "Heat Advisory": ":desert:",
+                        "Special Weather Statement": ":information_source:",
+                        "Winter Storm Warning": ":cloud_snow:",
+                        "High Wind Warning": ":wind_blowing_face:",
+                        "Excessive Heat Warning": ":thermometer:",
+                        "Fire Weather Watch": ":fire:",
+                        "Flood Advisory": ":ocean:",
+                        "Hurricane Warning": ":cyclone:",
+                        "Tsunami Warning": ":ocean:",
+                        "Earthquake Warning": ":earth_americas:",
+                        "Blizzard Warning": ":snowflake:",
+                        "Freeze Warning": ":snowflake:",
+                        "Dust Storm Warning": ":dash:",
+                        "Extreme Cold Warning": ":cold_face:",
+                        "Extreme Heat Warning": ":hot_face:",
+                        "Gale Warning": ":wind_face:",
+                        "Ice Storm Warning": ":ice_cube:",
+                        "Red Flag Warning": ":triangular_flag_on_post:",
+                        "Severe Weather Statement": ":cloud_with_lightning_and_rain:",
+                        "Special Marine Warning": ":anchor:",
+                        "Storm Surge Warning": ":ocean:",
+                        "Tropical Storm Warning": ":thunder_cloud_rain:",
+                        "Tropical Cyclone Statement": ":cyclone:",
+                        "Volcano Warning": ":volcano:",
+                        "Flash Flood Warning": ":ocean:",
+                        "Frost Advisory": ":snowflake:",
+                        "Hydrologic Outlook": ":notepad_spiral:",
+                        "Rip Current Statement": ":ocean:",
+                        "Mandatory evacuation order": ":person_running:",
+                        "Air Quality Alert": ":face_in_clouds:",
+                        "Coastal Flood Warning": ":beach_umbrella:",
+                        # Add more event types and corresponding emojis as needed
                     }
-                    messages = [
-                        {"role": "system", "content": "You are a virtual meteorologist built into an app. Never talk about the location the data comes from or the time. Always respond in conversational text, giving recommendations based on conditions where appropriate."},
-                        {"role": "user", "content": f"Generate a summary of the current weather conditions based on the following data: {data}"}
-                    ]
-                    openai_payload = {
-                        "model": "gpt-4o-mini",
-                        "messages": messages,
-                        "max_tokens": 250,
-                        "temperature": 1.0
+                    event_transformations = {
+                        "Evacuation - Immediate": "Mandatory evacuation order",
+                        # Add more event transformations as needed
                     }
-                    async with self.session.post(openai_url, headers=headers, json=openai_payload) as openai_response:
-                        if openai_response.status == 200:
-                            openai_data = await openai_response.json()
-                            ai_summary = openai_data.get("choices", [{}])[0].get("message", {}).get("content", "").strip()
-                            embed.add_field(name="AI weather summary", value=ai_summary, inline=False)
+                    for alert in alerts:
+                        event = alert['properties']['event']
+                        event = event_transformations.get(event, event)  # Transform event name if applicable
+                        emoji = event_emojis.get(event, ":warning:")  # Default to warning emoji if event not found
+                        expires = alert['properties'].get('expires')
+                        if expires:
+                            try:
+                                expires_timestamp = f"<t:{int(datetime.fromisoformat(expires[:-1]).timestamp())}:R>"
+                            except ValueError:
+                                # Attempt to correct the timestamp format
+                                try:
+                                    corrected_expires = expires + '0'  # Adding missing zero
+                                    expires_timestamp = f"<t:{int(datetime.fromisoformat(corrected_expires[:-1]).timestamp())}:R>"
+                                except ValueError as ve:
+                                    expires_timestamp = f"Invalid expiry time format: {expires}"
+                            alert_titles.append(f"{emoji} **{event}** expiring **{expires_timestamp}**")
                         else:
-                            pass
-
-                await ctx.send(embed=embed)
-                nowcasts_fetched = await self.config.nowcasts_fetched()
-                await self.config.nowcasts_fetched.set(nowcasts_fetched + 1)
-
-                # Update highest and lowest values
-                highest_temperature = await self.config.highest_temperature()
-                highest_temperature_date = await self.config.highest_temperature_date()
-                lowest_temperature = await self.config.lowest_temperature()
-                lowest_temperature_date = await self.config.lowest_temperature_date()
-                highest_wind_speed = await self.config.highest_wind_speed()
-                highest_wind_speed_date = await self.config.highest_wind_speed_date()
-                highest_precipitation = await self.config.highest_precipitation()
-                highest_precipitation_date = await self.config.highest_precipitation_date()
-                highest_wind_gusts = await self.config.highest_wind_gusts()
-                highest_wind_gusts_date = await self.config.highest_wind_gusts_date()
-                highest_snowfall = await self.config.highest_snowfall()
-                highest_snowfall_date = await self.config.highest_snowfall_date()
-                highest_rainfall = await self.config.highest_rainfall()
-                highest_rainfall_date = await self.config.highest_rainfall_date()
-
-                current_date = datetime.now().isoformat()
-
-                if temperature != 'N/A':
-                    if highest_temperature is None or temperature > highest_temperature:
-                        await self.config.highest_temperature.set(temperature)
-                        await self.config.highest_temperature_date.set(current_date)
-                    if lowest_temperature is None or temperature < lowest_temperature:
-                        await self.config.lowest_temperature.set(temperature)
-                        await self.config.lowest_temperature_date.set(current_date)
-
-                if wind_speed != 'N/A':
-                    if highest_wind_speed is None or wind_speed > highest_wind_speed:
-                        await self.config.highest_wind_speed.set(wind_speed)
-                        await self.config.highest_wind_speed_date.set(current_date)
-
-                if wind_gusts != 'N/A':
-                    if highest_wind_gusts is None or wind_gusts > highest_wind_gusts:
-                        await self.config.highest_wind_gusts.set(wind_gusts)
-                        await self.config.highest_wind_gusts_date.set(current_date)
-
-                if precipitation != 'N/A' and precipitation != 0.0:
-                    if highest_precipitation is None or precipitation > highest_precipitation:
-                        await self.config.highest_precipitation.set(precipitation)
-                        await self.config.highest_precipitation_date.set(current_date)
-
-                if snowfall != 'N/A' and snowfall != 0.0:
-                    if highest_snowfall is None or snowfall > highest_snowfall:
-                        await self.config.highest_snowfall.set(snowfall)
-                        await self.config.highest_snowfall_date.set(current_date)
-
-                if showers != 'N/A' and showers != 0.0:
-                    if highest_rainfall is None or showers > highest_rainfall:
-                        await self.config.highest_rainfall.set(showers)
-                        await self.config.highest_rainfall_date.set(current_date)
+                            alert_titles.append(f"{emoji} **{event}**")
+                    alert_status = "\n".join(alert_titles)
+                else:
+                    alert_status = "None right now - **#It'sAmazingOutThere**"
+            except Exception as e:
+                alert_status = f"Failed to fetch alerts: {str(e)}, url={alerts_url}"
+            
+            embed.add_field(name="Active alerts", value=alert_status, inline=False)
+
+            # Check if OpenAI key is set and generate AI weather summary
+            tokens = await self.bot.get_shared_api_tokens("openai")
+            openai_key = tokens.get("api_key") if tokens else None
+            if openai_key:
+                openai_url = "https://api.openai.com/v1/chat/completions"
+                headers = {
+                    "Authorization": f"Bearer {openai_key}",
+                    "Content-Type": "application/json"
+                }
+                messages = [
+                    {"role": "system", "content": "You are a virtual meteorologist built into an app. Never talk about the location the data comes from or the time. Always respond in conversational text, giving recommendations based on conditions where appropriate."},
+                    {"role": "user", "content": f"Generate a summary of the current weather conditions based on the following data: {data}"}
+                ]
+                openai_payload = {
+                    "model": "gpt-4o-mini",
+                    "messages": messages,
+                    "max_tokens": 250,
+                    "temperature": 1.0
+                }
+                async with self.session.post(openai_url, headers=headers, json=openai_payload) as openai_response:
+                    if openai_response.status == 200:
+                        openai_data = await openai_response.json()
+                        ai_summary = openai_data.get("choices", [{}])[0].get("message", {}).get("content", "").strip()
+                        embed.add_field(name="AI weather summary", value=ai_summary, inline=False)
+                    else:
+                        pass
+
+            await ctx.send(embed=embed)
+            nowcasts_fetched = await self.config.nowcasts_fetched()
+            await self.config.nowcasts_fetched.set(nowcasts_fetched + 1)
+
+            # Update highest and lowest values
+            highest_temperature = await self.config.highest_temperature()
+            highest_temperature_date = await self.config.highest_temperature_date()
+            lowest_temperature = await self.config.lowest_temperature()
+            lowest_temperature_date = await self.config.lowest_temperature_date()
+            highest_wind_speed = await self.config.highest_wind_speed()
+            highest_wind_speed_date = await self.config.highest_wind_speed_date()
+            highest_precipitation = await self.config.highest_precipitation()
+            highest_precipitation_date = await self.config.highest_precipitation_date()
+            highest_wind_gusts = await self.config.highest_wind_gusts()
+            highest_wind_gusts_date = await self.config.highest_wind_gusts_date()
+            highest_snowfall = await self.config.highest_snowfall()
+            highest_snowfall_date = await self.config.highest_snowfall_date()
+            highest_rainfall = await self.config.highest_rainfall()
+            highest_rainfall_date = await self.config.highest_rainfall_date()
+
+            current_date = datetime.now().isoformat()
+
+            if temperature != 'N/A':
+                if highest_temperature is None or temperature > highest_temperature:
+                    await self.config.highest_temperature.set(temperature)
+                    await self.config.highest_temperature_date.set(current_date)
+                if lowest_temperature is None or temperature < lowest_temperature:
+                    await self.config.lowest_temperature.set(temperature)
+                    await self.config.lowest_temperature_date.set(current_date)
+
+            if wind_speed != 'N/A':
+                if highest_wind_speed is None or wind_speed > highest_wind_speed:
+                    await self.config.highest_wind_speed.set(wind_speed)
+                    await self.config.highest_wind_speed_date.set(current_date)
+
+            if wind_gusts != 'N/A':
+                if highest_wind_gusts is None or wind_gusts > highest_wind_gusts:
+                    await self.config.highest_wind_gusts.set(wind_gusts)
+                    await self.config.highest_wind_gusts_date.set(current_date)
+
+            if precipitation != 'N/A' and precipitation != 0.0:
+                if highest_precipitation is None or precipitation > highest_precipitation:
+                    await self.config.highest_precipitation.set(precipitation)
+                    await self.config.highest_precipitation_date.set(current_date)
+
+            if snowfall != 'N/A' and snowfall != 0.0:
+                if highest_snowfall is None or snowfall > highest_snowfall:
+                    await self.config.highest_snowfall.set(snowfall)
+                    await self.config.highest_snowfall_date.set(current_date)
+
+            if showers != 'N/A' and showers != 0.0:
+                if highest_rainfall is None or showers > highest_rainfall:
+                    await self.config.highest_rainfall.set(showers)
+                    await self.config.highest_rainfall_date.set(current_date)
 
     @commands.guild_only()
     @weather.command(name="glossary")
@@ -840,94 +923,82 @@ class Weather(commands.Cog):
     @weather.command(name="stations")
     async def stations(self, ctx):
         """Explore US weather observation stations"""
-        url = "https://api.weather.gov/stations"
-        headers = {"accept": "application/geo+json"}
+        async with ctx.typing():
+            stations, _ = await self._station_index("stations")
+        if stations is None:
+            await ctx.send("Failed to fetch stations data.")
+            return
         
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=headers) as response:
-                if response.status != 200:
-                    await ctx.send("Failed to fetch stations data.")
-                    return
-                data = await response.json()
-                
-                stations = data.get("features", [])
-                if not stations:
-                    await ctx.send("No stations data found.")
-                    return
-                
-                pages = []
-                for i in range(0, len(stations), 15):
-                    embed = discord.Embed(
-                        title="Weather observation stations", 
-                        description=f"There are {len(stations)} stations in the coverage area", 
-                        color=0xfffffe
-                    )
-                    for station in stations[i:i+15]:
-                        station_name = station["properties"].get("name", "Unknown")
-                        station_id = station["properties"].get("stationIdentifier", "Unknown")
-                        coordinates = station["geometry"]["coordinates"] if "geometry" in station else ["Unknown", "Unknown"]
-                        if coordinates != ["Unknown", "Unknown"]:
-                            coordinates = [round(coordinates[0], 2), round(coordinates[1], 2)]
-                        elevation = station["properties"].get("elevation", {}).get("value", "Unknown")
-                        if elevation != "Unknown":
-                            elevation = int(elevation)
-                        time_zone = station["properties"].get("timeZone", "Unknown").replace("_", " ")
-                        embed.add_field(
-                            name=station_name, 
-                            value=f"`{station_id}`\n`{coordinates[1]}, {coordinates[0]}`\n`{elevation} meters high`\n`{time_zone}`", 
-                            inline=True
-                        )
-                    pages.append(embed)
-                
-                if not pages:
-                    await ctx.send("No valid stations data found.")
-                    return
-                
-                message = await ctx.send(embed=pages[0])
-                await message.add_reaction("⬅️")
-                await message.add_reaction("❌")
-                await message.add_reaction("➡️")
+        if not stations:
+            await ctx.send("No stations data found.")
+            return
+        
+        # Build each page when it is shown, there are hundreds of them and most are never opened
+        def render(index):
+            embed = discord.Embed(
+                title="Weather observation stations", 
+                description=f"There are {len(stations)} stations in the coverage area", 
+                color=0xfffffe
+            )
+            embed.set_footer(text=f"Page {index + 1} of {page_count}")
+            for station in stations[index * 15:(index + 1) * 15]:
+                station_name = station["properties"].get("name", "Unknown")
+                station_id = station["properties"].get("stationIdentifier", "Unknown")
+                coordinates = station["geometry"]["coordinates"] if "geometry" in station else ["Unknown", "Unknown"]
+                if coordinates != ["Unknown", "Unknown"]:
+                    coordinates = [round(coordinates[0], 2), round(coordinates[1], 2)]
+                elevation = station["properties"].get("elevation", {}).get("value", "Unknown")
+                if elevation != "Unknown":
+                    elevation = int(elevation)
+                time_zone = station["properties"].get("timeZone", "Unknown").replace("_", " ")
+                embed.add_field(
+                    name=station_name, 
+                    value=f"`{station_id}`\n`{coordinates[1]}, {coordinates[0]}`\n`{elevation} meters high`\n`{time_zone}`", 
+                    inline=True
+                )
+            return embed
+        
+        page_count = (len(stations) + 14) // 15
+        message = await ctx.send(embed=render(0))
+        await message.add_reaction("⬅️")
+        await message.add_reaction("❌")
+        await message.add_reaction("➡️")
 
-                def check(reaction, user):
-                    return user == ctx.author and str(reaction.emoji) in ["⬅️", "➡️", "❌"]
+        def check(reaction, user):
+            return user == ctx.author and str(reaction.emoji) in ["⬅️", "➡️", "❌"]
 
-                i = 0
-                reaction = None
-                while True:
-                    try:
-                        reaction, user = await self.bot.wait_for("reaction_add", timeout=30.0, check=check)
-                        await message.remove_reaction(reaction, user)
-                    except asyncio.TimeoutError:
-                        await message.clear_reactions()
-                        break
+        i = 0
+        reaction = None
+        while True:
+            try:
+                reaction, user = await self.bot.wait_for("reaction_add", timeout=30.0, check=check)
+                await message.remove_reaction(reaction, user)
+            except asyncio.TimeoutError:
+                await message.clear_reactions()
+                break
 
-                    if str(reaction) == "⬅️":
-                        if i > 0:
-                            i -= 1
-                            await message.edit(embed=pages[i])
-                    elif str(reaction) == "➡️":
-                        if i < len(pages) - 1:
-                            i += 1
-                            await message.edit(embed=pages[i])
-                    elif str(reaction) == "❌":
-                        await message.delete()
-                        break
+            if str(reaction) == "⬅️":
+                if i > 0:
+                    i -= 1
+                    await message.edit(embed=render(i))
+            elif str(reaction) == "➡️":
+                if i < page_count - 1:
+                    i += 1
+                    await message.edit(embed=render(i))
+            elif str(reaction) == "❌":
+                await message.delete()
+                break
     
     @commands.guild_only()
     @weather.command()
     async def radars(self, ctx):
         """Explore US weather radar installations"""
-        url = "https://api.weather.gov/radar/stations"
-        headers = {"accept": "application/geo+json"}
-        
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=headers) as response:
-                if response.status != 200:
-                    await ctx.send("Failed to fetch radar stations data.")
-                    return
-                data = await response.json()
+        async with ctx.typing():
+            stations, _ = await self._station_index("radars")
+        if stations is None:
+            await ctx.send("Failed to fetch radar stations data.")
+            return
         
-        stations = data.get("features", [])
         if not stations:
             await ctx.send("No radar stations data found.")
             return
@@ -1057,6 +1128,65 @@ class Weather(commands.Cog):
                 await message.clear_reactions()
                 break
 
+    async def _query_point(self, ctx, zip_code):
+        if not zip_code:
+            zip_code = await self.config.user(ctx.author).zip_code()
+            if not zip_code:
+                await ctx.send("You haven't set a zip code yet. Use the `weatherset zip` command to set one.")
+                return None
+        if zip_code not in self.zip_codes:
+            await ctx.send("Invalid zip code. Please set a valid zip code.")
+            return None
+        return self.zip_codes[zip_code]
+
+    async def _send_nearest_stations(self, ctx, kind, zip_code, title):
+        point = await self._query_point(ctx, zip_code)
+        if point is None:
+            return
+        async with ctx.typing():
+            stations, grid = await self._station_index(kind)
+        if grid is None:
+            await ctx.send(f"Failed to fetch {'radar stations' if kind == 'radars' else 'stations'} data.")
+            return
+        embed = discord.Embed(title=title, color=0xfffffe)
+        for distance, row in grid.nearest(point[0], point[1], k=5):
+            properties = stations[row]["properties"]
+            station_id = properties.get("stationIdentifier") or properties.get("id", "Unknown")
+            longitude, latitude = stations[row]["geometry"]["coordinates"][:2]
+            embed.add_field(
+                name=properties.get("name", "Unknown"),
+                value=f"`{station_id}`\n`{round(latitude, 2)}, {round(longitude, 2)}`\n`{distance:.1f} miles away`",
+                inline=True
+            )
+        await ctx.send(embed=embed)
+
+    @weather.group(name="nearest")
+    async def nearest(self, ctx):
+        """Find the radars, observation stations or zip codes closest to a location"""
+
+    @nearest.command(name="radar")
+    async def nearest_radar(self, ctx, zip_code: str = None):
+        """Show the radar installations closest to your zip code, or one you specify"""
+        await self._send_nearest_stations(ctx, "radars", zip_code, "Nearest radar installations")
+
+    @nearest.command(name="station")
+    async def nearest_station(self, ctx, zip_code: str = None):
+        """Show the observation stations closest to your zip code, or one you specify"""
+        await self._send_nearest_stations(ctx, "stations", zip_code, "Nearest observation stations")
+
+    @nearest.command(name="zip")
+    async def nearest_zip(self, ctx, latitude: float, longitude: float):
+        """Find the zip codes closest to a latitude and longitude"""
+        if not -90 <= latitude <= 90 or not -180 <= longitude <= 180:
+            await ctx.send("Latitude must be between -90 and 90, and longitude between -180 and 180.")
+            return
+        # The first query builds the grid over every zip code, keep that off the event loop
+        matches = await self.bot.loop.run_in_executor(None, self.zip_codes.nearest, latitude, longitude, 5)
+        embed = discord.Embed(title="Nearest zip codes", color=0xfffffe)
+        for distance, zip_code in matches:
+            embed.add_field(name=zip_code, value=f"`{distance:.1f} miles away`", inline=True)
+        await ctx.send(embed=embed)
+
     @weather.command(name="profile")
     async def profile(self, ctx):
         """View your weather profile"""
@@ -1138,62 +1268,209 @@ class Weather(commands.Cog):
             await self.config.user(user).severealerts.set(False)
             await ctx.send("Weather alerts have been disabled.")
 
-    async def check_weather_alerts(self):
-        """Check for weather alerts and DM users if any severe or extreme warnings are issued"""
-        all_users = await self.config.all_users()
-        users_with_alerts = [user_id for user_id, data in all_users.items() if data.get("severealerts")]
-
-        for user_id in users_with_alerts:
-            user_data = await self.config.user_from_id(user_id).all()
-            zip_code = user_data.get("zip_code")
-            if not zip_code or zip_code not in self.zip_codes:
+    def _point_in_ring(self, longitude, latitude, ring):
+        inside = False
+        j = len(ring) - 1
+        for i in range(len(ring)):
+            xi, yi = ring[i][0], ring[i][1]
+            xj, yj = ring[j][0], ring[j][1]
+            if (yi > latitude) != (yj > latitude) and longitude < (xj - xi) * (latitude - yi) / (yj - yi) + xi:
+                inside = not inside
+            j = i
+        return inside
+
+    def _point_in_geometry(self, longitude, latitude, geometry):
+        """GeoJSON Polygon/MultiPolygon containment, matching what the point= alert filter does for storm-based warnings"""
+        if geometry.get('type') == 'Polygon':
+            polygons = [geometry['coordinates']]
+        elif geometry.get('type') == 'MultiPolygon':
+            polygons = geometry['coordinates']
+        else:
+            return False
+        for rings in polygons:
+            if not rings or not self._point_in_ring(longitude, latitude, rings[0]):
                 continue
+            if not any(self._point_in_ring(longitude, latitude, hole) for hole in rings[1:]):
+                return True
+        return False
 
+    def _severe_alert_embed(self, alert):
+        properties = alert['properties']
+        embed = discord.Embed(
+            title=properties['event'],
+            description=f"{'An' if properties['event'][0].lower() in 'aeiou' else 'A'} **{properties['event']}** was issued at **<t:{int(datetime.fromisoformat(properties['sent']).timestamp())}:F>** for your location and is in effect until **<t:{int(datetime.fromisoformat(properties['expires']).timestamp())}:F>**.",
+            color=0xff4545
+        )
+        if properties.get('instruction'):
+            embed.add_field(name="Instruction", value=properties['instruction'][:1024], inline=False)
+        if 'severity' in properties:
+            embed.add_field(name="Severity", value=properties['severity'], inline=True)
+        if 'urgency' in properties:
+            embed.add_field(name="Urgency", value=properties['urgency'], inline=True)
+        if 'certainty' in properties:
+            embed.add_field(name="Certainty", value=properties['certainty'], inline=True)
+        if 'senderName' in properties:
+            embed.set_footer(text=f"Issued by {properties['senderName']}")
+        return embed
+
+    async def _fetch_alert_features(self, url):
+        async with self.alert_semaphore:
+            try:
+                async with self.session.get(url) as response:
+                    if response.status != 200:
+                        return None
+                    data = await response.json()
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                return None
+        return [
+            alert for alert in data.get('features', [])
+            if alert.get('properties', {}).get('severity') in ['Severe', 'Extreme']
+        ]
+
+    async def _resolve_point(self, zip_code):
+        """Return the NWS zones, forecast gridpoint and forecast URL for a zip code, cached across restarts"""
+        if self.zip_points is None:
+            self.zip_points = await self.config.zip_points()
+        if zip_code in self.zip_points:
+            return self.zip_points[zip_code]
+        latitude, longitude = self.zip_codes[zip_code]
+        points_url = f"https://api.weather.gov/points/{latitude},{longitude}"
+        async with self.alert_semaphore:
+            try:
+                async with self.session.get(points_url) as response:
+                    if response.status != 200:
+                        return None
+                    data = await response.json()
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                return None
+        properties = data.get('properties', {})
+        zones = [
+            url.rstrip('/').rsplit('/', 1)[-1]
+            for url in (properties.get('forecastZone'), properties.get('county'), properties.get('fireWeatherZone'))
+            if url
+        ]
+        if not zones or not properties.get('forecast'):
+            return None
+        point = {
+            "zones": zones,
+            "grid": [properties.get('gridId'), properties.get('gridX'), properties.get('gridY')],
+            "forecast": properties['forecast'],
+        }
+        self.zip_points[zip_code] = point
+        self.zip_points_dirty = True
+        return point
+
+    async def _save_zip_points(self):
+        if self.zip_points_dirty:
+            self.zip_points_dirty = False
+            await self.config.zip_points.set(self.zip_points)
+
+    def _match_alerts(self, zip_code, zones, zone_index, polygon_alerts):
+        latitude, longitude = self.zip_codes[zip_code]
+        matched = {}
+        for zone in zones:
+            for alert in zone_index.get(zone, ()):
+                matched[alert['id']] = alert
+        for (west, south, east, north), alert in polygon_alerts:
+            if west <= longitude <= east and south <= latitude <= north:
+                if self._point_in_geometry(longitude, latitude, alert['geometry']):
+                    matched[alert['id']] = alert
+        return list(matched.values())
+
+    async def _alerts_by_zip(self, zip_codes):
+        """Work out the active severe/extreme alerts for every subscribed zip code.
+
+        The nationwide feed is fetched once and matched against each zip code's cached NWS zones, or
+        against the alert polygon for storm-based warnings. Zip codes whose zones can't be resolved,
+        or every zip code if the nationwide feed is unavailable, fall back to one point query per zip.
+        """
+        nationwide = await self._fetch_alert_features("https://api.weather.gov/alerts/active?severity=Extreme,Severe")
+        results = {}
+        if nationwide is not None:
+            zone_index = {}
+            polygon_alerts = []
+            for alert in nationwide:
+                geometry = alert.get('geometry') or {}
+                polygons = {'Polygon': [geometry.get('coordinates')], 'MultiPolygon': geometry.get('coordinates')}.get(geometry.get('type'))
+                points = [point for polygon in polygons or () if polygon for point in polygon[0]]
+                if points:
+                    longitudes = [point[0] for point in points]
+                    latitudes = [point[1] for point in points]
+                    bounds = (min(longitudes), min(latitudes), max(longitudes), max(latitudes))
+                    polygon_alerts.append((bounds, alert))
+                else:
+                    for zone in alert['properties'].get('geocode', {}).get('UGC', []):
+                        zone_index.setdefault(zone, []).append(alert)
+
+            points = await asyncio.gather(*(self._resolve_point(zip_code) for zip_code in zip_codes))
+            for zip_code, point in zip(zip_codes, points):
+                if point is not None:
+                    results[zip_code] = self._match_alerts(zip_code, point["zones"], zone_index, polygon_alerts)
+            await self._save_zip_points()
+
+        remaining = [zip_code for zip_code in zip_codes if zip_code not in results]
+        point_urls = []
+        for zip_code in remaining:
             latitude, longitude = self.zip_codes[zip_code]
-            alerts_url = f"https://api.weather.gov/alerts/active?point={latitude.strip()},{longitude.strip()}"
+            point_urls.append(f"https://api.weather.gov/alerts/active?point={latitude},{longitude}")
+        fetched = await asyncio.gather(*(self._fetch_alert_features(url) for url in point_urls))
+        for zip_code, alerts in zip(remaining, fetched):
+            if alerts is not None:
+                results[zip_code] = alerts
+        return results
+
+    async def _deliver_severe_alerts(self, user_id, sent_alerts, alerts):
+        """DM a user the alerts they haven't seen yet and return how many were delivered"""
+        new_alerts = [alert for alert in alerts if alert['id'] not in sent_alerts]
+        active_ids = {alert['id'] for alert in alerts}
+        # Only ids still active here can come back, so expired ones don't pile up forever
+        kept = [alert_id for alert_id in sent_alerts if alert_id in active_ids]
+        delivered = 0
+        user = self.bot.get_user(user_id)
+        if user and new_alerts:
+            async with self.alert_semaphore:
+                for alert in new_alerts:
+                    try:
+                        await user.send(embed=self._severe_alert_embed(alert))
+                    except discord.Forbidden:
+                        break
+                    except (discord.HTTPException, KeyError, TypeError, ValueError):
+                        continue
+                    kept.append(alert['id'])
+                    delivered += 1
+        if kept != sent_alerts:
+            await self.config.user_from_id(user_id).sent_alerts.set(kept)
+        return delivered
 
-            async with self.session.get(alerts_url) as response:
-                if response.status != 200:
-                    continue
+    async def check_weather_alerts(self):
+        """Check for weather alerts and DM users if any severe or extreme warnings are issued"""
+        all_users = await self.config.all_users()
+        subscribers = {}
+        for user_id, data in all_users.items():
+            zip_code = data.get("zip_code")
+            if data.get("severealerts") and zip_code and zip_code in self.zip_codes:
+                subscribers.setdefault(zip_code, []).append(user_id)
+        if not subscribers:
+            return
 
-                data = await response.json()
-                alerts = data.get('features', [])
-                severe_alerts = [alert for alert in alerts if alert['properties']['severity'] in ['Severe', 'Extreme']]
-
-                if severe_alerts:
-                    user = self.bot.get_user(user_id)
-                    if user:
-                        sent_alerts = user_data.get("sent_alerts", [])
-                        new_alerts = [alert for alert in severe_alerts if alert['id'] not in sent_alerts]
-
-                        if new_alerts:
-                            for alert in new_alerts:
-                                embed = discord.Embed(
-                                    title=alert['properties']['event'],
-                                    description=f"{'An' if alert['properties']['event'][0].lower() in 'aeiou' else 'A'} **{alert['properties']['event']}** was issued at **<t:{int(datetime.fromisoformat(alert['properties']['sent']).timestamp())}:F>** for your location and is in effect until **<t:{int(datetime.fromisoformat(alert['properties']['expires']).timestamp())}:F>**.",
-                                    color=0xff4545
-                                )
-                                if 'instruction' in alert['properties']:
-                                    embed.add_field(name="Instruction", value=alert['properties']['instruction'], inline=False)
-                                if 'severity' in alert['properties']:
-                                    embed.add_field(name="Severity", value=alert['properties']['severity'], inline=True)
-                                if 'urgency' in alert['properties']:
-                                    embed.add_field(name="Urgency", value=alert['properties']['urgency'], inline=True)
-                                if 'certainty' in alert['properties']:
-                                    embed.add_field(name="Certainty", value=alert['properties']['certainty'], inline=True)
-                                if 'senderName' in alert['properties']:
-                                    embed.set_footer(text=f"Issued by {alert['properties']['senderName']}")
-
-                                await user.send(embed=embed)
-                                sent_alerts.append(alert['id'])
-
-                            await self.config.user_from_id(user_id).sent_alerts.set(sent_alerts)
-                            total_alerts_sent = await self.config.total_alerts_sent()
-                            await self.config.total_alerts_sent.set(total_alerts_sent + len(new_alerts))
+        alerts_by_zip = await self._alerts_by_zip(list(subscribers))
+
+        deliveries = [
+            self._deliver_severe_alerts(user_id, all_users[user_id].get("sent_alerts", []), alerts)
+            for zip_code, alerts in alerts_by_zip.items()
+            for user_id in subscribers[zip_code]
+        ]
+        delivered = sum(await asyncio.gather(*deliveries))
+        if delivered:
+            total_alerts_sent = await self.config.total_alerts_sent()
+            await self.config.total_alerts_sent.set(total_alerts_sent + delivered)
 
     async def start_severe_alerts_task(self):
         while True:
-            await self.check_weather_alerts()
+            try:
+                await self.check_weather_alerts()
+            except Exception as e:
+                print(f"Severe weather alert check failed: {e}")
             await asyncio.sleep(900)
 
     @commands.cooldown(1, 900, commands.BucketType.user)
@@ -1206,50 +1483,6 @@ class Weather(commands.Cog):
         status = "enabled" if not freeze_alerts_enabled else "disabled"
         await ctx.send(f"Freeze alerts have been {status} for your location.")
 
-    async def check_freeze_alerts(self):
-        """Check for upcoming dangerously cold temperatures and DM users if any are expected"""
-        all_users = await self.config.all_users()
-        users_with_freeze_alerts = [user_id for user_id, data in all_users.items() if data.get("freezealerts")]
-
-        for user_id in users_with_freeze_alerts:
-            user_data = await self.config.user_from_id(user_id).all()
-            zip_code = user_data.get("zip_code")
-            if not zip_code or zip_code not in self.zip_codes:
-                continue
-
-            latitude, longitude = self.zip_codes[zip_code]
-            forecast_url = f"https://api.weather.gov/points/{latitude.strip()},{longitude.strip()}/forecast"
-
-            async with self.session.get(forecast_url) as response:
-                if response.status != 200:
-                    continue
-
-                data = await response.json()
-                periods = data.get('properties', {}).get('periods', [])
-                cold_alerts = [period for period in periods if period['temperature'] <= 10]
-
-                if cold_alerts:
-                    user = self.bot.get_user(user_id)
-                    if user:
-                        for alert in cold_alerts:
-                            embed = discord.Embed(
-                                title="Extreme cold alert",
-                                description=f"Expected dangerously cold temperatures: {alert['temperature']}°F",
-                                color=0x1E90FF
-                            )
-                            embed.add_field(name="Time", value=alert['name'], inline=True)
-                            embed.add_field(name="Detailed Forecast", value=alert['detailedForecast'], inline=False)
-                            embed.set_footer(text="Stay warm and take necessary precautions.")
-
-                            await user.send(embed=embed)
-                            total_freeze_alerts_sent = await self.config.total_freeze_alerts_sent()
-                            await self.config.total_freeze_alerts_sent.set(total_freeze_alerts_sent + 1)
-
-    async def start_freeze_alerts_task(self):
-        while True:
-            await self.check_freeze_alerts()
-            await asyncio.sleep(604800)  # 7 days in seconds
-
     @commands.cooldown(1, 900, commands.BucketType.user)
     @weatherset.command(name="heatalerts")
     async def heatalerts(self, ctx):
@@ -1260,49 +1493,121 @@ class Weather(commands.Cog):
         status = "enabled" if not heat_alerts_enabled else "disabled"
         await ctx.send(f"Heat alerts have been {status} for your location.")
 
-    async def check_heat_alerts(self):
-        """Check for upcoming dangerously hot temperatures and DM users if any are expected"""
-        all_users = await self.config.all_users()
-        users_with_heat_alerts = [user_id for user_id, data in all_users.items() if data.get("heatalerts")]
-
-        for user_id in users_with_heat_alerts:
-            user_data = await self.config.user_from_id(user_id).all()
-            zip_code = user_data.get("zip_code")
-            if not zip_code or zip_code not in self.zip_codes:
+    def _forecast_alert_embed(self, kind, period):
+        if kind == "freeze":
+            embed = discord.Embed(
+                title="Extreme cold alert",
+                description=f"Expected dangerously cold temperatures: {period['temperature']}°F",
+                color=0x1E90FF
+            )
+            footer = "Stay warm and take necessary precautions."
+        else:
+            embed = discord.Embed(
+                title="Extreme heat alert",
+                description=f"Expected dangerously hot temperatures: {period['temperature']}°F",
+                color=0xFF4500
+            )
+            footer = "Stay cool and take necessary precautions."
+        embed.add_field(name="Time", value=period['name'], inline=True)
+        embed.add_field(name="Detailed Forecast", value=period['detailedForecast'][:1024], inline=False)
+        embed.set_footer(text=footer)
+        return embed
+
+    async def _fetch_forecast_periods(self, forecast_url):
+        async with self.alert_semaphore:
+            try:
+                async with self.session.get(forecast_url) as response:
+                    if response.status != 200:
+                        return None
+                    data = await response.json()
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                return None
+        return data.get('properties', {}).get('periods', [])
+
+    async def _deliver_forecast_alerts(self, user_id, user_data, grid_key, periods):
+        """DM a user the freeze/heat periods they haven't been warned about and return (freeze, heat) counts"""
+        sent = user_data.get("sent_forecast_alerts", [])
+        current = {}
+        for period in periods:
+            temperature = period.get('temperature')
+            if temperature is None:
                 continue
+            if user_data.get("freezealerts") and temperature <= 10:
+                current[f"{grid_key}/{period['startTime']}/freeze"] = ("freeze", period)
+            if user_data.get("heatalerts") and temperature >= 100:
+                current[f"{grid_key}/{period['startTime']}/heat"] = ("heat", period)
+
+        # Keep ids for periods still in the forecast so an extreme period is only ever sent once
+        forecast_prefixes = {f"{grid_key}/{period['startTime']}/" for period in periods}
+        kept = [key for key in sent if key.rsplit('/', 1)[0] + '/' in forecast_prefixes]
+        counts = {"freeze": 0, "heat": 0}
+        user = self.bot.get_user(user_id)
+        new_keys = [key for key in current if key not in sent]
+        if user and new_keys:
+            async with self.alert_semaphore:
+                for key in new_keys:
+                    kind, period = current[key]
+                    try:
+                        await user.send(embed=self._forecast_alert_embed(kind, period))
+                    except discord.Forbidden:
+                        break
+                    except discord.HTTPException:
+                        continue
+                    kept.append(key)
+                    counts[kind] += 1
+        if kept != sent:
+            await self.config.user_from_id(user_id).sent_forecast_alerts.set(kept)
+        return counts["freeze"], counts["heat"]
+
+    async def check_forecast_alerts(self):
+        """Check for upcoming dangerously cold or hot temperatures and DM users if any are expected"""
+        all_users = await self.config.all_users()
+        subscribers = {}
+        for user_id, data in all_users.items():
+            zip_code = data.get("zip_code")
+            if (data.get("freezealerts") or data.get("heatalerts")) and zip_code and zip_code in self.zip_codes:
+                subscribers.setdefault(zip_code, []).append(user_id)
+        if not subscribers:
+            return
 
-            latitude, longitude = self.zip_codes[zip_code]
-            forecast_url = f"https://api.weather.gov/points/{latitude.strip()},{longitude.strip()}/forecast"
-
-            async with self.session.get(forecast_url) as response:
-                if response.status != 200:
-                    continue
+        zip_codes = list(subscribers)
+        points = await asyncio.gather(*(self._resolve_point(zip_code) for zip_code in zip_codes))
+        await self._save_zip_points()
 
-                data = await response.json()
-                periods = data.get('properties', {}).get('periods', [])
-                heat_alerts = [period for period in periods if period['temperature'] >= 100]
-
-                if heat_alerts:
-                    user = self.bot.get_user(user_id)
-                    if user:
-                        for alert in heat_alerts:
-                            embed = discord.Embed(
-                                title="Extreme heat alert",
-                                description=f"Expected dangerously hot temperatures: {alert['temperature']}°F",
-                                color=0xFF4500
-                            )
-                            embed.add_field(name="Time", value=alert['name'], inline=True)
-                            embed.add_field(name="Detailed Forecast", value=alert['detailedForecast'], inline=False)
-                            embed.set_footer(text="Stay cool and take necessary precautions.")
-
-                            await user.send(embed=embed)
-                            total_heat_alerts_sent = await self.config.total_heat_alerts_sent()
-                            await self.config.total_heat_alerts_sent.set(total_heat_alerts_sent + 1)
-
-    async def start_heat_alerts_task(self):
+        # Neighbouring zip codes usually land on the same 2.5km forecast gridpoint
+        grids = {}
+        for zip_code, point in zip(zip_codes, points):
+            if point is None:
+                continue
+            grid_key = "/".join(str(part) for part in point["grid"])
+            grids.setdefault(grid_key, (point, []))[1].extend(subscribers[zip_code])
+
+        grid_keys = list(grids)
+        forecasts = await asyncio.gather(*(self._forecast_periods(grids[key][0]) for key in grid_keys))
+
+        deliveries = [
+            self._deliver_forecast_alerts(user_id, all_users[user_id], grid_key, periods)
+            for grid_key, periods in zip(grid_keys, forecasts)
+            if periods is not None
+            for user_id in grids[grid_key][1]
+        ]
+        results = await asyncio.gather(*deliveries)
+        freeze_sent = sum(freeze for freeze, heat in results)
+        heat_sent = sum(heat for freeze, heat in results)
+        if freeze_sent:
+            total_freeze_alerts_sent = await self.config.total_freeze_alerts_sent()
+            await self.config.total_freeze_alerts_sent.set(total_freeze_alerts_sent + freeze_sent)
+        if heat_sent:
+            total_heat_alerts_sent = await self.config.total_heat_alerts_sent()
+            await self.config.total_heat_alerts_sent.set(total_heat_alerts_sent + heat_sent)
+
+    async def start_forecast_alerts_task(self):
         while True:
-            await self.check_heat_alerts()
-            await asyncio.sleep(604800)  # 7 days in seconds
+            try:
+                await self.check_forecast_alerts()
+            except Exception as e:
+                print(f"Freeze/heat forecast check failed: {e}")
+            await asyncio.sleep(21600)  # 6 hours, already-sent periods are skipped
 
     @weatherset.command(name="zip")
     async def zip(self, ctx, zip_code: str):
@@ -0,0 +1,218 @@
+"""Compact ZIP centroid index and nearest-neighbour grid used by weatherpro.
+
+zipcodes.bin holds a small header followed by three little-endian arrays of equal
+length: sorted int32 ZIP codes, float32 latitudes and float32 longitudes. The file
+is memory-mapped on first use and looked up with a binary search, so loading the
+cog no longer parses the CSV.
+
+Rebuild it after editing zipcodes.csv:
+
+    python weatherpro/zipindex.py weatherpro/data/zipcodes.csv weatherpro/data/zipcodes.bin
+"""
+import array
+import bisect
+import csv
+import math
+import mmap
+import struct
+import sys
+
+MAGIC = b"ZIPIDX1\0"
+HEADER = struct.Struct("<8sI")
+EARTH_RADIUS_MILES = 3958.8
+
+
+def distance_miles(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_MILES * math.asin(math.sqrt(min(a, 1.0)))
+
+
+def read_csv(csv_path):
+    """Return sorted (zips, latitudes, longitudes) arrays parsed from zipcodes.csv"""
+    rows = []
+    with open(csv_path, "r", newline="") as zip_code_file:
+        csv_reader = csv.reader(zip_code_file)
+        next(csv_reader, None)
+        for row in csv_reader:
+            zip_code = row[0].strip()
+            # Only plain 5 digit codes can be queried, anything else can't be stored as an int
+            if len(zip_code) != 5 or not zip_code.isdigit():
+                continue
+            rows.append((int(zip_code), float(row[1]), float(row[2])))
+    rows.sort()
+    zips = array.array("i", (row[0] for row in rows))
+    latitudes = array.array("f", (row[1] for row in rows))
+    longitudes = array.array("f", (row[2] for row in rows))
+    return zips, latitudes, longitudes
+
+
+def build(csv_path, bin_path):
+    """Write the binary index for csv_path to bin_path and return the number of ZIP codes"""
+    zips, latitudes, longitudes = read_csv(csv_path)
+    if sys.byteorder != "little":
+        for column in (zips, latitudes, longitudes):
+            column.byteswap()
+    with open(bin_path, "wb") as index_file:
+        index_file.write(HEADER.pack(MAGIC, len(zips)))
+        for column in (zips, latitudes, longitudes):
+            column.tofile(index_file)
+    return len(zips)
+
+
+class GeoGrid:
+    """Fixed-size grid over parallel latitude/longitude columns for nearest-neighbour queries.
+
+    Each cell holds the row numbers of the points inside it. A query walks rings of cells
+    outwards from the query point and stops once no unvisited cell can hold anything
+    closer than the k-th best match so far. Queries far from every point (mid-ocean)
+    give up on the rings after ten degrees and scan all rows instead.
+    """
+
+    def __init__(self, latitudes, longitudes, cell_size=1.0):
+        self.latitudes = latitudes
+        self.longitudes = longitudes
+        self.cell_size = cell_size
+        self.cells = {}
+        for row in range(len(latitudes)):
+            self.cells.setdefault(self._cell(latitudes[row], longitudes[row]), array.array("I")).append(row)
+
+    def _cell(self, lat, lon):
+        lon = ((lon + 180) % 360) - 180
+        return math.floor(min(lat, 89.999) / self.cell_size), math.floor(lon / self.cell_size)
+
+    def _ring(self, cell_lat, cell_lon, r):
+        if r == 0:
+            yield cell_lat, cell_lon
+            return
+        columns = round(360 / self.cell_size)
+        for d_lat in range(-r, r + 1):
+            step = 1 if abs(d_lat) == r else 2 * r
+            for d_lon in range(-r, r + 1, step):
+                yield cell_lat + d_lat, (cell_lon + d_lon + columns // 2) % columns - columns // 2
+
+    def _unvisited_bound(self, lat, r):
+        """Lower bound on the distance to any point outside the (2r+1)-cell square around lat"""
+        degrees = r * self.cell_size
+        lat_gap = degrees * math.pi * EARTH_RADIUS_MILES / 180
+        widest = min(abs(lat) + degrees + self.cell_size, 90)
+        lon_gap = 2 * EARTH_RADIUS_MILES * math.asin(math.cos(math.radians(widest)) * math.sin(math.radians(degrees) / 2))
+        return min(lat_gap, lon_gap)
+
+    def nearest(self, lat, lon, k=1):
+        """The k closest rows to a point as (distance_miles, row) pairs, nearest first"""
+        if not self.cells:
+            return []
+        cell_lat, cell_lon = self._cell(lat, lon)
+        best = []
+        for r in range(math.ceil(10 / self.cell_size) + 1):
+            for cell in self._ring(cell_lat, cell_lon, r):
+                for row in self.cells.get(cell, ()):
+                    best.append((distance_miles(lat, lon, self.latitudes[row], self.longitudes[row]), row))
+            if len(best) >= k:
+                best.sort()
+                del best[k:]
+                if best[-1][0] <= self._unvisited_bound(lat, r):
+                    return best
+        best = [
+            (distance_miles(lat, lon, self.latitudes[row], self.longitudes[row]), row)
+            for row in range(len(self.latitudes))
+        ]
+        best.sort()
+        return best[:k]
+
+
+class ZipIndex:
+    """Read-only mapping of 5 digit ZIP code strings to (latitude, longitude) floats.
+
+    Coordinates come back rounded to 4 decimal places, the precision api.weather.gov
+    accepts without redirecting. If the binary index is missing the CSV is parsed
+    into the same arrays instead.
+    """
+
+    def __init__(self, bin_path, csv_path=None):
+        self.bin_path = bin_path
+        self.csv_path = csv_path
+        self._columns = None
+        self._mmap = None
+        self._grid = None
+
+    def _load(self):
+        if self._columns is not None:
+            return self._columns
+        try:
+            with open(self.bin_path, "rb") as index_file:
+                mapped = mmap.mmap(index_file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (FileNotFoundError, ValueError):
+            if self.csv_path is None:
+                raise
+            self._columns = read_csv(self.csv_path)
+            return self._columns
+
+        magic, count = HEADER.unpack_from(mapped, 0)
+        if magic != MAGIC:
+            mapped.close()
+            raise ValueError(f"{self.bin_path} is not a ZIP index")
+        offset = HEADER.size
+        size = count * 4
+        if sys.byteorder == "little":
+            view = memoryview(mapped)
+            columns = tuple(
+                view[offset + size * i:offset + size * (i + 1)].cast(typecode)
+                for i, typecode in enumerate("iff")
+            )
+            self._mmap = mapped
+        else:
+            columns = []
+            for i, typecode in enumerate("iff"):
+                column = array.array(typecode)
+                column.frombytes(mapped[offset + size * i:offset + size * (i + 1)])
+                column.byteswap()
+                columns.append(column)
+            columns = tuple(columns)
+            mapped.close()
+        self._columns = columns
+        return columns
+
+    def _position(self, zip_code):
+        if not isinstance(zip_code, str) or len(zip_code) != 5 or not zip_code.isdigit():
+            return None
+        zips = self._load()[0]
+        key = int(zip_code)
+        i = bisect.bisect_left(zips, key)
+        if i < len(zips) and zips[i] == key:
+            return i
+        return None
+
+    def __contains__(self, zip_code):
+        return self._position(zip_code) is not None
+
+    def __getitem__(self, zip_code):
+        i = self._position(zip_code)
+        if i is None:
+            raise KeyError(zip_code)
+        _, latitudes, longitudes = self._columns
+        return round(latitudes[i], 4), round(longitudes[i], 4)
+
+    def get(self, zip_code, default=None):
+        i = self._position(zip_code)
+        if i is None:
+            return default
+        _, latitudes, longitudes = self._columns
+        return round(latitudes[i], 4), round(longitudes[i], 4)
+
+    def __len__(self):
+        return len(self._load()[0])
+
+    def nearest(self, latitude, longitude, k=1):
+        """The k ZIP codes whose centroids are closest to a point as (distance_miles, zip_code) pairs"""
+        zips, latitudes, longitudes = self._load()
+        if self._grid is None:
+            self._grid = GeoGrid(latitudes, longitudes, cell_size=0.25)
+        return [(distance, f"{zips[row]:05d}") for distance, row in self._grid.nearest(latitude, longitude, k)]
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        sys.exit("usage: python zipindex.py <zipcodes.csv> <zipcodes.bin>")
+    print(f"Wrote {build(sys.argv[1], sys.argv[2])} ZIP codes to {sys.argv[2]}")